@@ -4,8 +4,13 @@
 # 유저 암호 : pw_01
 
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import pymysql
 import boto3
+from pymysql.constants import CLIENT
 
 # RDS 연결 정보
 rds_host = "DB-HOST"
@@ -13,59 +18,181 @@ db_username = "DB-NAME"
 db_password = "DB-PW"
 db_name = "texts"
 
-# RDS에 연결
-try:
-    conn = pymysql.connections.Connection(
-        host=rds_host, user=db_username, password=db_password, database=db_name
+# 동시에 사용할 연결 수 (1 이면 한 연결로 batch_size 명씩 묶어서 처리)
+concurrency = 8
+
+# 한 번에 묶어서 보내고 커밋할 학생 수 (concurrency 가 1 일 때)
+batch_size = 20
+
+# 학생 DB마다 넣을 초기 데이터 (text, username)
+seed_texts = [
+    ("언제나 현재에 집중할수 있다면 행복할것이다...아마도...", "파울로 코엘료"),
+    ("어리석은 자는 멀리서 행복을 찾고, 현명한 자는 자신의 발치에서 행복을 키워간다...아마도...", "제임스 오펜하임"),
+    ("성공의 비결은 단 한 가지, 잘할 수 있는 일에 광적으로 집중하는 것이다...아마도...", "톰 모나건"),
+]
+
+
+# RDS에 연결 (여러 문장을 한 번에 보낼 수 있도록 MULTI_STATEMENTS 사용)
+def connect():
+    return pymysql.connections.Connection(
+        host=rds_host,
+        user=db_username,
+        password=db_password,
+        database=db_name,
+        client_flag=CLIENT.MULTI_STATEMENTS,
     )
+
+
+try:
+    conn = connect()
 except Exception as e:
     print(f"Error connecting to RDS: {e}")
     exit()
 
 
-# 데이터베이스와 사용자 생성, 테이블 생성 및 초기 데이터 삽입
-def create_database_and_user(user_index):
+# 학생 한 명의 데이터베이스·사용자·권한·테이블 생성 문장
+def student_statements(user_index):
     user_name = f"user_{user_index:02d}"
     db_name = f"db_{user_index:02d}"
     user_password = f"pw_{user_index:02d}"
-
-    with conn.cursor() as cursor:
-        # 데이터베이스 생성
-        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {db_name};")
-
-        # 사용자 생성 및 권한 부여
-        cursor.execute(
-            f"CREATE USER IF NOT EXISTS '{user_name}'@'%' IDENTIFIED BY '{user_password}';"
-        )
-        cursor.execute(f"GRANT ALL PRIVILEGES ON {db_name}.* TO '{user_name}'@'%';")
-
-        # 생성된 데이터베이스 사용
-        cursor.execute(f"USE {db_name};")
-
-        # 테이블 생성 및 초기 데이터 삽입
-        cursor.execute(
-            "CREATE TABLE IF NOT EXISTS texts (id INT AUTO_INCREMENT PRIMARY KEY, text TEXT NOT NULL, username VARCHAR(255) NOT NULL);"
-        )
-        cursor.execute(
-            "INSERT INTO texts (text, username) VALUES ('언제나 현재에 집중할수 있다면 행복할것이다...아마도...', '파울로 코엘료');"
-        )
-        cursor.execute(
-            "INSERT INTO texts (text, username) VALUES ('어리석은 자는 멀리서 행복을 찾고, 현명한 자는 자신의 발치에서 행복을 키워간다...아마도...', '제임스 오펜하임');"
-        )
-        cursor.execute(
-            "INSERT INTO texts (text, username) VALUES ('성공의 비결은 단 한 가지, 잘할 수 있는 일에 광적으로 집중하는 것이다...아마도...', '톰 모나건');"
-        )
-
-        conn.commit()
+    return [
+        f"CREATE DATABASE IF NOT EXISTS {db_name}",
+        f"CREATE USER IF NOT EXISTS '{user_name}'@'%' IDENTIFIED BY '{user_password}'",
+        f"GRANT ALL PRIVILEGES ON {db_name}.* TO '{user_name}'@'%'",
+        # USE 로 데이터베이스를 바꾸지 않고 db_XX.texts 처럼 이름을 붙여 만든다
+        f"CREATE TABLE IF NOT EXISTS {db_name}.texts (id INT AUTO_INCREMENT PRIMARY KEY, text TEXT NOT NULL, username VARCHAR(255) NOT NULL)",
+        # 초기 데이터가 이미 있는지 (DDL 뒤에 실패해 비어 있는 학생은 다시 넣는다)
+        f"SELECT EXISTS(SELECT 1 FROM {db_name}.texts)",
+    ]
+
+
+# 데이터베이스와 사용자 생성, 테이블 생성 및 초기 데이터 삽입 (학생 여러 명을 한 연결로 한 번에)
+#   왕복 횟수: DDL 1회 + 비어 있는 학생마다 다중 행 INSERT 1회 + 커밋 1회
+#   초기 데이터를 넣은(texts 가 비어 있던) 학생 목록을 반환
+def create_databases_and_users(connection, user_indexes):
+    with connection.cursor() as cursor:
+        # 모든 DDL 을 한 번에 보내고, 문장별 결과를 모두 읽어 오류를 확인
+        # (결과 행이 있는 것은 학생마다 붙인 SELECT EXISTS 뿐이다)
+        statements = [sql for i in user_indexes for sql in student_statements(i)]
+        cursor.execute(";\n".join(statements) + ";")
+        seeded_already = []
+        while True:
+            if cursor.description is not None:
+                seeded_already.append(bool(cursor.fetchone()[0]))
+            if not cursor.nextset():
+                break
+
+        # 초기 데이터는 비어 있는 학생마다 다중 행 INSERT 한 번 (executemany 가 VALUES 를 묶어 보낸다)
+        seeded = [i for i, has_rows in zip(user_indexes, seeded_already) if not has_rows]
+        for user_index in seeded:
+            cursor.executemany(
+                f"INSERT INTO db_{user_index:02d}.texts (text, username) VALUES (%s, %s)",
+                seed_texts,
+            )
+
+    connection.commit()
+    return seeded
+
+
+# 작업 스레드마다 연결 하나 (연결 풀)
+local = threading.local()
+pool = []
+pool_lock = threading.Lock()
+
+
+def pooled_connection():
+    if getattr(local, "conn", None) is None:
+        local.conn = connect()
+        with pool_lock:
+            pool.append(local.conn)
+    return local.conn
+
+
+# 학생 한 명 처리 (실패해도 다른 학생에게 영향이 없도록 학생 단위로 처리)
+#   MySQL 의 DDL 은 바로 커밋되므로 롤백되는 것은 초기 데이터 INSERT 뿐이다.
+#   그래서 DDL 뒤에 실패한 학생은 texts 가 비어 있고, 다음 실행에서 초기 데이터를 다시 넣는다.
+def provision_student(user_index):
+    connection = pooled_connection()
+    try:
+        seeded = create_databases_and_users(connection, [user_index])
+    except Exception:
+        # 연결이 끊겼을 수 있으므로 버리고, 이 스레드의 다음 학생은 새 연결로 처리
+        try:
+            connection.rollback()
+        except Exception:
+            pass
+        local.conn = None
+        raise
+    return "created" if seeded else "existing"
+
+
+# 학생들을 처리하고 결과 요약 (created / existing / failed) 을 반환
+def provision(user_indexes):
+    summary = {"created": [], "existing": [], "failed": []}
+    errors = {}
+
+    if concurrency <= 1:
+        for start in range(0, len(user_indexes), batch_size):
+            batch = user_indexes[start : start + batch_size]
+            try:
+                seeded = create_databases_and_users(conn, batch)
+            except Exception:
+                # 배치가 실패하면 학생 단위로 다시 처리해 실패한 학생만 가려낸다
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                for user_index in batch:
+                    try:
+                        summary[provision_student(user_index)].append(user_index)
+                    except Exception as e:
+                        summary["failed"].append(user_index)
+                        errors[user_index] = e
+                continue
+            for user_index in batch:
+                status = "created" if user_index in seeded else "existing"
+                summary[status].append(user_index)
+            print(f"✅ user_{batch[0]:02d} ~ user_{batch[-1]:02d} 처리 완료")
+    else:
+        provision_parallel(user_indexes, summary, errors)
+    for connection in pool:
+        if connection.open:
+            connection.close()
+    return summary, errors
+
+
+# 학생들을 concurrency 개 연결에 나눠 동시에 처리
+def provision_parallel(user_indexes, summary, errors):
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(provision_student, user_index): user_index
+            for user_index in user_indexes
+        }
+        for future in as_completed(futures):
+            user_index = futures[future]
+            try:
+                summary[future.result()].append(user_index)
+            except Exception as e:
+                summary["failed"].append(user_index)
+                errors[user_index] = e
 
 
 # 사용자 및 데이터베이스를 원하는 횟수만큼 생성
 number_of_users = 55  # 생성할 사용자 및 데이터베이스 수
-for i in range(0, number_of_users + 1):
-    create_database_and_user(i)
+started = time.perf_counter()
+summary, errors = provision(list(range(0, number_of_users + 1)))
+
+for user_index in sorted(errors):
+    print(f"❌ user_{user_index:02d}: {errors[user_index]}")
+print(
+    f"📊 생성 {len(summary['created'])}명, 기존 {len(summary['existing'])}명,"
+    f" 실패 {len(summary['failed'])}명 ({time.perf_counter() - started:.1f}s)"
+)
 
 # RDS 연결 종료
 conn.close()
+if summary["failed"]:
+    exit(1)
 
 
 # pip install boto3 pymysql
@@ -1,48 +1,91 @@
-import psycopg2
 import os
-from dotenv import load_dotenv
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# .env 파일 로드
-load_dotenv()
+from psycopg2 import sql
 
-# DB 접속 정보 (환경변수에서 로드)
-DB_HOST = os.getenv("DB_HOST")
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_PORT = os.getenv("DB_PORT", "5432")
+# DB 접속 정보는 mcp_settings(.env) 에서 가져오고, 데이터베이스마다 mcp_connections.connect 로 전용 연결을 연다
+# (동시에 초기화하는 워커끼리 공용 풀의 연결을 나눠 쓰지 않도록)
+from mcp_connections import connect, run_with_lock_retry
 
 # 데이터베이스 목록 (환경변수에서 로드)
 database_list = os.getenv("DATABASE_LIST", "mcp1,mcp2,mcp3,mcp4")
 databases = [db.strip() for db in database_list.split(",")]
 
+# 초기화 설정 (환경변수에서 로드)
+CLEANUP_WORKERS = int(os.getenv("CLEANUP_WORKERS", 4))  # 동시에 초기화하는 데이터베이스 수
+CLEANUP_LOCK_TIMEOUT_MS = int(os.getenv("CLEANUP_LOCK_TIMEOUT_MS", 3000))  # 테이블 잠금 대기 한도
+CLEANUP_RETRIES = int(os.getenv("CLEANUP_RETRIES", 3))  # 잠금 대기 시간 초과 시 재시도 횟수
+# 1 이면 잠금 대기 시간 초과 시 테이블을 잡고 있는 세션(학생 MCP 접속 등)을 끊고 재시도
+CLEANUP_TERMINATE = os.getenv("CLEANUP_TERMINATE", "0") == "1"
+
+TABLES_QUERY = """
+    SELECT c.oid, c.relname FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p') AND NOT c.relispartition
+    ORDER BY c.relname
+"""
+
 
 def truncate_all_tables(dbname):
-    print(f"🚮 초기화 중: {dbname}")
-    conn = psycopg2.connect(
-        host=DB_HOST, dbname=dbname, user=DB_USER, password=DB_PASSWORD
-    )
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        DO $$
-        DECLARE
-            r RECORD;
-        BEGIN
-            FOR r IN (SELECT tablename FROM pg_tables WHERE schemaname = 'public') LOOP
-                EXECUTE 'TRUNCATE TABLE ' || quote_ident(r.tablename) || ' CASCADE';
-            END LOOP;
-        END
-        $$;
+    """public 스키마의 모든 테이블을 TRUNCATE 한 번으로 비우고 (테이블 수, 소요 시간) 반환
+
+    잠금 대기가 CLEANUP_LOCK_TIMEOUT_MS 를 넘으면 잡고 있는 세션을 보고하고 재시도한다.
     """
-    )
+    started = time.perf_counter()
+    conn = connect(dbname)
+    try:
+        cur = conn.cursor()
+        cur.execute(TABLES_QUERY)
+        tables = cur.fetchall()
+        if not tables:
+            conn.commit()
+            return 0, time.perf_counter() - started
+        oids = [oid for oid, _ in tables]
+        statement = sql.SQL("TRUNCATE {} RESTART IDENTITY CASCADE").format(
+            sql.SQL(", ").join(sql.Identifier(name) for _, name in tables)
+        )
+
+        def truncate(cur):
+            cur.execute(statement)
+            # 집계 뷰(mcp_workload)가 비운 테이블과 어긋나지 않도록 다시 계산
+            cur.execute("SELECT matviewname FROM pg_matviews WHERE schemaname = 'public'")
+            for (view,) in cur.fetchall():
+                cur.execute(sql.SQL("REFRESH MATERIALIZED VIEW {}").format(sql.Identifier(view)))
+
+        run_with_lock_retry(
+            cur, oids, truncate, dbname, CLEANUP_LOCK_TIMEOUT_MS, CLEANUP_RETRIES, CLEANUP_TERMINATE
+        )
+        cur.close()
+    finally:
+        conn.close()
+    return len(tables), time.perf_counter() - started
+
 
-    conn.commit()
-    cur.close()
-    conn.close()
-    print(f"✅ {dbname} 데이터 초기화 완료")
+def cleanup(names, workers=CLEANUP_WORKERS):
+    """데이터베이스들을 최대 workers 개씩 동시에 초기화하고 실패한 데이터베이스 목록을 반환"""
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(names)))) as executor:
+        futures = {executor.submit(truncate_all_tables, name): name for name in names}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                count, elapsed = future.result()
+            except Exception as e:
+                print(f"❌ {name}: {str(e).strip()}")
+                failed.append(name)
+                continue
+            print(f"✅ {name} 데이터 초기화 완료 (테이블 {count}개, {elapsed:.2f}s)")
+    return failed
 
 
 if __name__ == "__main__":
-    for db in databases:
-        truncate_all_tables(db)
+    names = sys.argv[1:] or databases
+    print(f"🚮 초기화 중: {', '.join(names)} (동시 {max(1, min(CLEANUP_WORKERS, len(names)))}개)")
+    started = time.perf_counter()
+    failed = cleanup(names)
+    print(f"⏱️ 전체 소요 시간: {time.perf_counter() - started:.2f}s")
+    if failed:
+        print(f"⚠️ 실패한 데이터베이스: {', '.join(failed)}")
+        raise SystemExit(1)
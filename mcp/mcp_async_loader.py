@@ -0,0 +1,289 @@
+"""asyncio 적재 백엔드 (IO_BACKEND=async, psycopg 3)
+
+psycopg2 는 동기식이라 문장마다 서버 응답을 기다린 뒤에야 다음 문장을 보낸다.
+이 백엔드는 기존 생성 함수(generate_mcpN)를 그대로 쓰면서 psycopg2 커서 자리에
+AsyncLoadSession 을 넘긴다.
+
+- 파이프라인: 결과가 필요 없는 문장(제약조건, ANALYZE, 시퀀스 재시작 등)은 모아 두었다가
+  결과를 조회하거나 COPY·커밋할 때 파이프라인으로 한 번에 보낸다 (왕복 1회)
+- 생성 ↔ 적재 겹침: COPY 는 백그라운드 이벤트 루프가 테이블마다 별도 연결로 전송하고,
+  생성 함수는 전송이 끝나기를 기다리지 않고 다음 테이블 생성으로 넘어간다
+  (테이블마다 최대 ASYNC_QUEUE_CHUNKS 개 조각까지 먼저 만들어 둔다)
+- 테이블 동시 적재: 외래키로 엮이지 않은 테이블은 최대 ASYNC_CONNECTIONS 개 연결에서 동시에 적재한다.
+  큰 테이블은 행 단위로 잘라 여러 COPY 스트림(연결)에 나눠 보내므로 서버의 외래키 검사·인덱스 갱신도 병렬로 진행된다.
+  direct 모드에서는 자식 테이블 COPY 가 부모 테이블 COPY 의 커밋을 기다리고,
+  deferred 모드에서는 적재 중 제약조건이 없으므로 순서와 관계없이 적재한다.
+
+테이블마다 별도 트랜잭션으로 커밋하므로 시나리오 전체가 하나의 트랜잭션이 아니다.
+적재 도중 실패하면 시나리오 테이블을 모두 TRUNCATE 해 빈 상태로 되돌린다.
+"""
+
+import asyncio
+import os
+import re
+import threading
+
+import psycopg
+
+from mcp_connections import DB_CONNECT_TIMEOUT
+from mcp_schema import LOAD_MODE, parse_schema
+from mcp_settings import DB_HOST, DB_PASSWORD, DB_PORT, DB_SSLMODE, DB_USER
+
+# 비동기 적재 설정 (환경변수에서 로드)
+ASYNC_CONNECTIONS = int(os.getenv("ASYNC_CONNECTIONS", 4))  # 동시에 COPY 하는 최대 연결 수
+ASYNC_QUEUE_CHUNKS = int(os.getenv("ASYNC_QUEUE_CHUNKS", 8))  # COPY 스트림마다 전송을 기다리는 최대 조각 수
+ASYNC_TABLE_STREAMS = int(os.getenv("ASYNC_TABLE_STREAMS", 4))  # 큰 테이블 하나를 나눠 보낼 최대 COPY 스트림 수
+ASYNC_SPLIT_BYTES = int(os.getenv("ASYNC_SPLIT_BYTES", 4 * 1024 * 1024))  # 이만큼 보낼 때마다 스트림을 하나씩 추가
+PIPELINE_MAX_STATEMENTS = int(os.getenv("PIPELINE_MAX_STATEMENTS", 1000))  # 한 번에 파이프라인으로 보낼 문장 수
+
+_COPY_TABLE_RE = re.compile(r"\s*COPY\s+(\w+)", re.I)
+
+# 서버 왕복·접속 횟수 (벤치마크용)
+stats = {"round_trips": 0, "connections": 0}
+
+
+async def _connect(dbname):
+    stats["connections"] += 1
+    options = {}
+    if DB_SSLMODE:
+        options["sslmode"] = DB_SSLMODE
+    return await psycopg.AsyncConnection.connect(
+        host=DB_HOST,
+        port=DB_PORT,
+        dbname=dbname,
+        user=DB_USER,
+        password=DB_PASSWORD,
+        connect_timeout=DB_CONNECT_TIMEOUT,
+        **options,
+    )
+
+
+class AsyncLoadSession:
+    """생성 함수에 psycopg2 커서 대신 넘기는 비동기 적재 세션
+
+    생성 함수가 쓰는 커서 메서드(execute / fetchone / fetchall / copy_expert)만 제공한다.
+    with 블록이 정상 종료하면 남은 COPY 를 기다려 커밋하고, 예외로 끝나면 적재한 데이터를 비운다.
+    """
+
+    def __init__(self, dbname, schema):
+        self.dbname = dbname
+        _, specs = parse_schema(schema)
+        self.tables = [spec.name for spec in specs]
+        # direct 모드: 테이블 → 먼저 커밋돼야 하는 부모 테이블
+        self.parents = {}
+        if LOAD_MODE != "deferred":
+            self.parents = {
+                spec.name: {ref for _, ref, _ in spec.foreign_keys if ref != spec.name}
+                for spec in specs
+            }
+        self._pending = []  # 아직 보내지 않은 (sql, params)
+        self._rows = []  # 마지막으로 보낸 파이프라인의 마지막 문장 결과
+        self._dirty = False  # 제어 연결에 다른 연결이 봐야 할(커밋 전) 변경이 있는지
+        self._loads = {}  # 테이블 → 진행 중인 COPY 작업 목록
+        self._idle = []  # COPY 용 유휴 연결
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name=f"{dbname}-async-loader", daemon=True
+        )
+        self._thread.start()
+        try:
+            self._control, self._slots = self._call(self._open())
+        except BaseException:
+            self._stop_loop()
+            raise
+
+    def _call(self, coro):
+        """이벤트 루프 스레드에서 coro 를 실행하고 결과를 기다림"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _open(self):
+        return await _connect(self.dbname), asyncio.Semaphore(ASYNC_CONNECTIONS)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                try:
+                    self.commit()
+                except BaseException:
+                    self._abort()
+                    raise
+            else:
+                self._abort()
+        finally:
+            self._call(self._close())
+            self._stop_loop()
+
+    def _stop_loop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    # -- 파이프라인 문장 -----------------------------------------------------
+
+    def execute(self, sql, params=None):
+        self._pending.append((sql, params))
+        if len(self._pending) >= PIPELINE_MAX_STATEMENTS:
+            self._flush()
+
+    def fetchone(self):
+        self._flush()
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        self._flush()
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        pass
+
+    def _flush(self, commit=False):
+        if self._pending or (commit and self._dirty):
+            statements, self._pending = self._pending, []
+            # SELECT(키 예약 setval 등)는 커밋 없이도 다른 연결에 영향이 없다
+            self._dirty = self._dirty or any(
+                not sql.lstrip().upper().startswith("SELECT") for sql, _ in statements
+            )
+            commit = commit and self._dirty
+            self._rows = self._call(self._run_pipeline(statements, commit))
+            if commit:
+                self._dirty = False
+
+    async def _run_pipeline(self, statements, commit=False):
+        """모아 둔 문장들(과 커밋)을 파이프라인으로 보내고 마지막 문장의 결과 행을 반환"""
+        stats["round_trips"] += 1
+        async with self._control.cursor() as cur:
+            async with self._control.pipeline():
+                for sql, params in statements:
+                    await cur.execute(sql, params)
+                if commit:
+                    await self._control.commit()
+            return await cur.fetchall() if statements and cur.description is not None else []
+
+    def commit(self):
+        """남은 COPY 를 모두 기다린 뒤 제어 연결의 문장들을 커밋"""
+        self.wait_loads()
+        self._commit_control()
+
+    def _commit_control(self):
+        self._flush(commit=True)
+
+    @staticmethod
+    async def _commit(conn):
+        stats["round_trips"] += 1
+        await conn.commit()
+
+    # -- COPY ----------------------------------------------------------------
+
+    def copy_expert(self, sql, file, size=8192):
+        """COPY 를 이벤트 루프의 작업으로 넘기고, 현재 스레드는 file 을 읽어(= 행 생성) 조각을 넘겨 줌
+
+        ASYNC_SPLIT_BYTES 를 보낼 때마다 COPY 스트림을 하나씩 늘려(최대 ASYNC_TABLE_STREAMS 개)
+        줄 단위로 자른 조각을 돌아가며 넘긴다. 조각을 모두 넘기면 전송 완료를 기다리지 않고 돌아온다.
+        """
+        # 앞서 보낸 문장(제약조건 제거 등)이 다른 연결에서도 보이도록 먼저 커밋
+        self._commit_control()
+        table = _COPY_TABLE_RE.match(sql).group(1).lower()
+        # 같은 테이블의 스트림들이 연결을 모두 차지한 채 서로를 기다리지 않도록 연결 수 이하로 제한
+        max_streams = max(1, min(ASYNC_TABLE_STREAMS, ASYNC_CONNECTIONS))
+        streams = []
+        sent = chunks = 0
+        rest = ""
+        while True:
+            data = file.read(size)
+            if not data:
+                break
+            # 스트림마다 온전한 행만 가도록 마지막 줄바꿈까지만 보내고 나머지는 다음 조각에 붙인다
+            data = rest + data
+            cut = data.rfind("\n") + 1
+            data, rest = data[:cut], data[cut:]
+            if not data:
+                continue
+            if len(streams) < max_streams and sent >= len(streams) * ASYNC_SPLIT_BYTES:
+                streams.append(self._call(self._start_copy(table, sql)))
+            queue, task = streams[chunks % len(streams)]
+            self._call(self._put(queue, task, data))
+            sent += len(data)
+            chunks += 1
+        if rest:
+            raise ValueError(f"{table}: COPY 데이터가 줄바꿈으로 끝나지 않습니다")
+        if not streams:
+            streams.append(self._call(self._start_copy(table, sql)))
+        for queue, task in streams:
+            self._call(self._put(queue, task, None))
+
+    async def _start_copy(self, table, sql):
+        queue = asyncio.Queue(ASYNC_QUEUE_CHUNKS)
+        parents = [
+            load for parent in self.parents.get(table, ()) for load in self._loads.get(parent, ())
+        ]
+        task = asyncio.ensure_future(self._copy(sql, queue, parents))
+        self._loads.setdefault(table, []).append(task)
+        return queue, task
+
+    @staticmethod
+    async def _put(queue, task, data):
+        put = asyncio.ensure_future(queue.put(data))
+        await asyncio.wait({put, task}, return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+            task.result()  # COPY 작업이 실패했으면 그 예외를 생성 쪽으로 올린다
+
+    async def _copy(self, sql, queue, parents):
+        if parents:
+            # 부모 테이블이 커밋돼야 외래키 검사에서 부모 행이 보인다
+            await asyncio.gather(*parents)
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else await _connect(self.dbname)
+            try:
+                stats["round_trips"] += 1
+                async with conn.cursor() as cur:
+                    async with cur.copy(sql) as copy:
+                        while (data := await queue.get()) is not None:
+                            await copy.write(data)
+                await self._commit(conn)
+            except BaseException:
+                await conn.close()
+                raise
+            self._idle.append(conn)
+
+    def wait_loads(self):
+        """진행 중인 COPY 가 모두 끝나 커밋될 때까지 기다림 (하나라도 실패하면 그 예외를 올림)"""
+        self._call(self._wait_loads())
+
+    async def _wait_loads(self):
+        tasks = [task for tasks in self._loads.values() for task in tasks]
+        self._loads.clear()
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, BaseException):
+                raise result
+
+    # -- 정리 ----------------------------------------------------------------
+
+    def _abort(self):
+        """실패 시: 진행 중인 COPY 를 취소하고, 이미 커밋된 테이블까지 모두 비움"""
+        self._pending.clear()
+        try:
+            self._call(self._abort_loads())
+            print(f"↩️ {self.dbname}: 적재 실패로 시나리오 테이블을 비웠습니다.")
+        except psycopg.Error as e:
+            print(f"⚠️ {self.dbname}: 실패한 적재를 정리하지 못했습니다: {e}")
+
+    async def _abort_loads(self):
+        tasks = [task for tasks in self._loads.values() for task in tasks]
+        self._loads.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._control.rollback()
+        async with self._control.cursor() as cur:
+            await cur.execute(f"TRUNCATE {', '.join(self.tables)} RESTART IDENTITY CASCADE")
+        await self._control.commit()
+
+    async def _close(self):
+        for conn in [self._control, *self._idle]:
+            await conn.close()
+        self._idle.clear()
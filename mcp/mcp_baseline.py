@@ -0,0 +1,476 @@
+"""변경 추적 기반 선택적 초기화 (MCP_BASELINE=1)
+
+수업 중 학생은 대부분 데이터를 읽기만 하거나 테이블 몇 개만 바꾼다. 그래서 전체를 비우고
+다시 생성하는 대신, 생성 직후의 상태를 기준선(baseline)으로 기록해 두고 초기화할 때는
+기준선과 달라진 테이블만 덤프에서 되돌린다.
+
+기준선에는 테이블(파티션이면 리프 파티션)마다 다음을 기록한다.
+- pg_stat_user_tables 의 n_tup_ins / n_tup_upd / n_tup_del 누적 카운터
+- pg_class.relfilenode (TRUNCATE·VACUUM FULL 은 카운터 대신 이 값을 바꾼다)
+- 열 정의 해시, 행 수와 내용 체크섬, 그리고 COPY 덤프 파일 (.mcp_baseline/<db>/<table>.copy.gz)
+
+초기화는 카탈로그 조회로 달라진 테이블을 찾고, 그 테이블을 참조하는 테이블까지
+묶어 TRUNCATE 한 번 → 외래키 의존 순서(부모 먼저)로 COPY → SERIAL 시퀀스 재설정 순으로
+되돌린다. 테이블이 삭제되거나 열이 바뀌는
+등 구조가 달라졌으면 템플릿(mcp_snapshot)에서 데이터베이스 전체를 복제하고 기준선을 다시 기록한다.
+
+통계 카운터만으로는 변경을 놓칠 수 있다. 다른 세션의 카운터는 그 세션이 공유 통계에
+반영해야 보이고(PG15+ 는 쉬는 세션 기준 최대 약 10초, pg_stat_force_next_flush 는 자기
+세션만 반영), PG15 이전의 통계 수집기는 UDP 라 값을 잃을 수 있으며, 서버가 비정상 종료되면
+카운터가 초기화된다. 그래서
+- 카운터를 읽기 전에 대상 데이터베이스의 최근 세션이 통계를 반영할 때까지 기다리거나
+  (BASELINE_TERMINATE=1 이면 끊어서 종료 시 반영시키고)
+- 카운터가 같다고 나온 테이블도 정확한 행 수와 내용 체크섬(행 해시의 합)을 기준선과 비교한다
+  (BASELINE_VERIFY=0 이면 생략해 테이블을 읽지 않는다).
+롤백된 트랜잭션의 카운터나 통계 초기화(pg_stat_reset)는 '변경'으로 보므로 불필요한 복원이 될 뿐이다.
+
+사용법:
+    python3 mcp_baseline.py record [mcp1 mcp5]   # 현재 상태를 기준선으로 기록 (덤프 포함)
+    python3 mcp_baseline.py reset [mcp1 mcp5]    # 달라진 테이블만 기준선으로 되돌림
+    python3 mcp_baseline.py status [mcp1 mcp5]   # 달라진 테이블만 출력
+"""
+
+import gzip
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from psycopg2 import sql
+
+from mcp_connections import connect, describe_sessions, run_with_lock_retry
+from mcp_loader import sync_sequences
+
+# 기준선 설정 (환경변수에서 로드)
+MCP_BASELINE = os.getenv("MCP_BASELINE", "0") == "1"  # 초기화(생성) 직후 기준선 기록
+BASELINE_DIR = os.getenv(
+    "BASELINE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".mcp_baseline")
+)
+BASELINE_WORKERS = int(os.getenv("BASELINE_WORKERS", 4))  # 동시에 처리하는 데이터베이스 수
+BASELINE_SETTLE_S = float(os.getenv("BASELINE_SETTLE_S", 3))  # 통계 카운터 반영을 기다리는 최대 시간
+BASELINE_VERIFY = os.getenv("BASELINE_VERIFY", "1") == "1"  # 카운터가 같은 테이블도 행 수·체크섬으로 확인
+BASELINE_LOCK_TIMEOUT_MS = int(os.getenv("BASELINE_LOCK_TIMEOUT_MS", 3000))  # TRUNCATE 잠금 대기 한도
+BASELINE_RETRIES = int(os.getenv("BASELINE_RETRIES", 3))  # 잠금 대기 시간 초과 시 재시도 횟수
+# 1 이면 초기화 전에 대상 데이터베이스의 최근 세션과, 잠금을 잡고 있는 세션을 끊는다
+BASELINE_TERMINATE = os.getenv("BASELINE_TERMINATE", "0") == "1"
+
+# 쉬는 세션이 쌓아 둔 통계를 공유 통계에 반영하는 최대 간격 (PG15+ PGSTAT_IDLE_INTERVAL 10초 + 여유)
+STATS_FLUSH_S = 11
+
+# 대상 데이터베이스 목록 (환경변수에서 로드)
+database_list = os.getenv("DATABASE_LIST", "mcp1,mcp2,mcp3,mcp4,mcp5")
+databases = [db.strip() for db in database_list.split(",")]
+
+# public 스키마의 리프 테이블별 변경 추적 정보 (일반 테이블과 파티션)
+TABLES_QUERY = """
+    SELECT c.relname,
+           r.relname AS root,
+           c.relfilenode,
+           s.n_tup_ins, s.n_tup_upd, s.n_tup_del, s.n_live_tup,
+           md5(string_agg(a.attname || ' ' || format_type(a.atttypid, a.atttypmod), ','
+                          ORDER BY a.attnum)) AS columns
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    JOIN pg_class r ON r.oid = coalesce(pg_partition_root(c.oid), c.oid)
+    JOIN pg_stat_user_tables s ON s.relid = c.oid
+    JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+    WHERE n.nspname = 'public' AND c.relkind = 'r'
+    GROUP BY c.oid, r.relname, s.n_tup_ins, s.n_tup_upd, s.n_tup_del, s.n_live_tup
+"""
+
+# 대상 데이터베이스에서 아직 통계를 반영하지 않았을 수 있는 다른 세션 (실행 중이거나 최근까지 실행)
+RECENT_SESSIONS_QUERY = """
+    SELECT pid, usename, application_name, state, date_trunc('second', now() - state_change)
+    FROM pg_stat_activity
+    WHERE datname = current_database() AND pid <> pg_backend_pid()
+      AND backend_type = 'client backend'
+      AND (state <> 'idle' OR state_change > now() - make_interval(secs => %s))
+    ORDER BY pid
+"""
+
+# 외래키 (참조하는 테이블 → 참조되는 테이블, 파티션 테이블은 최상위 테이블 이름)
+FOREIGN_KEYS_QUERY = """
+    SELECT DISTINCT c.relname, p.relname
+    FROM pg_constraint f
+    JOIN pg_class c ON c.oid = f.conrelid
+    JOIN pg_class p ON p.oid = f.confrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE f.contype = 'f' AND n.nspname = 'public' AND NOT c.relispartition
+      AND f.conrelid <> f.confrelid
+"""
+
+
+def _manifest_path(dbname):
+    return os.path.join(BASELINE_DIR, dbname, "manifest.json")
+
+
+def load_manifest(dbname):
+    path = _manifest_path(dbname)
+    if not os.path.exists(path):
+        raise RuntimeError(f"기준선이 없습니다: {dbname} (먼저 'record' 를 실행하세요)")
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_manifest(dbname, manifest):
+    path = _manifest_path(dbname)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _tables(cur):
+    cur.execute(TABLES_QUERY)
+    return {
+        name: {
+            "root": root,
+            "relfilenode": relfilenode,
+            "counters": [ins, upd, dele],
+            "live": live,
+            "columns": columns,
+        }
+        for name, root, relfilenode, ins, upd, dele, live, columns in cur.fetchall()
+    }
+
+
+def _settled_tables(cur, rows):
+    """통계 카운터가 테이블 행 수(rows)에 반영될 때까지 기다렸다가 추적 정보를 반환
+
+    다른 세션(적재 연결, 자기 자신)의 카운터는 트랜잭션이 끝난 뒤 조금 늦게 공유 통계에
+    반영되므로, 반영 전 값을 기준선으로 삼지 않도록 n_live_tup 이 행 수와 맞을 때까지 기다린다.
+    """
+    cur.execute("SELECT current_setting('server_version_num')::int >= 150000")
+    if cur.fetchone()[0]:
+        cur.execute("SELECT pg_stat_force_next_flush()")
+    cur.connection.commit()
+    deadline = time.perf_counter() + BASELINE_SETTLE_S
+    while True:
+        cur.execute("SELECT pg_stat_clear_snapshot()")
+        tables = _tables(cur)
+        cur.connection.commit()
+        if all(tables[name]["live"] == count for name, count in rows.items() if name in tables):
+            return tables
+        if time.perf_counter() > deadline:
+            print("  ⚠️ 통계 카운터 반영 대기 시간 초과 (다음 초기화에서 일부 테이블을 다시 복원할 수 있음)")
+            return tables
+        time.sleep(0.1)
+
+
+def _quiesce(cur, terminate=False):
+    """다른 세션이 쌓아 둔 통계 카운터가 공유 통계에 반영되도록 한다
+
+    terminate 면 최근 세션을 끊고(세션은 종료하면서 통계를 반영한다) 사라질 때까지 기다린다.
+    아니면 내용 확인(BASELINE_VERIFY)이 꺼져 있을 때만 세션이 쉬고 STATS_FLUSH_S 가 지날 때까지
+    기다린다. 내용 확인이 켜져 있으면 늦은 카운터는 그쪽에서 잡히므로 기다리지 않는다.
+    """
+    if not terminate and BASELINE_VERIFY:
+        return
+    deadline = time.perf_counter() + (BASELINE_SETTLE_S if terminate else STATS_FLUSH_S)
+    dbname = cur.connection.info.dbname
+    while True:
+        cur.execute("SELECT pg_stat_clear_snapshot()")
+        cur.execute(RECENT_SESSIONS_QUERY, (STATS_FLUSH_S,))
+        sessions = cur.fetchall()
+        if terminate and sessions:
+            cur.execute(
+                "SELECT pg_terminate_backend(pid) FROM unnest(%s::int[]) AS pid",
+                ([pid for pid, *_ in sessions],),
+            )
+            print(f"  🔌 {dbname}: 세션 {len(sessions)}개 종료")
+            terminate = False
+        cur.connection.commit()
+        if not sessions:
+            return
+        if time.perf_counter() > deadline:
+            print(f"  ⚠️ {dbname}: 통계를 반영하지 않은 세션이 남음 — {describe_sessions(sessions)}")
+            return
+        time.sleep(0.2)
+
+
+def _content(cur, names):
+    """테이블별 (정확한 행 수, 내용 체크섬) — 체크섬은 행 순서와 무관한 행 해시의 합"""
+    if not names:
+        return {}
+    cur.execute(
+        sql.SQL(" UNION ALL ").join(
+            sql.SQL(
+                "SELECT {}, count(*), coalesce(sum(hashtextextended(t::text, 0)), 0)::text FROM {} t"
+            ).format(sql.Literal(name), sql.Identifier(name))
+            for name in names
+        )
+    )
+    return {name: (count, checksum) for name, count, checksum in cur.fetchall()}
+
+
+def _changed_tables(cur, manifest, terminate=False):
+    """기준선과 달라진 리프 테이블 목록과 구조 변경 여부 (카운터 비교 + 내용 확인)"""
+    _quiesce(cur, terminate)
+    cur.execute("SELECT pg_stat_clear_snapshot()")
+    diverged, structural = diverged_tables(manifest, _tables(cur))
+    if not structural and BASELINE_VERIFY:
+        recorded = manifest["tables"]
+        content = _content(cur, [name for name in recorded if name not in diverged])
+        diverged = sorted(
+            {*diverged}
+            | {
+                name
+                for name, (count, checksum) in content.items()
+                if count != recorded[name]["rows"]
+                or checksum != recorded[name].get("checksum", checksum)
+            }
+        )
+    cur.connection.commit()
+    return diverged, structural
+
+
+def _dependency_order(roots, foreign_keys):
+    """최상위 테이블들을 외래키 의존 순서(참조되는 부모 먼저)로 정렬"""
+    ordered, visiting = [], set()
+
+    def visit(root):
+        if root in ordered or root in visiting:
+            return
+        visiting.add(root)
+        for child, parent in foreign_keys:
+            if child == root and parent in roots:
+                visit(parent)
+        visiting.discard(root)
+        ordered.append(root)
+
+    for root in sorted(roots):
+        visit(root)
+    return ordered
+
+
+def record_baseline(dbname, settle=True):
+    """현재 데이터를 테이블별로 덤프하고 변경 추적 정보와 함께 기준선으로 기록
+
+    settle 이 False 면 통계 카운터 반영을 기다리지 않는다 (템플릿에서 막 복제해 카운터가
+    모두 0 인 데이터베이스처럼 반영할 변경이 없을 때).
+    """
+    started = time.perf_counter()
+    directory = os.path.join(BASELINE_DIR, dbname)
+    os.makedirs(directory, exist_ok=True)
+    conn = connect(dbname)
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT pg_stat_clear_snapshot()")
+        names = sorted(_tables(cur))
+        conn.commit()
+        # 덤프와 행 수가 같은 시점을 보도록 스냅샷 하나에서 모두 읽는다
+        conn.set_session(isolation_level="REPEATABLE READ", readonly=True)
+        rows = {}
+        for name in names:
+            tmp_path = os.path.join(directory, f"{name}.copy.gz.tmp{os.getpid()}")
+            with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=1) as f:
+                cur.copy_expert(
+                    sql.SQL("COPY {} TO STDOUT").format(sql.Identifier(name)).as_string(conn), f
+                )
+            os.replace(tmp_path, os.path.join(directory, f"{name}.copy.gz"))
+            rows[name] = cur.rowcount
+        checksums = {name: checksum for name, (_, checksum) in _content(cur, names).items()}
+        conn.commit()
+        conn.set_session(isolation_level="DEFAULT", readonly=False)
+        tables = _settled_tables(cur, rows) if settle else _tables(cur)
+        cur.execute(FOREIGN_KEYS_QUERY)
+        foreign_keys = cur.fetchall()
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
+    for name, table in tables.items():
+        table["file"] = f"{name}.copy.gz"
+        table["rows"] = rows.get(name, 0)
+        table["checksum"] = checksums.get(name)
+        del table["live"]
+    _save_manifest(
+        dbname,
+        {
+            "database": dbname,
+            "recorded": datetime.now().isoformat(timespec="seconds"),
+            "tables": tables,
+            "foreign_keys": foreign_keys,
+        },
+    )
+    total = sum(rows.values())
+    print(
+        f"📌 {dbname}: 기준선 기록 (테이블 {len(tables)}개, {total:,}행,"
+        f" {time.perf_counter() - started:.2f}s)"
+    )
+
+
+def diverged_tables(manifest, current):
+    """기준선과 달라진 리프 테이블 목록과 구조 변경 여부 (삭제·추가된 테이블, 열 변경)"""
+    recorded = manifest["tables"]
+    if set(recorded) != set(current) or any(
+        recorded[name]["columns"] != current[name]["columns"] for name in recorded
+    ):
+        return [], True
+    diverged = [
+        name
+        for name, table in recorded.items()
+        if table["counters"] != current[name]["counters"]
+        or table["relfilenode"] != current[name]["relfilenode"]
+    ]
+    return sorted(diverged), False
+
+
+def restore_set(manifest, diverged):
+    """되돌릴 리프 테이블을 의존 순서로 반환
+
+    달라진 테이블을 참조하는 테이블(외래키, 간접 참조 포함)은 함께 비워야 하므로 모두 포함한다.
+    """
+    tables = manifest["tables"]
+    foreign_keys = [tuple(fk) for fk in manifest["foreign_keys"]]
+    referencing, pending = set(), {tables[name]["root"] for name in diverged}
+    while pending:
+        parent = pending.pop()
+        for child, referenced in foreign_keys:
+            if referenced == parent and child not in referencing:
+                referencing.add(child)
+                pending.add(child)
+    leaves = set(diverged) | {name for name, t in tables.items() if t["root"] in referencing}
+    roots = {tables[name]["root"] for name in leaves}
+    order = _dependency_order(roots, foreign_keys)
+    return sorted(leaves, key=lambda name: (order.index(tables[name]["root"]), name))
+
+
+def reset_database(dbname):
+    """달라진 테이블만 기준선 덤프로 되돌리고 (복원한 테이블 목록, 소요 시간) 반환"""
+    started = time.perf_counter()
+    manifest = load_manifest(dbname)
+    directory = os.path.join(BASELINE_DIR, dbname)
+    conn = connect(dbname)
+    try:
+        cur = conn.cursor()
+        diverged, structural = _changed_tables(cur, manifest, BASELINE_TERMINATE)
+        if structural:
+            conn.close()
+            return _reset_from_template(dbname), time.perf_counter() - started
+        if not diverged:
+            conn.commit()
+            return [], time.perf_counter() - started
+
+        leaves = restore_set(manifest, diverged)
+        recorded = manifest["tables"]
+        roots = sorted({recorded[name]["root"] for name in leaves})
+        # 외래키는 파티션 테이블(최상위)에 걸려 있으므로, 리프를 모두 비우는 파티션 테이블은
+        # 최상위 이름으로 TRUNCATE 해야 참조 관계 검사를 통과한다
+        whole = {
+            root
+            for root in roots
+            if all(name in leaves for name, t in recorded.items() if t["root"] == root)
+        }
+        targets = sorted(whole | {name for name in leaves if recorded[name]["root"] not in whole})
+        cur.execute(
+            "SELECT oid FROM pg_class WHERE relnamespace = 'public'::regnamespace AND relname = ANY(%s)",
+            (sorted({*leaves, *targets}),),
+        )
+        oids = [oid for (oid,) in cur.fetchall()]
+        conn.commit()
+
+        def restore(cur):
+            # 참조하는 테이블까지 모두 포함했으므로 CASCADE 없이 한 번에 비운다
+            cur.execute(
+                sql.SQL("TRUNCATE {}").format(
+                    sql.SQL(", ").join(sql.Identifier(name) for name in targets)
+                )
+            )
+            for name in leaves:
+                path = os.path.join(directory, recorded[name]["file"])
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    cur.copy_expert(
+                        sql.SQL("COPY {} FROM STDIN").format(sql.Identifier(name)).as_string(conn), f
+                    )
+            sync_sequences(cur, roots)
+
+        run_with_lock_retry(
+            cur, oids, restore, dbname, BASELINE_LOCK_TIMEOUT_MS, BASELINE_RETRIES, BASELINE_TERMINATE
+        )
+        tables = _settled_tables(cur, {name: recorded[name]["rows"] for name in leaves})
+        cur.close()
+    finally:
+        conn.close()
+    # 복원으로 바뀐 카운터·relfilenode 를 새 기준선으로 (덤프는 그대로)
+    for name in leaves:
+        recorded[name]["counters"] = tables[name]["counters"]
+        recorded[name]["relfilenode"] = tables[name]["relfilenode"]
+    _save_manifest(dbname, manifest)
+    return leaves, time.perf_counter() - started
+
+
+def _reset_from_template(dbname):
+    """구조가 바뀐 데이터베이스를 템플릿에서 통째로 복제하고 기준선을 다시 기록"""
+    from mcp_snapshot import restore_snapshot
+
+    print(f"  ⚠️ {dbname}: 테이블 구조가 기준선과 다릅니다 — 템플릿에서 전체 복원")
+    restore_snapshot(dbname)
+    record_baseline(dbname, settle=False)
+    return ["*"]
+
+
+def baseline_status(dbname):
+    manifest = load_manifest(dbname)
+    conn = connect(dbname)
+    try:
+        with conn.cursor() as cur:
+            diverged, structural = _changed_tables(cur, manifest)
+    finally:
+        conn.close()
+    if structural:
+        print(f"⚠️ {dbname}: 테이블 구조 변경 (초기화 시 템플릿에서 전체 복원)")
+    elif diverged:
+        restore = restore_set(manifest, diverged)
+        extra = [name for name in restore if name not in diverged]
+        note = f" (+ 참조 테이블 {', '.join(extra)})" if extra else ""
+        print(f"✏️ {dbname}: 변경된 테이블 {', '.join(diverged)}{note}")
+    else:
+        print(f"✅ {dbname}: 기준선과 같음 ({manifest['recorded']} 기록)")
+
+
+def reset(names, workers=BASELINE_WORKERS):
+    """데이터베이스들을 동시에 선택적 초기화하고 실패한 데이터베이스 목록을 반환"""
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(names)))) as executor:
+        futures = {executor.submit(reset_database, name): name for name in names}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                restored, elapsed = future.result()
+            except Exception as e:
+                print(f"❌ {name}: {str(e).strip()}")
+                failed.append(name)
+                continue
+            if not restored:
+                print(f"✅ {name}: 변경 없음 ({elapsed:.3f}s)")
+            elif restored != ["*"]:
+                print(f"♻️ {name}: {', '.join(restored)} 복원 ({elapsed:.2f}s)")
+            else:
+                print(f"♻️ {name}: 템플릿에서 전체 복원 ({elapsed:.2f}s)")
+    return failed
+
+
+if __name__ == "__main__":
+    commands = {"record": record_baseline, "status": baseline_status}
+    if len(sys.argv) < 2 or sys.argv[1] not in (*commands, "reset"):
+        print(__doc__)
+        raise SystemExit(2)
+    names = sys.argv[2:] or databases
+
+    started = time.perf_counter()
+    if sys.argv[1] == "reset":
+        failed = reset(names)
+    else:
+        failed = []
+        for db in names:
+            try:
+                commands[sys.argv[1]](db)
+            except Exception as e:
+                print(f"❌ {db}: {e}")
+                failed.append(db)
+    print(f"⏱️ 전체 소요 시간: {time.perf_counter() - started:.2f}s")
+    if failed:
+        raise SystemExit(1)
@@ -0,0 +1,411 @@
+"""MCP 데이터 초기화 벤치마크
+
+일회용 로컬 PostgreSQL 클러스터(initdb + pg_ctl, 임시 디렉터리의 유닉스 소켓)를 띄워
+시나리오(insert_mcp1 ~ insert_mcp5)를 규모 배율(SCALE_FACTOR)별로 실행하고 다음을 기록한다.
+- 벽시계 시간, 클라이언트 CPU 시간(user/sys), 최대 RSS  — 실행마다 별도 자식 프로세스(wait4)
+- 서버 왕복 횟수 (execute / copy_expert / commit 호출 수, 접속 횟수 — IO_BACKEND=async 면 파이프라인 1회를 1번으로)
+- 단계별 소요 시간, 테이블별 적재 행 수·생성/전송 시간·초당 행 수 (mcp_metrics 이벤트)
+
+사용법:
+    python3 mcp_benchmark.py run --sizes 1,5 --scenarios mcp1,mcp5 --output bench.json
+    python3 mcp_benchmark.py compare base.json bench.json --threshold 0.1
+    IO_BACKEND=async python3 mcp_benchmark.py run --output bench-async.json   # 동기 경로와 비교
+
+--latency-ms 를 주면 클러스터 앞에 왕복 지연을 넣는 TCP 프록시를 두어 원격 서버(RDS 등)처럼 측정한다.
+IO_BACKEND=sync / async 결과를 이 조건에서 비교하면 파이프라인·동시 적재 효과를 확인할 수 있다.
+
+initdb/pg_ctl 은 PATH 또는 PG_BIN(--pg-bin) 에서 찾는다. postgres 는 root 로 실행할 수 없으므로
+일반 사용자 계정에서 실행한다. --host 를 주면 클러스터를 띄우지 않고 해당 서버를 그대로 쓰는데,
+이때 대상 서버의 mcpN 데이터베이스는 실행마다 삭제되므로 반드시 일회용 서버여야 한다.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+BENCH_USER = "postgres"
+# 비교 시 회귀로 판단할 지표 (값이 클수록 나쁨)
+COMPARE_METRICS = ("wall_s", "cpu_s", "peak_rss_mb", "round_trips")
+# 실행 환경 중 결과에 함께 기록할 설정
+RECORDED_SETTINGS = (
+    "GEN_BACKEND",
+    "IO_BACKEND",
+    "LOAD_METHOD",
+    "LOAD_MODE",
+    "UNLOGGED_LOAD",
+    "FAKER_POOL",
+    "GEN_CHUNK_ROWS",
+    "MCP_SEED",
+)
+
+
+# ---------------------------------------------------------------------------
+# 일회용 PostgreSQL 클러스터
+# ---------------------------------------------------------------------------
+
+
+class DisposableCluster:
+    """임시 디렉터리에 만든 PostgreSQL 클러스터 (TCP 없이 유닉스 소켓만 사용)"""
+
+    def __init__(self, pg_bin=None):
+        self.pg_bin = pg_bin
+        self.root = tempfile.mkdtemp(prefix="mcp-bench-")
+        self.data_dir = os.path.join(self.root, "data")
+        self.host = self.root  # 소켓 디렉터리
+
+    def _tool(self, name):
+        path = os.path.join(self.pg_bin, name) if self.pg_bin else shutil.which(name)
+        if not path or not os.path.exists(path):
+            raise RuntimeError(f"{name} 을 찾을 수 없습니다 (PATH 또는 --pg-bin 지정)")
+        return path
+
+    def start(self):
+        subprocess.run(
+            [self._tool("initdb"), "-D", self.data_dir, "-U", BENCH_USER, "-A", "trust", "-E", "UTF8"],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        options = f"-c listen_addresses='' -c unix_socket_directories='{self.host}'"
+        subprocess.run(
+            [self._tool("pg_ctl"), "-D", self.data_dir, "-o", options, "-w", "-l",
+             os.path.join(self.root, "server.log"), "start"],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        print(f"🐘 일회용 PostgreSQL 시작: {self.host}")
+
+    def stop(self):
+        subprocess.run(
+            [self._tool("pg_ctl"), "-D", self.data_dir, "-m", "immediate", "stop"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        shutil.rmtree(self.root, ignore_errors=True)
+        print("🧹 일회용 PostgreSQL 정리 완료")
+
+
+class LatencyProxy:
+    """TCP 로 받은 연결을 유닉스 소켓의 PostgreSQL 로 넘기면서 방향마다 latency_ms/2 만큼 늦추는 프록시
+
+    별도 스레드의 이벤트 루프에서 돌며, 보낸 순서는 그대로 유지한다.
+    """
+
+    def __init__(self, socket_dir, latency_ms):
+        self.socket_path = os.path.join(socket_dir, ".s.PGSQL.5432")
+        self.delay = latency_ms / 2000
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self._handle, "127.0.0.1", 0), self._loop
+        ).result()
+        self.port = server.sockets[0].getsockname()[1]
+        print(f"🐢 왕복 지연 프록시: 127.0.0.1:{self.port} (+{self.delay * 2000:g}ms)")
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    async def _handle(self, client_reader, client_writer):
+        server_reader, server_writer = await asyncio.open_unix_connection(self.socket_path)
+        await asyncio.gather(
+            self._pipe(client_reader, server_writer),
+            self._pipe(server_reader, client_writer),
+            return_exceptions=True,
+        )
+        for writer in (client_writer, server_writer):
+            writer.close()
+
+    async def _pipe(self, reader, writer):
+        queue = asyncio.Queue()
+
+        async def deliver():
+            while (item := await queue.get()) is not None:
+                due, data = item
+                await asyncio.sleep(max(due - self._loop.time(), 0))
+                writer.write(data)
+                await writer.drain()
+            writer.close()
+
+        delivery = asyncio.ensure_future(deliver())
+        try:
+            while data := await reader.read(65536):
+                queue.put_nowait((self._loop.time() + self.delay, data))
+        finally:
+            queue.put_nowait(None)
+            await delivery
+
+
+def _drop_database(host, dbname):
+    import psycopg2
+    from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+    conn = psycopg2.connect(host=host, dbname="postgres", user=BENCH_USER, password="")
+    conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+    cur = conn.cursor()
+    cur.execute(f"DROP DATABASE IF EXISTS {dbname} WITH (FORCE)")
+    cur.close()
+    conn.close()
+
+
+# ---------------------------------------------------------------------------
+# 자식 프로세스: 시나리오 하나 실행
+# ---------------------------------------------------------------------------
+
+
+def _run_child(scenario, report_path):
+    """(자식 프로세스) 왕복 횟수·테이블별 적재 통계를 수집하며 시나리오 하나를 실행"""
+    import psycopg2
+    import psycopg2.extensions
+
+    counters = {"round_trips": 0, "connections": 0}
+
+    class CountingCursor(psycopg2.extensions.cursor):
+        def execute(self, query, vars=None):
+            counters["round_trips"] += 1
+            return super().execute(query, vars)
+
+        def executemany(self, query, vars_list):
+            vars_list = list(vars_list)
+            counters["round_trips"] += len(vars_list)
+            return super().executemany(query, vars_list)
+
+        def copy_expert(self, sql, file, size=8192):
+            counters["round_trips"] += 1
+            return super().copy_expert(sql, file, size)
+
+    class CountingConnection(psycopg2.extensions.connection):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            counters["connections"] += 1
+            self.cursor_factory = CountingCursor
+
+        def commit(self):
+            counters["round_trips"] += 1
+            return super().commit()
+
+    connect = psycopg2.connect
+    psycopg2.connect = lambda *a, **kw: connect(*a, connection_factory=CountingConnection, **kw)
+
+    import mcp_data_initializer
+    import mcp_metrics
+
+    started = time.perf_counter()
+    mcp_data_initializer.SCENARIOS[scenario]()
+    wall = time.perf_counter() - started
+    if "mcp_async_loader" in sys.modules:
+        # IO_BACKEND=async: psycopg 3 연결의 왕복·접속 횟수를 합산
+        for key, value in sys.modules["mcp_async_loader"].stats.items():
+            counters[key] += value
+    tables, phases = {}, {}
+    for event in mcp_metrics.take_events():
+        if event["kind"] == "table":
+            tables[event["table"]] = {
+                key: event[key]
+                for key in ("rows", "seconds", "generate_seconds", "load_seconds", "rows_per_s")
+            }
+        elif event["kind"] == "phase":
+            phases[event["phase"]] = phases.get(event["phase"], 0.0) + event["seconds"]
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump({"wall_s": wall, "tables": tables, "phases": phases, **counters}, f)
+
+
+def run_once(scenario, scale_factor, host, port=None):
+    """시나리오 하나를 새 자식 프로세스로 실행하고 측정값을 반환 (port 가 있으면 지연 프록시 경유)"""
+    _drop_database(host, scenario)
+    fd, report_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    env = dict(
+        os.environ,
+        DB_HOST="127.0.0.1" if port else host,
+        DB_PORT=str(port or 5432),
+        DB_USER=BENCH_USER,
+        DB_PASSWORD="",
+        SCALE_FACTOR=str(scale_factor),
+        MCP_SNAPSHOT="0",
+    )
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "_child", scenario, report_path],
+        env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdout=subprocess.DEVNULL,
+    )
+    # wait4 로 해당 자식만의 CPU 시간과 최대 RSS 를 얻는다
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    elapsed = time.perf_counter() - started
+    try:
+        if proc.returncode != 0:
+            raise RuntimeError(f"{scenario} (SF={scale_factor}) 실행 실패 (종료 코드 {proc.returncode})")
+        with open(report_path, encoding="utf-8") as f:
+            child = json.load(f)
+    finally:
+        os.remove(report_path)
+    # ru_maxrss 는 Linux 에서 KB, macOS 에서 바이트 단위
+    rss_mb = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    total_rows = sum(t["rows"] for t in child["tables"].values())
+    return {
+        "scenario": scenario,
+        "scale_factor": scale_factor,
+        "wall_s": round(child["wall_s"], 4),
+        "process_s": round(elapsed, 4),
+        "cpu_user_s": round(usage.ru_utime, 4),
+        "cpu_sys_s": round(usage.ru_stime, 4),
+        "cpu_s": round(usage.ru_utime + usage.ru_stime, 4),
+        "peak_rss_mb": round(rss_mb, 1),
+        "round_trips": child["round_trips"],
+        "connections": child["connections"],
+        "rows": total_rows,
+        "rows_per_s": round(total_rows / child["wall_s"], 1) if child["wall_s"] else None,
+        "phases": child["phases"],
+        "tables": child["tables"],
+    }
+
+
+def run_benchmark(scenarios, sizes, repeat=1, host=None, pg_bin=None, latency_ms=0):
+    cluster = proxy = None
+    if host is None:
+        cluster = DisposableCluster(pg_bin)
+        cluster.start()
+        host = cluster.host
+    results = []
+    try:
+        if latency_ms:
+            proxy = LatencyProxy(host, latency_ms)
+            proxy.start()
+        for scale_factor in sizes:
+            for scenario in scenarios:
+                for i in range(repeat):
+                    result = run_once(scenario, scale_factor, host, proxy and proxy.port)
+                    result["repeat"] = i
+                    results.append(result)
+                    print(
+                        f"📏 {scenario} SF={scale_factor:g} #{i + 1}: {result['wall_s']:.2f}s"
+                        f" | CPU {result['cpu_s']:.2f}s | RSS {result['peak_rss_mb']:.0f}MB"
+                        f" | 왕복 {result['round_trips']}회 | {result['rows_per_s'] or 0:,.0f} rows/s"
+                    )
+    finally:
+        if proxy is not None:
+            proxy.stop()
+        if cluster is not None:
+            cluster.stop()
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {name: os.getenv(name) for name in RECORDED_SETTINGS if os.getenv(name)},
+        "latency_ms": latency_ms,
+        "results": results,
+    }
+
+
+# ---------------------------------------------------------------------------
+# 결과 비교
+# ---------------------------------------------------------------------------
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+
+
+def summarize(report):
+    """(시나리오, SF) 별 지표 중앙값"""
+    groups = {}
+    for result in report["results"]:
+        groups.setdefault((result["scenario"], result["scale_factor"]), []).append(result)
+    return {
+        key: {metric: _median([r[metric] for r in runs]) for metric in COMPARE_METRICS}
+        for key, runs in groups.items()
+    }
+
+
+def compare(base, new, threshold=0.1):
+    """두 결과의 공통 (시나리오, SF) 를 비교해 회귀 목록을 반환하고 표를 출력"""
+    base_summary, new_summary = summarize(base), summarize(new)
+    regressions = []
+    print(f"{'시나리오':<8} {'SF':>6} {'지표':<12} {'기준':>12} {'신규':>12} {'변화':>8}")
+    for key in sorted(base_summary.keys() & new_summary.keys()):
+        for metric in COMPARE_METRICS:
+            old, cur = base_summary[key][metric], new_summary[key][metric]
+            change = (cur - old) / old if old else 0.0
+            flag = ""
+            if change > threshold:
+                flag = " ⚠️ 회귀"
+                regressions.append((*key, metric, old, cur, change))
+            elif change < -threshold:
+                flag = " ✅ 개선"
+            print(
+                f"{key[0]:<8} {key[1]:>6g} {metric:<12} {old:>12,.2f} {cur:>12,.2f} {change:>+7.1%}{flag}"
+            )
+    missing = base_summary.keys() ^ new_summary.keys()
+    if missing:
+        print(f"ℹ️ 한쪽에만 있는 항목: {sorted(missing)}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MCP 데이터 초기화 벤치마크")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="일회용 PostgreSQL 에서 시나리오 벤치마크 실행")
+    run.add_argument("--scenarios", default="mcp1,mcp2,mcp3,mcp4,mcp5")
+    run.add_argument("--sizes", default="1", help="SCALE_FACTOR 목록 (예: 1,5,10)")
+    run.add_argument("--repeat", type=int, default=1)
+    run.add_argument("--output", default="bench.json")
+    run.add_argument("--pg-bin", default=os.getenv("PG_BIN"), help="initdb/pg_ctl 위치")
+    run.add_argument("--host", help="이미 떠 있는 일회용 서버 사용 (mcpN 데이터베이스가 삭제됨)")
+    run.add_argument(
+        "--latency-ms", type=float, default=0, help="왕복 지연(ms)을 넣는 프록시 경유 (유닉스 소켓 서버만)"
+    )
+
+    cmp = sub.add_parser("compare", help="두 결과 파일을 비교해 회귀 표시")
+    cmp.add_argument("base")
+    cmp.add_argument("new")
+    cmp.add_argument("--threshold", type=float, default=0.1, help="회귀로 볼 증가율 (기본 10%%)")
+
+    child = sub.add_parser("_child")
+    child.add_argument("scenario")
+    child.add_argument("report")
+
+    args = parser.parse_args(argv)
+    if args.command == "_child":
+        _run_child(args.scenario, args.report)
+        return 0
+    if args.command == "compare":
+        with open(args.base, encoding="utf-8") as f:
+            base = json.load(f)
+        with open(args.new, encoding="utf-8") as f:
+            new = json.load(f)
+        regressions = compare(base, new, args.threshold)
+        if regressions:
+            print(f"❌ 회귀 {len(regressions)}건 (임계값 {args.threshold:.0%})")
+            return 1
+        print("✅ 회귀 없음")
+        return 0
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    sizes = [float(s) for s in args.sizes.split(",") if s.strip()]
+    report = run_benchmark(scenarios, sizes, args.repeat, args.host, args.pg_bin, args.latency_ms)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"💾 결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,196 @@
+"""MCP 도구 통합 진입점
+
+각 도구 모듈은 하위 명령을 실행할 때만 불러온다. 그래서 `status` 처럼 가벼운 명령은
+NumPy·Faker·psycopg 3 를 불러오지 않고 바로 답한다.
+
+사용법:
+    python3 mcp_cli.py init [--seed 42] [--top-up]      # mcp_data_initializer.py
+    python3 mcp_cli.py status [mcp1 mcp5] [-v]          # 카탈로그 조회만으로 현황 출력
+    python3 mcp_cli.py cleanup                          # cleanup-mcp-data.py
+    python3 mcp_cli.py baseline record|reset|status     # mcp_baseline.py (변경된 테이블만 초기화)
+    python3 mcp_cli.py snapshot snapshot|reset|status   # mcp_snapshot.py
+    python3 mcp_cli.py fanout provision|drop|status     # mcp_fanout.py
+    python3 mcp_cli.py workload apply|refresh|drop      # mcp_workload.py
+    python3 mcp_cli.py replay --clients 50              # mcp_replay.py
+    python3 mcp_cli.py benchmark run|compare            # mcp_benchmark.py
+    python3 mcp_cli.py faker-pool [name ...]            # mcp_faker_pool.py
+    python3 mcp_cli.py imports                          # 모듈 import 시간 측정 (예산 초과 시 종료 코드 1)
+
+`status` 는 pg_database / pg_class / pg_stat_user_tables 카탈로그만 읽으므로 행 수는
+추정치(reltuples 또는 n_live_tup)다. 정확한 행 수가 필요하면 TOPUP_COUNT=exact 로 top-up 을 쓴다.
+"""
+
+import os
+import re
+import runpy
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# 하위 명령 → 실행할 스크립트 (모듈 이름 또는 파일 이름)
+COMMANDS = {
+    "init": "mcp_data_initializer",
+    "cleanup": "cleanup-mcp-data.py",
+    "baseline": "mcp_baseline",
+    "snapshot": "mcp_snapshot",
+    "fanout": "mcp_fanout",
+    "workload": "mcp_workload",
+    "replay": "mcp_replay",
+    "benchmark": "mcp_benchmark",
+    "faker-pool": "mcp_faker_pool",
+}
+
+# import 시간 예산 (환경변수에서 로드, 밀리초)
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", 500))
+# 불러오기만 해서는 NumPy·Faker 를 불러오면 안 되는 모듈 (생성 단계에서만 필요)
+LIGHT_MODULES = (
+    "mcp_cli",
+    "mcp_settings",
+    "mcp_connections",
+    "mcp_faker_pool",
+    "mcp_dataset_cache",
+    "mcp_baseline",
+    "mcp_data_initializer",
+    "mcp_snapshot",
+    "mcp_fanout",
+    "mcp_workload",
+    "mcp_replay",
+)
+HEAVY_PACKAGES = ("numpy", "faker")
+
+STATUS_QUERY = """
+    SELECT coalesce(pg_partition_root(c.oid), c.oid)::regclass::text AS name,
+           sum(greatest(c.reltuples, coalesce(s.n_live_tup, 0)))::bigint,
+           sum(pg_total_relation_size(c.oid))::bigint
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+    WHERE n.nspname = 'public' AND c.relkind = 'r'
+    GROUP BY 1
+    ORDER BY 1
+"""
+
+
+def run_tool(command, argv):
+    """하위 명령의 스크립트를 __main__ 으로 실행 (sys.argv 를 해당 스크립트 기준으로 바꿔서)"""
+    target = COMMANDS[command]
+    sys.argv = [target, *argv]
+    if target.endswith(".py"):
+        runpy.run_path(os.path.join(HERE, target), run_name="__main__")
+    else:
+        runpy.run_module(target, run_name="__main__", alter_sys=True)
+
+
+def _megabytes(size):
+    return f"{size / 1024 / 1024:.1f} MB"
+
+
+def status(names, verbose=False):
+    """시나리오 데이터베이스·템플릿의 존재 여부, 크기, 테이블별 추정 행 수를 출력"""
+    from mcp_connections import admin_connection, close_all, connect
+    from mcp_snapshot import template_name
+
+    started = time.perf_counter()
+    cur = admin_connection().cursor()
+    cur.execute(
+        """
+        SELECT datname, pg_database_size(datname) FROM pg_database
+        WHERE datname = ANY(%s) OR datname = ANY(%s)
+        """,
+        (names, [template_name(name) for name in names]),
+    )
+    sizes = dict(cur.fetchall())
+    cur.close()
+    for name in names:
+        if name not in sizes:
+            print(f"⚠️ {name}: 데이터베이스 없음")
+            continue
+        conn = connect(name)
+        try:
+            with conn.cursor() as db_cur:
+                db_cur.execute(STATUS_QUERY)
+                tables = db_cur.fetchall()
+        finally:
+            conn.close()
+        template = sizes.get(template_name(name))
+        template = f"템플릿 {_megabytes(template)}" if template is not None else "템플릿 없음"
+        rows = sum(max(count, 0) for _, count, _ in tables)
+        print(
+            f"📊 {name}: {_megabytes(sizes[name])}, 테이블 {len(tables)}개,"
+            f" 약 {rows:,}행 ({template})"
+        )
+        if verbose:
+            for table, count, size in tables:
+                print(f"    {table:<28} {max(count, 0):>12,}행 {_megabytes(size):>10}")
+    close_all()
+    print(f"⏱️ 조회 시간: {time.perf_counter() - started:.3f}s")
+
+
+def import_time(module):
+    """새 인터프리터에서 module 을 불러오는 데 걸린 시간(ms)과 함께 불러온 무거운 패키지"""
+    code = (
+        f"import sys; import {module}; "
+        f"print(','.join(p for p in {HEAVY_PACKAGES!r} if p in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=HERE,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # "import time: self [us] | cumulative | imported package" 중 대상 모듈 줄의 누적 시간
+    pattern = re.compile(rf"^import time:\s*\d+\s*\|\s*(\d+)\s*\|\s*{re.escape(module)}$")
+    micros = next(
+        int(match.group(1))
+        for match in map(pattern.match, result.stderr.splitlines())
+        if match
+    )
+    heavy = [p for p in result.stdout.strip().split(",") if p]
+    return micros / 1000, heavy
+
+
+def check_imports(modules=LIGHT_MODULES, budget_ms=IMPORT_BUDGET_MS):
+    """가벼워야 하는 모듈들의 import 시간을 재고, 예산 초과나 NumPy·Faker 로드가 있으면 실패 수를 반환"""
+    failed = 0
+    for module in modules:
+        elapsed, heavy = import_time(module)
+        problems = []
+        if elapsed > budget_ms:
+            problems.append(f"예산 {budget_ms:.0f}ms 초과")
+        if heavy:
+            problems.append(f"{', '.join(heavy)} 로드")
+        mark = "❌" if problems else "✅"
+        note = f" — {'; '.join(problems)}" if problems else ""
+        print(f"{mark} {module:<22} {elapsed:>7.1f}ms{note}")
+        failed += bool(problems)
+    return failed
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print(__doc__)
+        return 0 if argv else 2
+    command, rest = argv[0], argv[1:]
+    if command == "status":
+        verbose = "-v" in rest
+        names = [arg for arg in rest if arg != "-v"]
+        if not names:
+            database_list = os.getenv("DATABASE_LIST", "mcp1,mcp2,mcp3,mcp4,mcp5")
+            names = [db.strip() for db in database_list.split(",")]
+        status(names, verbose)
+        return 0
+    if command == "imports":
+        return 1 if check_imports(rest or LIGHT_MODULES) else 0
+    if command not in COMMANDS:
+        print(__doc__)
+        return 2
+    run_tool(command, rest)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
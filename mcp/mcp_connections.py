@@ -0,0 +1,255 @@
+"""MCP 스크립트 공용 PostgreSQL 연결 관리자
+
+시나리오·데이터베이스마다 새로 접속하면 (특히 TLS 를 쓰는 RDS 에서) 핸드셰이크 비용이 매번 든다.
+프로세스마다 다음을 재사용한다.
+- 관리용(admin) 연결 1개: postgres 데이터베이스, autocommit (CREATE/DROP DATABASE 등)
+- 데이터베이스별 연결 풀: 반환된 연결을 DB_POOL_SIZE 개까지 보관했다가 다시 내준다
+
+연결을 내줄 때마다 상태 검사(닫힘·트랜잭션 상태)를 하고, DB_POOL_PING_AFTER 초 이상 놀던 연결은
+SELECT 1 로 살아 있는지 확인한 뒤 죽었으면 새로 접속한다.
+
+fork 로 만든 워커 프로세스는 부모의 소켓을 함께 쓰면 안 되므로, 프로세스가 바뀌면 새 관리자를 만든다.
+
+테이블을 비우는 도구(cleanup, baseline)는 run_with_lock_retry 로 잠금 대기 한도를 걸고,
+한도를 넘으면 잡고 있는 세션을 보고한 뒤 재시도한다.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import errors
+from psycopg2.extensions import (
+    ISOLATION_LEVEL_AUTOCOMMIT,
+    TRANSACTION_STATUS_IDLE,
+    TRANSACTION_STATUS_UNKNOWN,
+)
+
+from mcp_settings import DB_HOST, DB_PASSWORD, DB_PORT, DB_SSLMODE, DB_USER
+
+# 연결 풀 설정 (환경변수에서 로드)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 2))  # 데이터베이스별로 보관할 유휴 연결 수 (0 이면 풀 없음)
+DB_POOL_PING_AFTER = float(os.getenv("DB_POOL_PING_AFTER", 30))  # 이 시간(초) 이상 놀던 연결은 SELECT 1 로 확인
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", 10))
+
+
+# 대상 테이블에 잠금을 잡고 있는 다른 세션
+BLOCKERS_QUERY = """
+    SELECT DISTINCT a.pid, a.usename, a.application_name, a.state,
+           date_trunc('second', now() - a.xact_start)
+    FROM pg_locks l JOIN pg_stat_activity a ON a.pid = l.pid
+    WHERE l.granted AND l.relation = ANY(%s) AND a.pid <> pg_backend_pid()
+    ORDER BY a.pid
+"""
+
+
+def connect(dbname, autocommit=False):
+    """공통 접속 정보로 새 연결을 연다"""
+    options = {}
+    if DB_SSLMODE:
+        options["sslmode"] = DB_SSLMODE
+    conn = psycopg2.connect(
+        host=DB_HOST,
+        port=DB_PORT,
+        dbname=dbname,
+        user=DB_USER,
+        password=DB_PASSWORD,
+        connect_timeout=DB_CONNECT_TIMEOUT,
+        keepalives=1,
+        **options,
+    )
+    if autocommit:
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+    return conn
+
+
+class ConnectionManager:
+    """관리용 연결 1개 + 데이터베이스별 유휴 연결 풀"""
+
+    def __init__(self, pool_size=DB_POOL_SIZE, ping_after=DB_POOL_PING_AFTER):
+        self.pid = os.getpid()
+        self.pool_size = pool_size
+        self.ping_after = ping_after
+        self._admin = None
+        self._admin_used = 0.0
+        self._idle = {}  # dbname → [(연결, 마지막 사용 시각)]
+        self.opened = 0  # 새로 접속한 횟수 (재사용 효과 확인용)
+
+    def _open(self, dbname, autocommit=False):
+        self.opened += 1
+        return connect(dbname, autocommit)
+
+    def _healthy(self, conn, last_used):
+        if conn.closed:
+            return False
+        status = conn.info.transaction_status
+        if status == TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if status != TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                return False
+        if time.monotonic() - last_used < self.ping_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            if not conn.autocommit:
+                conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def admin(self):
+        """postgres 데이터베이스에 대한 autocommit 관리용 연결 (재사용)"""
+        if self._admin is None or not self._healthy(self._admin, self._admin_used):
+            if self._admin is not None:
+                self._close(self._admin)
+            self._admin = self._open("postgres", autocommit=True)
+        self._admin_used = time.monotonic()
+        return self._admin
+
+    def get(self, dbname):
+        """dbname 연결을 풀에서 꺼내거나 새로 연다 (사용 후 put 으로 반환)"""
+        idle = self._idle.get(dbname, [])
+        while idle:
+            conn, last_used = idle.pop()
+            if self._healthy(conn, last_used):
+                return conn
+            self._close(conn)
+        return self._open(dbname)
+
+    def put(self, conn, dbname=None):
+        """연결을 풀에 반환 (풀이 가득 찼거나 상태가 나쁘면 닫는다)"""
+        dbname = dbname or conn.info.dbname
+        if conn.closed:
+            return
+        if conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                self._close(conn)
+                return
+        if conn.autocommit:
+            conn.autocommit = False
+        idle = self._idle.setdefault(dbname, [])
+        if len(idle) < self.pool_size:
+            idle.append((conn, time.monotonic()))
+        else:
+            self._close(conn)
+
+    @contextmanager
+    def connection(self, dbname):
+        """with 블록 동안 dbname 연결을 빌려 쓴다 (예외 시 롤백 후 반환)"""
+        conn = self.get(dbname)
+        try:
+            yield conn
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            self.put(conn, dbname)
+
+    def close_database(self, dbname):
+        """dbname 의 유휴 연결을 모두 닫음 (DROP/템플릿 복제처럼 다른 세션이 없어야 할 때)"""
+        for conn, _ in self._idle.pop(dbname, []):
+            self._close(conn)
+
+    def close_all(self):
+        for dbname in list(self._idle):
+            self.close_database(dbname)
+        if self._admin is not None:
+            self._close(self._admin)
+            self._admin = None
+
+
+_manager = None
+_inherited = []  # fork 로 물려받은 관리자 (부모와 공유하는 소켓을 닫지 않도록 참조만 유지)
+
+
+def get_manager():
+    """현재 프로세스의 연결 관리자"""
+    global _manager
+    if _manager is not None and _manager.pid != os.getpid():
+        _inherited.append(_manager)
+        _manager = None
+    if _manager is None:
+        _manager = ConnectionManager()
+    return _manager
+
+
+def admin_connection():
+    return get_manager().admin()
+
+
+def get_connection(dbname):
+    return get_manager().get(dbname)
+
+
+def release_connection(conn, dbname=None):
+    get_manager().put(conn, dbname)
+
+
+def close_database(dbname):
+    get_manager().close_database(dbname)
+
+
+def close_all():
+    get_manager().close_all()
+
+
+def _blockers(cur, oids):
+    cur.execute(BLOCKERS_QUERY, (oids,))
+    return cur.fetchall()
+
+
+def describe_sessions(sessions):
+    """(pid, 사용자, 애플리케이션, 상태, 경과 시간) 목록을 한 줄로"""
+    return ", ".join(
+        f"pid {pid} ({user}, {app or '-'}, {state}, {age or '-'})"
+        for pid, user, app, state, age in sessions
+    )
+
+
+def run_with_lock_retry(cur, oids, action, label, lock_timeout_ms, retries, terminate=False):
+    """action(cur) 을 lock_timeout 을 건 트랜잭션에서 실행하고 커밋
+
+    잠금 대기가 lock_timeout_ms 를 넘으면 oids 테이블을 잡고 있는 세션을 보고하고
+    (terminate 면 그 세션을 끊고) retries 회까지 재시도한다. 끝내 실패하면 RuntimeError.
+    """
+    conn = cur.connection
+    for attempt in range(retries + 1):
+        try:
+            cur.execute("SET LOCAL lock_timeout = %s", (f"{lock_timeout_ms}ms",))
+            action(cur)
+            conn.commit()
+            return
+        except errors.LockNotAvailable:
+            conn.rollback()
+            blockers = _blockers(cur, oids)
+            conn.rollback()
+            if attempt == retries:
+                raise RuntimeError(
+                    f"잠금 대기 시간 초과 ({lock_timeout_ms}ms × {attempt + 1}회):"
+                    f" {describe_sessions(blockers) or '잠금 세션 없음'}"
+                ) from None
+            print(f"  ⏳ {label}: 잠금 대기 시간 초과, 잡고 있는 세션 {describe_sessions(blockers) or '없음'}")
+            if terminate and blockers:
+                cur.execute(
+                    "SELECT pg_terminate_backend(pid) FROM unnest(%s::int[]) AS pid",
+                    ([pid for pid, *_ in blockers],),
+                )
+                conn.commit()
+                print(f"  🔌 {label}: 세션 {len(blockers)}개 종료")
+            else:
+                time.sleep(0.5 * 2**attempt)
@@ -1,47 +1,127 @@
-import psycopg2
-from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
-from faker import Faker
+import argparse
+import hashlib
 import random
-from datetime import datetime, timedelta
-import os
-from dotenv import load_dotenv
-
-# .env 파일 로드
-load_dotenv()
-
-# DB 접속 정보 (환경변수에서 로드)
-DB_HOST = os.getenv("DB_HOST")
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_PORT = os.getenv("DB_PORT", "5432")
-
-# 공무원 더미 데이터 설정 (환경변수에서 로드)
-NUM_CUSTOMERS = int(os.getenv("NUM_CUSTOMERS", 1000))
-NUM_ORDERS = int(os.getenv("NUM_ORDERS", 5000))
-NUM_CAMPAIGNS = int(os.getenv("NUM_CAMPAIGNS", 10))
-NUM_FEEDBACKS = int(os.getenv("NUM_FEEDBACKS", 500))
-NUM_TRANSACTIONS = int(os.getenv("NUM_TRANSACTIONS", 4000))
-NUM_USERS = int(os.getenv("NUM_USERS", 800))
-NUM_ACTIVITIES = int(os.getenv("NUM_ACTIVITIES", 3000))
-
-# 학사 데이터 설정 (환경변수에서 로드)
-NUM_STUDENTS = int(os.getenv("NUM_STUDENTS", 3000))  # 학생 수 (270명 장기결석자 = 9%)
-NUM_PROFESSORS = int(os.getenv("NUM_PROFESSORS", 150))  # 교수 수
-NUM_COURSES = int(os.getenv("NUM_COURSES", 200))  # 강좌 수
-NUM_ENROLLMENTS = int(os.getenv("NUM_ENROLLMENTS", 15000))  # 수강신청 건수
-NUM_ATTENDANCE_RECORDS = int(os.getenv("NUM_ATTENDANCE_RECORDS", 100000))  # 출석 기록
-
-# Faker 설정 (환경변수에서 로케일 로드)
-faker_locale = os.getenv("FAKER_LOCALE", "ko_KR")
-faker = Faker(faker_locale)
+import sys
+import time
+import traceback
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+
+from mcp_baseline import MCP_BASELINE, record_baseline
+from mcp_connections import (
+    admin_connection,
+    close_all,
+    close_database,
+    get_connection,
+    release_connection,
+)
+from mcp_dates import REFERENCE_DATE, date_between, day_offset
+from mcp_faker_pool import fake_value
+from mcp_dataset_cache import (
+    DATASET_CACHE,
+    DatasetRecorder,
+    dataset_key,
+    has_dataset,
+    replay_dataset,
+)
+from mcp_loader import (
+    LOAD_METHOD,
+    IdPool,
+    extend_ids,
+    load_rows,
+    reserve_ids,
+    restart_sequences,
+    set_recorder,
+    table_counts,
+)
+from mcp_metrics import MCP_METRICS_PROM, PhaseTimer, take_events, write_prometheus
+from mcp_partitions import (
+    MCP5_PARTITIONED,
+    PartitionedLoad,
+    PartitionLayout,
+    create_partitions,
+    drop_stages,
+)
+from mcp_schema import LOAD_MODE, create_tables, finish_load, parse_schema, prepare_load
+from mcp_snapshot import create_snapshot
+from mcp_workload import MCP_WORKLOAD, apply_workload
+from mcp_settings import (
+    GEN_BACKEND,
+    IO_BACKEND,
+    MCP_SEED,
+    MCP_SNAPSHOT,
+    MCP_TOPUP,
+    MCP_WORKERS,
+    NUM_ACTIVITIES,
+    NUM_CAMPAIGNS,
+    NUM_COURSES,
+    NUM_CUSTOMERS,
+    NUM_EMPLOYEES,
+    NUM_ENROLLMENTS,
+    NUM_EVENTS,
+    NUM_FEEDBACKS,
+    NUM_ORDERS,
+    NUM_PROFESSORS,
+    NUM_PROJECTS,
+    NUM_STUDENTS,
+    NUM_SUPPLY_REQUESTS,
+    NUM_TRANSACTIONS,
+    NUM_USERS,
+    SCALE_FACTOR,
+    TARGET_LONG_ABSENT,
+    TOPUP_COUNT,
+    seed_faker,
+)
+
+
+# 현재 프로세스에서 사용할 시드 (None 이면 실행마다 다른 데이터)
+SEED = MCP_SEED
+# 데이터가 이미 있을 때 건너뛰지 않고 부족한 행만 추가할지 여부
+TOPUP = MCP_TOPUP
+
+# 증분 모드에서 목표 행 수와 비교하는 테이블 (나머지 테이블은 새로 추가한 부모 행에서 파생)
+TOPUP_TARGETS = {
+    "mcp1": {"Customers": NUM_CUSTOMERS, "Campaigns": NUM_CAMPAIGNS, "Orders": NUM_ORDERS},
+    "mcp2": {"Users": NUM_USERS, "Transactions": NUM_TRANSACTIONS},
+    "mcp3": {"Users": NUM_USERS, "UserActivity": NUM_ACTIVITIES, "Feedback": NUM_FEEDBACKS},
+    "mcp4": {
+        "Employees": NUM_EMPLOYEES,
+        "Projects": NUM_PROJECTS,
+        "Events": NUM_EVENTS,
+        "SuppliesRequests": NUM_SUPPLY_REQUESTS,
+    },
+    "mcp5": {
+        "Professors": NUM_PROFESSORS,
+        "Students": NUM_STUDENTS,
+        "Courses": NUM_COURSES,
+        "Enrollments": NUM_ENROLLMENTS,
+    },
+}
+
+
+def partition_layouts(name):
+    """시나리오의 파티션 테이블 구성 (MCP5_PARTITIONED=1 일 때 mcp5 만, 아니면 빈 목록)"""
+    if name != "mcp5" or not MCP5_PARTITIONED:
+        return []
+    semesters = ["2024-1", "2024-2", "2025-1"]
+    # 출석은 모두 2025-1 학기, 기준일 4개월 전 ~ 기준일 (generate_mcp5 의 date_between("-4M", "today"))
+    window = (REFERENCE_DATE + timedelta(days=day_offset("-4M")), REFERENCE_DATE)
+    return [
+        PartitionLayout(
+            "Attendance",
+            "semester",
+            semesters,
+            "attendance_date",
+            {"2025-1": window},
+            indexes=["student_id", "course_id", "attendance_date"],
+        ),
+        PartitionLayout("Grades", "semester", semesters, indexes=["student_id", "course_id"]),
+    ]
 
 
 def create_database_if_not_exists(dbname):
-    conn = psycopg2.connect(
-        host=DB_HOST, dbname="postgres", user=DB_USER, password=DB_PASSWORD
-    )
-    conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-    cur = conn.cursor()
+    cur = admin_connection().cursor()
     cur.execute("SELECT 1 FROM pg_database WHERE datname = %s", (dbname,))
     exists = cur.fetchone()
     if not exists:
@@ -50,7 +130,142 @@ def create_database_if_not_exists(dbname):
     else:
         print(f"ℹ️ 데이터베이스 이미 존재: {dbname}")
     cur.close()
-    conn.close()
+
+
+def seed_scenario(name, seed):
+    """시나리오별로 파생한 시드로 모든 난수원(random, Faker, NumPy)을 초기화
+
+    시나리오 이름을 섞어 파생하므로 순차/병렬 실행 순서와 관계없이 같은 결과가 나온다.
+    """
+    digest = hashlib.sha256(f"{seed}:{name}".encode("utf-8")).digest()
+    scenario_seed = int.from_bytes(digest[:8], "big")
+    random.seed(scenario_seed)
+    seed_faker(scenario_seed)
+    seed_vectorized(scenario_seed)
+
+
+def seed_vectorized(value=None):
+    """NumPy 난수 생성기 시드 (NumPy 백엔드는 명세를 컴파일할 때 불러오므로, 불러온 경우에만)"""
+    vectorized = sys.modules.get("mcp_vectorized")
+    if vectorized is not None:
+        vectorized.seed(value)
+
+
+def scenario_generator(name):
+    """GEN_BACKEND 에 맞는 생성 함수 (명세만 있고 Python 생성 함수가 없는 시나리오는 명세로 생성)"""
+    python = globals().get(f"generate_{name}")
+    if GEN_BACKEND == "numpy" or python is None:
+        # NumPy·명세 모듈은 무거우므로 실제로 생성할 때만 불러온다
+        from mcp_scenario_specs import SCENARIO_SPECS
+        from mcp_spec import compile_scenario
+
+        return compile_scenario(SCENARIO_SPECS[name])
+    return python
+
+
+def generate_scenario(name, cur, partitioned=False):
+    """시나리오 데이터를 생성·적재
+
+    시드가 지정되면 시퀀스를 1부터 다시 시작해 키까지 재현하고, 같은 입력으로 만든
+    데이터셋이 캐시에 있으면 생성 단계를 건너뛰고 캐시 파일을 그대로 COPY 한다.
+    partitioned 는 파티션 병렬 적재 중인지 (키 배정이 달라지므로 캐시 키에 포함).
+    """
+    generate = scenario_generator(name)
+    if SEED is None:
+        generate(cur)
+        return
+
+    seed_scenario(name, SEED)
+    restart_sequences(cur)
+    if not DATASET_CACHE or LOAD_METHOD != "copy":
+        generate(cur)
+        return
+
+    key = dataset_key(name, SEED, partitioned)
+    if has_dataset(key):
+        replay_dataset(cur, key)
+        return
+    recorder = DatasetRecorder(key)
+    set_recorder(recorder)
+    try:
+        generate(cur)
+    except Exception:
+        recorder.abort()
+        raise
+    finally:
+        set_recorder(None)
+    recorder.commit()
+    print(f"💾 {name}: 데이터셋 캐시 저장 ({key[:12]})")
+
+
+def missing(have, table, target):
+    """목표 행 수까지 부족한 행 수 (have 가 비어 있으면 target 그대로)"""
+    return max(target - have.get(table.lower(), 0), 0)
+
+
+def topup_scenario(name, cur):
+    """증분 모드: 현재 행 수를 목표 행 수와 비교해 부족한 행만 생성·적재
+
+    외래키는 기존 부모 키와 새로 예약한 키에서 뽑고, 파생 테이블(캠페인 성과, 결제수단,
+    예산 요청, 출석, 성적)은 새로 추가한 부모 행에 대해서만 만든다. 생성은 항상
+    Python 백엔드로 하며, 시퀀스 재시작·데이터셋 캐시는 쓰지 않는다.
+    """
+    targets = TOPUP_TARGETS[name]
+    have = table_counts(cur, list(targets), exact=TOPUP_COUNT != "estimate")
+    for table, target in targets.items():
+        current = have[table.lower()]
+        print(f"  ➕ {name}.{table.lower()} {current:,} → {max(current, target):,}행 (+{missing(have, table, target):,})")
+    if not any(missing(have, table, target) for table, target in targets.items()):
+        print(f"✅ {name}: 이미 목표 행 수를 채웠습니다.")
+        return
+    if SEED is not None:
+        # 같은 시드·같은 기존 행 수에서 시작한 증분 적재는 같은 결과를 낸다
+        seed_scenario(name, f"{SEED}:topup:{sorted(have.items())}")
+    globals()[f"generate_{name}"](cur, have)
+
+
+def load_scenario(name, cur, schema, timer, topup=False):
+    """제약조건 처리(LOAD_MODE) → 생성·적재 → 제약조건/인덱스 마무리를 단계별로 실행
+
+    topup 이면 기존 데이터에 추가하므로 제약조건을 그대로 둔 채 부족한 행만 적재한다.
+    """
+    if topup:
+        with timer.phase("load"):
+            topup_scenario(name, cur)
+        return
+    if IO_BACKEND == "async":
+        load_scenario_async(name, cur, schema, timer)
+        return
+    layouts = partition_layouts(name) if LOAD_METHOD == "copy" else []
+    if layouts:
+        # 파티션 적재 워커 연결에서 테이블과 시퀀스가 보이도록 스키마(DDL)를 먼저 커밋
+        cur.connection.commit()
+    with timer.phase("prepare"):
+        prepare_load(cur, schema)
+    with timer.phase("load"):
+        if layouts:
+            with PartitionedLoad(cur, layouts, parse_schema(schema)[1]):
+                generate_scenario(name, cur, partitioned=True)
+        else:
+            generate_scenario(name, cur)
+    finish_load(cur, schema, timer)
+
+
+def load_scenario_async(name, cur, schema, timer):
+    """load_scenario 의 비동기 버전 (IO_BACKEND=async): psycopg2 커서 대신 AsyncLoadSession 으로 적재"""
+    from mcp_async_loader import AsyncLoadSession
+
+    # 적재 연결들에서 테이블이 보이도록 스키마(DDL)를 먼저 커밋
+    cur.connection.commit()
+    with AsyncLoadSession(name, schema) as session:
+        with timer.phase("prepare"):
+            prepare_load(session, schema)
+        with timer.phase("load"):
+            generate_scenario(name, session)
+            session.wait_loads()
+        finish_load(session, schema, timer)
+        with timer.phase("commit"):
+            session.commit()
 
 
 # ---------------------------------------------------------------------------
@@ -58,15 +273,97 @@ def create_database_if_not_exists(dbname):
 # ---------------------------------------------------------------------------
 
 
+def generate_mcp1(cur, have=None):
+    """mcp1 더미 데이터를 행 단위(Python 백엔드)로 생성해 적재
+
+    have: 증분 모드에서 테이블별 기존 행 수 (없으면 처음부터 전체 생성)
+    """
+    have = have or {}
+    segments = ["일반", "VIP", "기업"]
+    channels = ["SNS 광고", "검색엔진", "이메일"]
+
+    new_customers, customer_ids = extend_ids(
+        cur,
+        "Customers",
+        "customer_id",
+        missing(have, "Customers", NUM_CUSTOMERS),
+        have.get("customers"),
+    )
+    load_rows(
+        cur,
+        "Customers",
+        ["customer_id", "name", "segment", "signup_date", "acquisition_channel"],
+        (
+            (
+                customer_id,
+                fake_value("name"),
+                random.choice(segments),
+                date_between("-2y", "today"),
+                random.choice(channels),
+            )
+            for customer_id in new_customers
+        ),
+    )
+
+    # 성과 데이터는 새로 추가한 캠페인에 대해서만 생성
+    campaign_ids = reserve_ids(
+        cur, "Campaigns", "campaign_id", missing(have, "Campaigns", NUM_CAMPAIGNS)
+    )
+    campaigns = []
+    for i, campaign_id in enumerate(campaign_ids, start=have.get("campaigns", 0)):
+        name = f"Campaign_{i+1}"
+        start = date_between("-3M", "-1M")
+        end = start + timedelta(days=30)
+        campaigns.append((campaign_id, name, start, end, random.randint(1000, 5000)))
+    load_rows(
+        cur,
+        "Campaigns",
+        ["campaign_id", "campaign_name", "start_date", "end_date", "budget"],
+        campaigns,
+    )
+
+    def performance():
+        start = REFERENCE_DATE - timedelta(days=30)
+        for cid in campaign_ids:
+            for i in range(30):
+                day = start + timedelta(days=i)
+                impressions = random.randint(1000, 10000)
+                clicks = random.randint(100, impressions)
+                conversions = random.randint(0, clicks)
+                yield cid, day, impressions, clicks, conversions
+
+    load_rows(
+        cur,
+        "Campaign_Performance",
+        ["campaign_id", "date", "impressions", "clicks", "conversions"],
+        performance(),
+    )
+
+    load_rows(
+        cur,
+        "Orders",
+        ["customer_id", "order_date", "amount", "product_id"],
+        (
+            (
+                customer_id,
+                date_between("-1y", "today"),
+                random.randint(10000, 300000),
+                random.randint(1, 100),
+            )
+            for customer_id in customer_ids.iter_sample(
+                missing(have, "Orders", NUM_ORDERS)
+            )
+        ),
+    )
+
+
 def insert_mcp1():
+    timer = PhaseTimer("mcp1")
     create_database_if_not_exists("mcp1")
-    conn = psycopg2.connect(
-        host=DB_HOST, dbname="mcp1", user=DB_USER, password=DB_PASSWORD
-    )
+    conn = get_connection("mcp1")
     cur = conn.cursor()
 
-    cur.execute(
-        """
+    schema = """
         CREATE TABLE IF NOT EXISTS Customers (
             customer_id SERIAL PRIMARY KEY,
             name TEXT,
@@ -97,65 +394,24 @@ def insert_mcp1():
             conversions INT
         );
     """
-    )
+    with timer.phase("ddl"):
+        create_tables(cur, schema)
 
     cur.execute("SELECT COUNT(*) FROM Customers")
-    if cur.fetchone()[0] > 0:
+    existing = cur.fetchone()[0] > 0
+    if existing and not TOPUP:
         print("⏩ mcp1: 이미 데이터가 존재하므로 건너뜁니다.")
         cur.close()
-        conn.close()
+        release_connection(conn)
         return
 
-    segments = ["일반", "VIP", "기업"]
-    channels = ["SNS 광고", "검색엔진", "이메일"]
-
-    for _ in range(NUM_CUSTOMERS):
-        cur.execute(
-            "INSERT INTO Customers (name, segment, signup_date, acquisition_channel) VALUES (%s, %s, %s, %s)",
-            (
-                faker.name(),
-                random.choice(segments),
-                faker.date_between(start_date="-2y", end_date="today"),
-                random.choice(channels),
-            ),
-        )
-
-    campaign_ids = []
-    for i in range(NUM_CAMPAIGNS):
-        name = f"Campaign_{i+1}"
-        start = faker.date_between(start_date="-3M", end_date="-1M")
-        end = start + timedelta(days=30)
-        cur.execute(
-            "INSERT INTO Campaigns (campaign_name, start_date, end_date, budget) VALUES (%s, %s, %s, %s) RETURNING campaign_id",
-            (name, start, end, random.randint(1000, 5000)),
-        )
-        campaign_ids.append(cur.fetchone()[0])
-
-    for cid in campaign_ids:
-        start = datetime.now() - timedelta(days=30)
-        for i in range(30):
-            day = start + timedelta(days=i)
-            impressions = random.randint(1000, 10000)
-            clicks = random.randint(100, impressions)
-            conversions = random.randint(0, clicks)
-            cur.execute(
-                "INSERT INTO Campaign_Performance (campaign_id, date, impressions, clicks, conversions) VALUES (%s, %s, %s, %s, %s)",
-                (cid, day, impressions, clicks, conversions),
-            )
-
-    for _ in range(NUM_ORDERS):
-        cur.execute(
-            "INSERT INTO Orders (customer_id, order_date, amount, product_id) VALUES ((SELECT customer_id FROM Customers ORDER BY RANDOM() LIMIT 1), %s, %s, %s)",
-            (
-                faker.date_between(start_date="-1y", end_date="today"),
-                random.randint(10000, 300000),
-                random.randint(1, 100),
-            ),
-        )
+    load_scenario("mcp1", cur, schema, timer, topup=existing)
 
-    conn.commit()
+    with timer.phase("commit"):
+        conn.commit()
+    timer.report()
     cur.close()
-    conn.close()
+    release_connection(conn)
     print("✅ mcp1 데이터 삽입 완료")
 
 
@@ -164,15 +420,76 @@ def insert_mcp1():
 # ---------------------------------------------------------------------------
 
 
+def generate_mcp2(cur, have=None):
+    """mcp2 더미 데이터를 행 단위(Python 백엔드)로 생성해 적재
+
+    have: 증분 모드에서 테이블별 기존 행 수 (없으면 처음부터 전체 생성)
+    """
+    have = have or {}
+    segments = ["일반", "VIP", "기업"]
+    methods = ["카드", "계좌이체", "포인트"]
+    statuses = ["성공", "실패"]
+    types = ["purchase", "refund", "reward"]
+
+    new_users, user_ids = extend_ids(
+        cur, "Users", "user_id", missing(have, "Users", NUM_USERS), have.get("users")
+    )
+    load_rows(
+        cur,
+        "Users",
+        ["user_id", "name", "join_date", "segment"],
+        (
+            (
+                user_id,
+                fake_value("name"),
+                date_between("-2y", "today"),
+                random.choice(segments),
+            )
+            for user_id in new_users
+        ),
+    )
+
+    # 결제수단은 새로 추가한 거래에 대해서만 생성
+    transaction_ids = reserve_ids(
+        cur,
+        "Transactions",
+        "transaction_id",
+        missing(have, "Transactions", NUM_TRANSACTIONS),
+    )
+    def transactions():
+        for tid, user_id in zip(
+            transaction_ids, user_ids.iter_sample(len(transaction_ids))
+        ):
+            t_type = random.choice(types)
+            amount = random.randint(1000, 100000) * (1 if t_type != "refund" else -1)
+            yield tid, user_id, date_between("-6M", "today"), t_type, amount
+
+    load_rows(
+        cur,
+        "Transactions",
+        ["transaction_id", "user_id", "date", "type", "amount"],
+        transactions(),
+    )
+
+    # 거래 1건당 결제수단 1건
+    load_rows(
+        cur,
+        "PaymentMethods",
+        ["transaction_id", "method", "status"],
+        (
+            (tid, random.choice(methods), random.choice(statuses))
+            for tid in transaction_ids
+        ),
+    )
+
+
 def insert_mcp2():
+    timer = PhaseTimer("mcp2")
     create_database_if_not_exists("mcp2")
-    conn = psycopg2.connect(
-        host=DB_HOST, dbname="mcp2", user=DB_USER, password=DB_PASSWORD
-    )
+    conn = get_connection("mcp2")
     cur = conn.cursor()
 
-    cur.execute(
-        """
+    schema = """
         CREATE TABLE IF NOT EXISTS Users (
             user_id SERIAL PRIMARY KEY,
             name TEXT,
@@ -193,42 +510,24 @@ def insert_mcp2():
             status TEXT
         );
     """
-    )
+    with timer.phase("ddl"):
+        create_tables(cur, schema)
 
     cur.execute("SELECT COUNT(*) FROM Users")
-    if cur.fetchone()[0] > 0:
+    existing = cur.fetchone()[0] > 0
+    if existing and not TOPUP:
         print("⏩ mcp2: 이미 데이터가 존재하므로 건너뜁니다.")
         cur.close()
-        conn.close()
+        release_connection(conn)
         return
 
-    segments = ["일반", "VIP", "기업"]
-    methods = ["카드", "계좌이체", "포인트"]
-    statuses = ["성공", "실패"]
-    types = ["purchase", "refund", "reward"]
-
-    for _ in range(NUM_USERS):
-        cur.execute(
-            "INSERT INTO Users (name, join_date, segment) VALUES (%s, %s, %s)",
-            (faker.name(), faker.date_between("-2y", "today"), random.choice(segments)),
-        )
+    load_scenario("mcp2", cur, schema, timer, topup=existing)
 
-    for _ in range(NUM_TRANSACTIONS):
-        t_type = random.choice(types)
-        amount = random.randint(1000, 100000) * (1 if t_type != "refund" else -1)
-        cur.execute(
-            "INSERT INTO Transactions (user_id, date, type, amount) VALUES ((SELECT user_id FROM Users ORDER BY RANDOM() LIMIT 1), %s, %s, %s) RETURNING transaction_id",
-            (faker.date_between("-6M", "today"), t_type, amount),
-        )
-        tid = cur.fetchone()[0]
-        cur.execute(
-            "INSERT INTO PaymentMethods (transaction_id, method, status) VALUES (%s, %s, %s)",
-            (tid, random.choice(methods), random.choice(statuses)),
-        )
-
-    conn.commit()
+    with timer.phase("commit"):
+        conn.commit()
+    timer.report()
     cur.close()
-    conn.close()
+    release_connection(conn)
     print("✅ mcp2 데이터 삽입 완료")
 
 
@@ -237,15 +536,78 @@ def insert_mcp2():
 # ---------------------------------------------------------------------------
 
 
+def generate_mcp3(cur, have=None):
+    """mcp3 더미 데이터를 행 단위(Python 백엔드)로 생성해 적재
+
+    have: 증분 모드에서 테이블별 기존 행 수 (없으면 처음부터 전체 생성)
+    """
+    have = have or {}
+    channels = ["검색", "SNS", "광고", "지인추천"]
+    activity_types = ["로그인", "검색", "상품조회", "결제"]
+    categories = ["배송", "제품", "가격", "서비스"]
+    sentiments = ["positive", "neutral", "negative"]
+
+    new_users, user_ids = extend_ids(
+        cur, "Users", "user_id", missing(have, "Users", NUM_USERS), have.get("users")
+    )
+    load_rows(
+        cur,
+        "Users",
+        ["user_id", "name", "signup_date", "acquisition_channel"],
+        (
+            (
+                user_id,
+                fake_value("name"),
+                date_between("-1y", "today"),
+                random.choice(channels),
+            )
+            for user_id in new_users
+        ),
+    )
+
+    load_rows(
+        cur,
+        "UserActivity",
+        ["user_id", "activity_date", "activity_type"],
+        (
+            (
+                user_id,
+                date_between("-6M", "today"),
+                random.choice(activity_types),
+            )
+            for user_id in user_ids.iter_sample(
+                missing(have, "UserActivity", NUM_ACTIVITIES)
+            )
+        ),
+    )
+
+    load_rows(
+        cur,
+        "Feedback",
+        ["user_id", "date", "rating", "sentiment", "category", "comments"],
+        (
+            (
+                user_id,
+                date_between("-3M", "today"),
+                random.randint(1, 5),
+                random.choice(sentiments),
+                random.choice(categories),
+                fake_value("sentence8"),
+            )
+            for user_id in user_ids.iter_sample(
+                missing(have, "Feedback", NUM_FEEDBACKS)
+            )
+        ),
+    )
+
+
 def insert_mcp3():
+    timer = PhaseTimer("mcp3")
     create_database_if_not_exists("mcp3")
-    conn = psycopg2.connect(
-        host=DB_HOST, dbname="mcp3", user=DB_USER, password=DB_PASSWORD
-    )
+    conn = get_connection("mcp3")
     cur = conn.cursor()
 
-    cur.execute(
-        """
+    schema = """
         CREATE TABLE IF NOT EXISTS Users (
             user_id SERIAL PRIMARY KEY,
             name TEXT,
@@ -268,64 +630,163 @@ def insert_mcp3():
             comments TEXT
         );
     """
-    )
+    with timer.phase("ddl"):
+        create_tables(cur, schema)
 
     cur.execute("SELECT COUNT(*) FROM Users")
-    if cur.fetchone()[0] > 0:
+    existing = cur.fetchone()[0] > 0
+    if existing and not TOPUP:
         print("⏩ mcp3: 이미 데이터가 존재하므로 건너뜁니다.")
         cur.close()
-        conn.close()
+        release_connection(conn)
         return
 
-    channels = ["검색", "SNS", "광고", "지인추천"]
-    activity_types = ["로그인", "검색", "상품조회", "결제"]
-    categories = ["배송", "제품", "가격", "서비스"]
-    sentiments = ["positive", "neutral", "negative"]
+    load_scenario("mcp3", cur, schema, timer, topup=existing)
 
-    for _ in range(NUM_USERS):
-        cur.execute(
-            "INSERT INTO Users (name, signup_date, acquisition_channel) VALUES (%s, %s, %s)",
-            (faker.name(), faker.date_between("-1y", "today"), random.choice(channels)),
-        )
+    with timer.phase("commit"):
+        conn.commit()
+    timer.report()
+    cur.close()
+    release_connection(conn)
+    print("✅ mcp3 데이터 삽입 완료")
 
-    for _ in range(NUM_ACTIVITIES):
-        cur.execute(
-            "INSERT INTO UserActivity (user_id, activity_date, activity_type) VALUES ((SELECT user_id FROM Users ORDER BY RANDOM() LIMIT 1), %s, %s)",
-            (faker.date_between("-6M", "today"), random.choice(activity_types)),
-        )
 
-    for _ in range(NUM_FEEDBACKS):
-        cur.execute(
-            "INSERT INTO Feedback (user_id, date, rating, sentiment, category, comments) VALUES ((SELECT user_id FROM Users ORDER BY RANDOM() LIMIT 1), %s, %s, %s, %s, %s)",
+# ---------------------------------------------------------------------------
+# mcp4 – 공공 행정 & 문화-관광 사업 분석 시나리오
+# ---------------------------------------------------------------------------
+
+
+def generate_mcp4(cur, have=None):
+    """mcp4 더미 데이터를 행 단위(Python 백엔드)로 생성해 적재
+
+    have: 증분 모드에서 테이블별 기존 행 수 (없으면 처음부터 전체 생성)
+    """
+    have = have or {}
+    grades = ["9급", "8급", "7급", "6급", "5급", "4급"]
+    depts = ["문화정책과", "관광산업과", "스포츠진흥과", "국제협력담당관", "홍보담당관"]
+    new_emps, emp_ids = extend_ids(
+        cur,
+        "Employees",
+        "emp_id",
+        missing(have, "Employees", NUM_EMPLOYEES),
+        have.get("employees"),
+    )
+    load_rows(
+        cur,
+        "Employees",
+        ["emp_id", "name", "grade", "dept", "join_date"],
+        (
             (
-                faker.date_between("-3M", "today"),
-                random.randint(1, 5),
-                random.choice(sentiments),
+                emp_id,
+                fake_value("name"),
+                random.choice(grades),
+                random.choice(depts),
+                date_between("-10y", "today"),
+            )
+            for emp_id in new_emps
+        ),
+    )
+
+    # 예산 요청은 새로 추가한 프로젝트에 대해서만 생성
+    categories = ["문화", "관광", "스포츠"]
+    new_projects, proj_ids = extend_ids(
+        cur,
+        "Projects",
+        "proj_id",
+        missing(have, "Projects", NUM_PROJECTS),
+        have.get("projects"),
+    )
+    projects = []
+    for i, proj_id in enumerate(new_projects, start=have.get("projects", 0)):
+        s_date = date_between("-18M", "-6M")
+        e_date = s_date + timedelta(days=random.randint(90, 365))
+        projects.append(
+            (
+                proj_id,
+                f"프로젝트_{i+1:02d}",
                 random.choice(categories),
-                faker.sentence(nb_words=8),
-            ),
+                s_date,
+                e_date,
+                emp_ids.choice(),
+            )
         )
+    load_rows(
+        cur,
+        "Projects",
+        ["proj_id", "title", "category", "start_date", "end_date", "owner_emp"],
+        projects,
+    )
 
-    conn.commit()
-    cur.close()
-    conn.close()
-    print("✅ mcp3 데이터 삽입 완료")
+    statuses = ["제출", "검토중", "승인", "반려"]
+    load_rows(
+        cur,
+        "BudgetRequests",
+        ["proj_id", "quarter", "amount", "status"],
+        (
+            (
+                pid,
+                q,
+                random.randint(5_000_000, 200_000_000),
+                random.choice(statuses),
+            )
+            for pid in new_projects
+            for q in ["2024Q4", "2025Q1", "2025Q2"]
+        ),
+    )
 
+    venues = [
+        "세종문화회관",
+        "DDP",
+        "광화문광장",
+        "부산 벡스코",
+        "인천 아시아드주경기장",
+    ]
+    load_rows(
+        cur,
+        "Events",
+        ["proj_id", "event_name", "event_date", "location", "attendance"],
+        (
+            (
+                proj_id,
+                fake_value("sentence3"),
+                date_between("-6M", "today"),
+                random.choice(venues),
+                random.randint(100, 10000),
+            )
+            for proj_id in proj_ids.iter_sample(missing(have, "Events", NUM_EVENTS))
+        ),
+    )
 
-# ---------------------------------------------------------------------------
-# mcp4 – 공공 행정 & 문화-관광 사업 분석 시나리오
-# ---------------------------------------------------------------------------
+    items = ["A4용지", "볼펜", "현수막", "배너", "기념품", "행사간식"]
+    purposes = ["회의", "행사", "홍보물", "민원 대응"]
+    approvals = ["대기", "승인", "반려"]
+    load_rows(
+        cur,
+        "SuppliesRequests",
+        ["emp_id", "request_date", "item", "quantity", "purpose", "approval_status"],
+        (
+            (
+                emp_id,
+                date_between("-3M", "today"),
+                random.choice(items),
+                random.randint(1, 200),
+                random.choice(purposes),
+                random.choice(approvals),
+            )
+            for emp_id in emp_ids.iter_sample(
+                missing(have, "SuppliesRequests", NUM_SUPPLY_REQUESTS)
+            )
+        ),
+    )
 
 
 def insert_mcp4():
+    timer = PhaseTimer("mcp4")
     create_database_if_not_exists("mcp4")
-    conn = psycopg2.connect(
-        host=DB_HOST, dbname="mcp4", user=DB_USER, password=DB_PASSWORD
-    )
+    conn = get_connection("mcp4")
     cur = conn.cursor()
 
-    cur.execute(
-        """
+    schema = """
         CREATE TABLE IF NOT EXISTS Employees (
             emp_id SERIAL PRIMARY KEY,
             name TEXT,
@@ -366,88 +827,24 @@ def insert_mcp4():
             approval_status TEXT
         );
     """
-    )
+    with timer.phase("ddl"):
+        create_tables(cur, schema)
 
     cur.execute("SELECT COUNT(*) FROM Employees")
-    if cur.fetchone()[0] > 0:
+    existing = cur.fetchone()[0] > 0
+    if existing and not TOPUP:
         print("⏩ mcp4: 이미 데이터가 존재하므로 건너뜁니다.")
         cur.close()
-        conn.close()
+        release_connection(conn)
         return
 
-    grades = ["9급", "8급", "7급", "6급", "5급", "4급"]
-    depts = ["문화정책과", "관광산업과", "스포츠진흥과", "국제협력담당관", "홍보담당관"]
-    for _ in range(120):
-        cur.execute(
-            "INSERT INTO Employees (name, grade, dept, join_date) VALUES (%s, %s, %s, %s)",
-            (
-                faker.name(),
-                random.choice(grades),
-                random.choice(depts),
-                faker.date_between("-10y", "today"),
-            ),
-        )
-
-    categories = ["문화", "관광", "스포츠"]
-    for i in range(30):
-        s_date = faker.date_between("-18M", "-6M")
-        e_date = s_date + timedelta(days=random.randint(90, 365))
-        cur.execute(
-            f"INSERT INTO Projects (title, category, start_date, end_date, owner_emp) VALUES (%s, %s, %s, %s, (SELECT emp_id FROM Employees ORDER BY RANDOM() LIMIT 1))",
-            (f"프로젝트_{i+1:02d}", random.choice(categories), s_date, e_date),
-        )
-
-    cur.execute("SELECT proj_id FROM Projects")
-    proj_ids = [row[0] for row in cur.fetchall()]
-    statuses = ["제출", "검토중", "승인", "반려"]
-    for pid in proj_ids:
-        for q in ["2024Q4", "2025Q1", "2025Q2"]:
-            cur.execute(
-                "INSERT INTO BudgetRequests (proj_id, quarter, amount, status) VALUES (%s, %s, %s, %s)",
-                (
-                    pid,
-                    q,
-                    random.randint(5_000_000, 200_000_000),
-                    random.choice(statuses),
-                ),
-            )
-
-    venues = [
-        "세종문화회관",
-        "DDP",
-        "광화문광장",
-        "부산 벡스코",
-        "인천 아시아드주경기장",
-    ]
-    for _ in range(80):
-        cur.execute(
-            "INSERT INTO Events (proj_id, event_name, event_date, location, attendance) VALUES ((SELECT proj_id FROM Projects ORDER BY RANDOM() LIMIT 1), %s, %s, %s, %s)",
-            (
-                faker.sentence(nb_words=3),
-                faker.date_between("-6M", "today"),
-                random.choice(venues),
-                random.randint(100, 10000),
-            ),
-        )
-
-    items = ["A4용지", "볼펜", "현수막", "배너", "기념품", "행사간식"]
-    purposes = ["회의", "행사", "홍보물", "민원 대응"]
-    approvals = ["대기", "승인", "반려"]
-    for _ in range(300):
-        cur.execute(
-            "INSERT INTO SuppliesRequests (emp_id, request_date, item, quantity, purpose, approval_status) VALUES ((SELECT emp_id FROM Employees ORDER BY RANDOM() LIMIT 1), %s, %s, %s, %s, %s)",
-            (
-                faker.date_between("-3M", "today"),
-                random.choice(items),
-                random.randint(1, 200),
-                random.choice(purposes),
-                random.choice(approvals),
-            ),
-        )
+    load_scenario("mcp4", cur, schema, timer, topup=existing)
 
-    conn.commit()
+    with timer.phase("commit"):
+        conn.commit()
+    timer.report()
     cur.close()
-    conn.close()
+    release_connection(conn)
     print("✅ mcp4 데이터 삽입 완료")
 
 
@@ -456,77 +853,12 @@ def insert_mcp4():
 # ---------------------------------------------------------------------------
 
 
-def insert_mcp5():
-    create_database_if_not_exists("mcp5")
-    conn = psycopg2.connect(
-        host=DB_HOST, dbname="mcp5", user=DB_USER, password=DB_PASSWORD
-    )
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS Students (
-            student_id SERIAL PRIMARY KEY,
-            student_number TEXT UNIQUE,
-            name TEXT,
-            grade INT,
-            major TEXT,
-            admission_date DATE,
-            status TEXT,
-            gpa NUMERIC(3,2)
-        );
-        CREATE TABLE IF NOT EXISTS Professors (
-            prof_id SERIAL PRIMARY KEY,
-            name TEXT,
-            dept TEXT,
-            position TEXT
-        );
-        CREATE TABLE IF NOT EXISTS Courses (
-            course_id SERIAL PRIMARY KEY,
-            course_code TEXT,
-            course_name TEXT,
-            credits INT,
-            semester TEXT,
-            prof_id INT REFERENCES Professors(prof_id),
-            max_students INT
-        );
-        CREATE TABLE IF NOT EXISTS Enrollments (
-            enrollment_id SERIAL PRIMARY KEY,
-            student_id INT REFERENCES Students(student_id),
-            course_id INT REFERENCES Courses(course_id),
-            semester TEXT,
-            enrollment_date DATE
-        );
-        CREATE TABLE IF NOT EXISTS Attendance (
-            attendance_id SERIAL PRIMARY KEY,
-            student_id INT REFERENCES Students(student_id),
-            course_id INT REFERENCES Courses(course_id),
-            attendance_date DATE,
-            status TEXT,  -- 출석, 지각, 결석, 조퇴
-            semester TEXT
-        );
-        CREATE TABLE IF NOT EXISTS Grades (
-            grade_id SERIAL PRIMARY KEY,
-            student_id INT REFERENCES Students(student_id),
-            course_id INT REFERENCES Courses(course_id),
-            semester TEXT,
-            midterm_score NUMERIC(5,2),
-            final_score NUMERIC(5,2),
-            assignment_score NUMERIC(5,2),
-            total_score NUMERIC(5,2),
-            letter_grade TEXT,
-            grade_point NUMERIC(2,1)
-        );
-        """
-    )
-
-    cur.execute("SELECT COUNT(*) FROM Students")
-    if cur.fetchone()[0] > 0:
-        print("⏩ mcp5: 이미 데이터가 존재하므로 건너뜁니다.")
-        cur.close()
-        conn.close()
-        return
+def generate_mcp5(cur, have=None):
+    """mcp5 더미 데이터를 행 단위(Python 백엔드)로 생성해 적재
 
+    have: 증분 모드에서 테이블별 기존 행 수 (없으면 처음부터 전체 생성)
+    """
+    have = have or {}
     # 1. 교수 데이터 삽입
     departments = [
         "컴퓨터공학과",
@@ -544,61 +876,97 @@ def insert_mcp5():
     ]
     positions = ["교수", "부교수", "조교수", "겸임교수"]
 
-    for _ in range(NUM_PROFESSORS):
-        cur.execute(
-            "INSERT INTO Professors (name, dept, position) VALUES (%s, %s, %s)",
-            (faker.name(), random.choice(departments), random.choice(positions)),
-        )
+    new_profs, prof_ids = extend_ids(
+        cur,
+        "Professors",
+        "prof_id",
+        missing(have, "Professors", NUM_PROFESSORS),
+        have.get("professors"),
+    )
+    load_rows(
+        cur,
+        "Professors",
+        ["prof_id", "name", "dept", "position"],
+        (
+            (
+                prof_id,
+                fake_value("name"),
+                random.choice(departments),
+                random.choice(positions),
+            )
+            for prof_id in new_profs
+        ),
+    )
 
     # 2. 학생 데이터 삽입 (고학점자와 일반학생 구분하여 생성)
     statuses = ["재학", "휴학", "졸업", "제적"]
     majors = departments  # 전공은 학과와 동일
 
-    # 🔧 학번 생성용 카운터 (중복 방지)
-    student_counter = 1
-
     # 고학점자 생성 (전체의 20% = 600명, 이 중 15%가 장기결석 = 90명)
-    high_gpa_students = int(NUM_STUDENTS * 0.2)
-    for i in range(high_gpa_students):
-        admission_year = random.randint(2020, 2024)
-        # ✅ 수정: 순차적 학번 생성으로 중복 방지
-        student_number = f"{admission_year}{student_counter:05d}"
-        student_counter += 1
-        gpa = round(random.uniform(3.8, 4.5), 2)  # 고학점자
-
-        cur.execute(
-            "INSERT INTO Students (student_number, name, grade, major, admission_date, status, gpa) VALUES (%s, %s, %s, %s, %s, %s, %s)",
-            (
+    # 증분 모드에서는 기존 학생(같은 규칙으로 앞 20% 가 고학점자)에 모자란 만큼만 새 학생 앞쪽에 준다
+    have_students = have.get("students", 0)
+    high_gpa_students = max(0, int(NUM_STUDENTS * 0.2) - int(have_students * 0.2))
+    new_students = reserve_ids(
+        cur, "Students", "student_id", missing(have, "Students", NUM_STUDENTS)
+    )
+    # 학생 위치(0 ~ N-1)별 키 / GPA / 재학 여부: 이후 단계에서 DB 를 다시 조회하지 않는다
+    # (증분 모드에서는 기존 학생을 키 순서대로 먼저 채우고 새 학생을 뒤에 붙인다)
+    student_ids = array("l")
+    student_gpas = array("d")
+    student_active = array("b")
+    if have_students:
+        cur.execute("SELECT student_id, gpa, status = '재학' FROM Students ORDER BY student_id")
+        for student_id, gpa, active in cur.fetchall():
+            student_ids.append(student_id)
+            student_gpas.append(float(gpa))
+            student_active.append(active)
+
+    def student_rows():
+        for i, student_id in enumerate(new_students):
+            admission_year = random.randint(2020, 2024)
+            # ✅ 수정: 순차적 학번 생성으로 중복 방지
+            student_number = f"{admission_year}{have_students + i + 1:05d}"
+            if i < high_gpa_students:
+                gpa = round(random.uniform(3.8, 4.5), 2)  # 고학점자
+            else:
+                gpa = round(random.uniform(1.0, 3.9), 2)  # 일반 학생
+            status = random.choice(statuses)
+            student_ids.append(student_id)
+            student_gpas.append(gpa)
+            student_active.append(status == "재학")
+            yield (
+                student_id,
                 student_number,
-                faker.name(),
+                fake_value("name"),
                 random.randint(1, 4),
                 random.choice(majors),
-                faker.date_between(f"-{2025-admission_year}y", "today"),
-                random.choice(statuses),
+                date_between(f"-{2025-admission_year}y", "today"),
+                status,
                 gpa,
-            ),
-        )
+            )
 
-    # 일반 학생 생성
-    for i in range(NUM_STUDENTS - high_gpa_students):
-        admission_year = random.randint(2020, 2024)
-        # ✅ 수정: 순차적 학번 생성으로 중복 방지
-        student_number = f"{admission_year}{student_counter:05d}"
-        student_counter += 1
-        gpa = round(random.uniform(1.0, 3.9), 2)  # 일반 학생
+    load_rows(
+        cur,
+        "Students",
+        [
+            "student_id",
+            "student_number",
+            "name",
+            "grade",
+            "major",
+            "admission_date",
+            "status",
+            "gpa",
+        ],
+        student_rows(),
+    )
+    if have_students:
+        position_of = {sid: i for i, sid in enumerate(student_ids)}.__getitem__
+    else:
+        first_student = new_students.ids[0] if new_students else 0
 
-        cur.execute(
-            "INSERT INTO Students (student_number, name, grade, major, admission_date, status, gpa) VALUES (%s, %s, %s, %s, %s, %s, %s)",
-            (
-                student_number,
-                faker.name(),
-                random.randint(1, 4),
-                random.choice(majors),
-                faker.date_between(f"-{2025-admission_year}y", "today"),
-                random.choice(statuses),
-                gpa,
-            ),
-        )
+        def position_of(student_id):
+            return student_id - first_student
 
     # 3. 강좌 데이터 삽입
     course_prefixes = [
@@ -617,139 +985,455 @@ def insert_mcp5():
     ]
     semesters = ["2024-1", "2024-2", "2025-1"]
 
-    for i in range(NUM_COURSES):
+    new_courses, course_ids = extend_ids(
+        cur,
+        "Courses",
+        "course_id",
+        missing(have, "Courses", NUM_COURSES),
+        have.get("courses"),
+    )
+    courses = []
+    for course_id in new_courses:
         course_code = f"{random.choice(course_prefixes)}{random.randint(100, 499)}"
-        course_name = f"{faker.catch_phrase()} {random.choice(['이론', '실습', '세미나', '특강'])}"
-
-        cur.execute(
-            "INSERT INTO Courses (course_code, course_name, credits, semester, prof_id, max_students) VALUES (%s, %s, %s, %s, (SELECT prof_id FROM Professors ORDER BY RANDOM() LIMIT 1), %s)",
+        course_name = f"{fake_value('catch_phrase')} {random.choice(['이론', '실습', '세미나', '특강'])}"
+        courses.append(
             (
+                course_id,
                 course_code,
                 course_name,
                 random.choice([1, 2, 3]),
                 random.choice(semesters),
+                prof_ids.choice(),
                 random.randint(30, 120),
-            ),
+            )
         )
+    load_rows(
+        cur,
+        "Courses",
+        [
+            "course_id",
+            "course_code",
+            "course_name",
+            "credits",
+            "semester",
+            "prof_id",
+            "max_students",
+        ],
+        courses,
+    )
 
-    # 4. 수강신청 데이터 삽입
-    for _ in range(NUM_ENROLLMENTS):
+    # 4. 수강신청 데이터 삽입 (학생/강좌 키는 항목당 8바이트 배열로 보관)
+    #    출석·성적은 이번에 추가한 수강신청에 대해서만 생성한다
+    num_enrollments = missing(have, "Enrollments", NUM_ENROLLMENTS)
+    enroll_students = array("l", IdPool(student_ids).iter_sample(num_enrollments))
+    enroll_courses = array("l", course_ids.iter_sample(num_enrollments))
+    load_rows(
+        cur,
+        "Enrollments",
+        ["student_id", "course_id", "semester", "enrollment_date"],
+        (
+            (
+                student_id,
+                course_id,
+                random.choice(semesters),
+                date_between("-6M", "today"),
+            )
+            for student_id, course_id in zip(enroll_students, enroll_courses)
+        ),
+    )
+    # 학생 → 수강 강좌 인덱스 (CSR: 학생 위치별 시작 오프셋 + 강좌 키 배열)
+    course_offsets = array("l", [0]) * (len(student_ids) + 1)
+    for student_id in enroll_students:
+        course_offsets[position_of(student_id) + 1] += 1
+    for i in range(len(student_ids)):
+        course_offsets[i + 1] += course_offsets[i]
+    fill = array("l", course_offsets)
+    student_courses = array("l", [0]) * len(enroll_courses)
+    for student_id, course_id in zip(enroll_students, enroll_courses):
+        position = position_of(student_id)
+        student_courses[fill[position]] = course_id
+        fill[position] += 1
+    del fill, enroll_students, enroll_courses
+
+    def courses_of(position):
+        return student_courses[course_offsets[position] : course_offsets[position + 1]]
+
+    # 5. 출석 데이터 삽입 (장기결석자 목표: 학생 수의 9%)
+    #    증분 모드에서는 출석 기록이 있는 학생의 기존 출석률을 그대로 이어 쓰고,
+    #    이미 있는 장기결석자 수만큼 목표에서 뺀다
+    known_rates = {}
+    if have.get("enrollments"):
         cur.execute(
-            "INSERT INTO Enrollments (student_id, course_id, semester, enrollment_date) VALUES ((SELECT student_id FROM Students ORDER BY RANDOM() LIMIT 1), (SELECT course_id FROM Courses ORDER BY RANDOM() LIMIT 1), %s, %s)",
-            (random.choice(semesters), faker.date_between("-6M", "today")),
+            "SELECT student_id, AVG((status <> '결석')::int)::float FROM Attendance GROUP BY student_id"
         )
-
-    # 5. 출석 데이터 삽입 (장기결석자 270명 목표)
-    attendance_statuses = ["출석", "지각", "결석", "조퇴"]
-
-    # 학생별 출석률 설정
-    cur.execute("SELECT student_id, gpa FROM Students WHERE status = '재학'")
-    active_students = cur.fetchall()
-
-    long_absent_count = 0
-    target_long_absent = 270
-
-    for student_id, gpa in active_students:
-        # 고학점자 중 15%를 장기결석자로 설정
-        if gpa >= 4.0 and long_absent_count < target_long_absent * 0.15:
-            attendance_rate = 0.3  # 30% 출석률 (장기결석)
-            long_absent_count += 1
-        elif long_absent_count < target_long_absent:
-            if random.random() < 0.1:  # 일반 학생 중 일부도 장기결석
-                attendance_rate = 0.35  # 35% 출석률 (장기결석)
+        known_rates = dict(cur.fetchall())
+
+    def attendance():
+        long_absent_count = sum(1 for rate in known_rates.values() if rate < 0.5)
+        for position, student_id in enumerate(student_ids):
+            if not student_active[position]:
+                continue
+            gpa = student_gpas[position]
+
+            if student_id in known_rates:
+                attendance_rate = known_rates[student_id]
+            # 고학점자 중 15%를 장기결석자로 설정
+            elif gpa >= 4.0 and long_absent_count < TARGET_LONG_ABSENT * 0.15:
+                attendance_rate = 0.3  # 30% 출석률 (장기결석)
                 long_absent_count += 1
+            elif long_absent_count < TARGET_LONG_ABSENT:
+                if random.random() < 0.1:  # 일반 학생 중 일부도 장기결석
+                    attendance_rate = 0.35  # 35% 출석률 (장기결석)
+                    long_absent_count += 1
+                else:
+                    attendance_rate = random.uniform(0.7, 0.95)  # 정상 출석률
             else:
                 attendance_rate = random.uniform(0.7, 0.95)  # 정상 출석률
-        else:
-            attendance_rate = random.uniform(0.7, 0.95)  # 정상 출석률
 
-        # 해당 학생의 수강과목에 대한 출석 생성
-        cur.execute(
-            "SELECT course_id FROM Enrollments WHERE student_id = %s", (student_id,)
-        )
-        courses = cur.fetchall()
+            # 해당 학생의 수강과목에 대한 출석 생성
+            for course_id in courses_of(position):
+                # 학기당 15주 수업 가정
+                for week in range(15):
+                    attendance_date = date_between("-4M", "today")
+
+                    if random.random() < attendance_rate:
+                        status = random.choices(
+                            ["출석", "지각", "조퇴"], weights=[0.85, 0.1, 0.05]
+                        )[0]
+                    else:
+                        status = "결석"
+
+                    yield student_id, course_id, attendance_date, status, "2025-1"
+
+    load_rows(
+        cur,
+        "Attendance",
+        ["student_id", "course_id", "attendance_date", "status", "semester"],
+        attendance(),
+    )
 
-        for (course_id,) in courses:
-            # 학기당 15주 수업 가정
-            for week in range(15):
-                attendance_date = faker.date_between("-4M", "today")
+    # 6. 성적 데이터 삽입
+    letter_grades = ["A+", "A", "B+", "B", "C+", "C", "D+", "D", "F"]
+    grade_points = [4.5, 4.0, 3.5, 3.0, 2.5, 2.0, 1.5, 1.0, 0.0]
 
-                if random.random() < attendance_rate:
-                    status = random.choices(
-                        ["출석", "지각", "조퇴"], weights=[0.85, 0.1, 0.05]
+    # 증분 모드에서는 이미 성적이 있는 (학생, 강좌) 쌍을 건너뛴다
+    graded = set()
+    if have.get("enrollments"):
+        cur.execute("SELECT student_id, course_id FROM Grades")
+        graded = set(cur.fetchall())
+
+    def grades():
+        # 중복 제거한 (학생, 강좌) 쌍마다 성적 1건
+        for position, student_id in enumerate(student_ids):
+            for course_id in dict.fromkeys(courses_of(position)):
+                if (student_id, course_id) in graded:
+                    continue
+                # 학생의 GPA에 따라 성적 분포 조정
+                if student_gpas[position] >= 4.0:
+                    # 고학점자는 좋은 성적 위주
+                    letter_grade = random.choices(
+                        letter_grades,
+                        weights=[0.4, 0.3, 0.15, 0.1, 0.03, 0.02, 0, 0, 0],
                     )[0]
                 else:
-                    status = "결석"
+                    # 일반 학생은 정규분포
+                    letter_grade = random.choices(
+                        letter_grades,
+                        weights=[0.1, 0.15, 0.2, 0.25, 0.15, 0.1, 0.03, 0.02, 0],
+                    )[0]
 
-                cur.execute(
-                    "INSERT INTO Attendance (student_id, course_id, attendance_date, status, semester) VALUES (%s, %s, %s, %s, %s)",
-                    (student_id, course_id, attendance_date, status, "2025-1"),
-                )
+                grade_point = grade_points[letter_grades.index(letter_grade)]
 
-    # 6. 성적 데이터 삽입
-    letter_grades = ["A+", "A", "B+", "B", "C+", "C", "D+", "D", "F"]
-    grade_points = [4.5, 4.0, 3.5, 3.0, 2.5, 2.0, 1.5, 1.0, 0.0]
+                midterm = (
+                    random.uniform(60, 100)
+                    if letter_grade != "F"
+                    else random.uniform(0, 59)
+                )
+                final = (
+                    random.uniform(60, 100)
+                    if letter_grade != "F"
+                    else random.uniform(0, 59)
+                )
+                assignment = (
+                    random.uniform(70, 100)
+                    if letter_grade != "F"
+                    else random.uniform(0, 69)
+                )
+                total = midterm * 0.3 + final * 0.4 + assignment * 0.3
+
+                yield (
+                    student_id,
+                    course_id,
+                    "2025-1",
+                    midterm,
+                    final,
+                    assignment,
+                    total,
+                    letter_grade,
+                    grade_point,
+                )
 
-    cur.execute("SELECT DISTINCT student_id, course_id FROM Enrollments")
-    enrollments = cur.fetchall()
+    load_rows(
+        cur,
+        "Grades",
+        [
+            "student_id",
+            "course_id",
+            "semester",
+            "midterm_score",
+            "final_score",
+            "assignment_score",
+            "total_score",
+            "letter_grade",
+            "grade_point",
+        ],
+        grades(),
+    )
 
-    for student_id, course_id in enrollments:
-        # 학생의 GPA에 따라 성적 분포 조정
-        cur.execute("SELECT gpa FROM Students WHERE student_id = %s", (student_id,))
-        student_gpa = cur.fetchone()[0]
 
-        if student_gpa >= 4.0:
-            # 고학점자는 좋은 성적 위주
-            letter_grade = random.choices(
-                letter_grades, weights=[0.4, 0.3, 0.15, 0.1, 0.03, 0.02, 0, 0, 0]
-            )[0]
-        else:
-            # 일반 학생은 정규분포
-            letter_grade = random.choices(
-                letter_grades, weights=[0.1, 0.15, 0.2, 0.25, 0.15, 0.1, 0.03, 0.02, 0]
-            )[0]
+def insert_mcp5():
+    timer = PhaseTimer("mcp5")
+    create_database_if_not_exists("mcp5")
+    conn = get_connection("mcp5")
+    cur = conn.cursor()
 
-        grade_point = grade_points[letter_grades.index(letter_grade)]
+    schema = """
+        CREATE TABLE IF NOT EXISTS Students (
+            student_id SERIAL PRIMARY KEY,
+            student_number TEXT UNIQUE,
+            name TEXT,
+            grade INT,
+            major TEXT,
+            admission_date DATE,
+            status TEXT,
+            gpa NUMERIC(3,2)
+        );
+        CREATE TABLE IF NOT EXISTS Professors (
+            prof_id SERIAL PRIMARY KEY,
+            name TEXT,
+            dept TEXT,
+            position TEXT
+        );
+        CREATE TABLE IF NOT EXISTS Courses (
+            course_id SERIAL PRIMARY KEY,
+            course_code TEXT,
+            course_name TEXT,
+            credits INT,
+            semester TEXT,
+            prof_id INT REFERENCES Professors(prof_id),
+            max_students INT
+        );
+        CREATE TABLE IF NOT EXISTS Enrollments (
+            enrollment_id SERIAL PRIMARY KEY,
+            student_id INT REFERENCES Students(student_id),
+            course_id INT REFERENCES Courses(course_id),
+            semester TEXT,
+            enrollment_date DATE
+        );
+        """
+    facts = """
+        CREATE TABLE IF NOT EXISTS Attendance (
+            attendance_id SERIAL PRIMARY KEY,
+            student_id INT REFERENCES Students(student_id),
+            course_id INT REFERENCES Courses(course_id),
+            attendance_date DATE,
+            status TEXT,  -- 출석, 지각, 결석, 조퇴
+            semester TEXT
+        );
+        CREATE TABLE IF NOT EXISTS Grades (
+            grade_id SERIAL PRIMARY KEY,
+            student_id INT REFERENCES Students(student_id),
+            course_id INT REFERENCES Courses(course_id),
+            semester TEXT,
+            midterm_score NUMERIC(5,2),
+            final_score NUMERIC(5,2),
+            assignment_score NUMERIC(5,2),
+            total_score NUMERIC(5,2),
+            letter_grade TEXT,
+            grade_point NUMERIC(2,1)
+        );
+        """
+    # 파티션 모드 (MCP5_PARTITIONED=1): 기본키에 파티션 키를 포함해야 하므로 표 수준 복합 기본키로 선언
+    partitioned_facts = """
+        CREATE TABLE IF NOT EXISTS Attendance (
+            attendance_id SERIAL,
+            student_id INT REFERENCES Students(student_id),
+            course_id INT REFERENCES Courses(course_id),
+            attendance_date DATE NOT NULL,
+            status TEXT,  -- 출석, 지각, 결석, 조퇴
+            semester TEXT NOT NULL,
+            PRIMARY KEY (attendance_id, semester, attendance_date)
+        ) PARTITION BY LIST (semester);
+        CREATE TABLE IF NOT EXISTS Grades (
+            grade_id SERIAL,
+            student_id INT REFERENCES Students(student_id),
+            course_id INT REFERENCES Courses(course_id),
+            semester TEXT NOT NULL,
+            midterm_score NUMERIC(5,2),
+            final_score NUMERIC(5,2),
+            assignment_score NUMERIC(5,2),
+            total_score NUMERIC(5,2),
+            letter_grade TEXT,
+            grade_point NUMERIC(2,1),
+            PRIMARY KEY (grade_id, semester)
+        ) PARTITION BY LIST (semester);
+        """
+    layouts = partition_layouts("mcp5")
+    schema += partitioned_facts if layouts else facts
 
-        midterm = (
-            random.uniform(60, 100) if letter_grade != "F" else random.uniform(0, 59)
-        )
-        final = (
-            random.uniform(60, 100) if letter_grade != "F" else random.uniform(0, 59)
-        )
-        assignment = (
-            random.uniform(70, 100) if letter_grade != "F" else random.uniform(0, 69)
-        )
-        total = midterm * 0.3 + final * 0.4 + assignment * 0.3
+    with timer.phase("ddl"):
+        create_tables(cur, schema)
+        create_partitions(cur, layouts)
 
-        cur.execute(
-            "INSERT INTO Grades (student_id, course_id, semester, midterm_score, final_score, assignment_score, total_score, letter_grade, grade_point) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
-            (
-                student_id,
-                course_id,
-                "2025-1",
-                midterm,
-                final,
-                assignment,
-                total,
-                letter_grade,
-                grade_point,
-            ),
-        )
+    cur.execute("SELECT COUNT(*) FROM Students")
+    existing = cur.fetchone()[0] > 0
+    if existing and not TOPUP:
+        print("⏩ mcp5: 이미 데이터가 존재하므로 건너뜁니다.")
+        cur.close()
+        release_connection(conn)
+        return
 
-    conn.commit()
+    try:
+        load_scenario("mcp5", cur, schema, timer, topup=existing)
+        with timer.phase("commit"):
+            conn.commit()
+    except Exception:
+        # 파티션 병렬 적재 뒤 실패하면 롤백으로 ATTACH 가 취소되어 적재용 테이블이 남으므로 정리
+        drop_stages(cur, [leaf for layout in layouts for leaf in layout.leaves])
+        raise
+    timer.report()
     cur.close()
-    conn.close()
+    release_connection(conn)
     print("✅ mcp5 학사 행정 관리 데이터 삽입 완료")
     print(
         f"📊 생성된 데이터: 학생 {NUM_STUDENTS}명, 교수 {NUM_PROFESSORS}명, 강좌 {NUM_COURSES}개"
     )
-    print(f"🎯 시나리오 목표: 장기결석자 약 270명, 고학점자 중 장기결석 15% 구현")
+    print(
+        f"🎯 시나리오 목표: 장기결석자 약 {TARGET_LONG_ABSENT}명, 고학점자 중 장기결석 15% 구현"
+    )
+
+
+def optimize_scenario(name):
+    """워크로드 인덱스·구체화 뷰를 만들거나 갱신하고 전/후 쿼리 시간을 보고 (MCP_WORKLOAD=1)"""
+    timer = PhaseTimer(name)
+    conn = get_connection(name)
+    cur = conn.cursor()
+    with timer.phase("workload"):
+        apply_workload(name, cur)
+        conn.commit()
+    cur.close()
+    release_connection(conn)
+
+
+SCENARIOS = {
+    "mcp1": insert_mcp1,
+    "mcp2": insert_mcp2,
+    "mcp3": insert_mcp3,
+    "mcp4": insert_mcp4,
+    "mcp5": insert_mcp5,
+}
+
+
+def _init_worker():
+    # fork 된 워커들이 같은 난수열을 공유하지 않도록 다시 시드
+    random.seed()
+    seed_faker()
+    seed_vectorized()
+
+
+def _run_scenario(name, seed=None, topup=MCP_TOPUP):
+    """시나리오 하나를 실행하고 (이름, 성공 여부, 소요 시간, 오류, 계측 이벤트) 를 반환"""
+    global SEED, TOPUP
+    SEED = seed
+    TOPUP = topup
+    take_events()
+    started = time.perf_counter()
+    try:
+        SCENARIOS[name]()
+        if MCP_WORKLOAD:
+            optimize_scenario(name)
+        if MCP_BASELINE:
+            # 적재 연결을 닫아야 그 연결의 통계 카운터가 바로 공유 통계에 반영된다
+            close_database(name)
+            record_baseline(name)
+        return name, True, time.perf_counter() - started, None, take_events()
+    except Exception:
+        error = traceback.format_exc()
+        return name, False, time.perf_counter() - started, error, take_events()
+
+
+def run_scenarios(names=None, workers=None, seed=MCP_SEED, topup=MCP_TOPUP):
+    """시나리오들을 실행하고 결과 목록을 반환
+
+    workers 가 2 이상이면 프로세스 풀에서 병렬로 실행한다. 각 시나리오는 서로 다른
+    데이터베이스에 적재하므로 독립적이며, 한 시나리오가 실패해도 나머지는 계속 진행된다.
+    """
+    names = list(names or SCENARIOS)
+    workers = max(1, min(workers or MCP_WORKERS, len(names)))
+    results = []
+
+    def report(result):
+        name, ok, elapsed, error, _ = result
+        done = len(results)
+        if ok:
+            print(f"🏁 [{done}/{len(names)}] {name} 완료 ({elapsed:.1f}s)")
+        else:
+            print(f"❌ [{done}/{len(names)}] {name} 실패 ({elapsed:.1f}s)\n{error}")
+
+    if workers == 1:
+        for name in names:
+            results.append(_run_scenario(name, seed, topup))
+            report(results[-1])
+    else:
+        print(f"🚀 {len(names)}개 시나리오를 {workers}개 워커로 병렬 실행합니다.")
+        # 워커가 부모의 연결(소켓)을 물려받지 않도록 미리 닫아 둔다
+        close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker
+        ) as executor:
+            futures = [executor.submit(_run_scenario, name, seed, topup) for name in names]
+            for future in as_completed(futures):
+                results.append(future.result())
+                report(results[-1])
+    if MCP_METRICS_PROM:
+        events = [event for result in results for event in result[4]]
+        write_prometheus(MCP_METRICS_PROM, events, results)
+        print(f"📈 메트릭 저장: {MCP_METRICS_PROM}")
+    return results
 
 
 if __name__ == "__main__":
-    insert_mcp1()
-    insert_mcp2()
-    insert_mcp3()
-    insert_mcp4()
-    insert_mcp5()
+    parser = argparse.ArgumentParser(description="MCP 시나리오 더미 데이터 생성기")
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=MCP_SEED,
+        help="재현 가능한 생성을 위한 시드 (기본값: MCP_SEED, 미지정 시 무작위)",
+    )
+    parser.add_argument(
+        "--top-up",
+        action="store_true",
+        default=MCP_TOPUP,
+        help="데이터가 이미 있으면 목표 행 수까지 부족한 행만 추가 (기본값: MCP_TOPUP)",
+    )
+    args = parser.parse_args()
+
+    print(f"📦 적재 방식: {LOAD_METHOD} (스키마 모드: {LOAD_MODE}, 입출력: {IO_BACKEND})")
+    if SCALE_FACTOR != 1:
+        print(f"📐 규모 배율: SF={SCALE_FACTOR:g}")
+    if args.seed is not None:
+        print(f"🎲 시드: {args.seed}")
+    if args.top_up:
+        print(f"➕ 증분 모드: 목표 행 수까지 부족한 행만 추가 (행 수 기준: {TOPUP_COUNT})")
+    started = time.perf_counter()
+    results = run_scenarios(seed=args.seed, topup=args.top_up)
+    failed = [name for name, ok, *_ in results if not ok]
+    if MCP_SNAPSHOT:
+        for name, ok, *_ in results:
+            if ok:
+                create_snapshot(name)
+    close_all()
+    print(f"⏱️ 전체 소요 시간: {time.perf_counter() - started:.1f}s")
+    if failed:
+        print(f"⚠️ 실패한 시나리오: {', '.join(failed)}")
+        raise SystemExit(1)
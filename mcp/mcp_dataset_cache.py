@@ -0,0 +1,109 @@
+"""내용 주소 기반(content-addressed) 데이터셋 캐시
+
+시드를 지정한 실행은 (시나리오, 시드, 모든 NUM_* 설정, 로케일, 기준일, 생성 백엔드, 청크 크기,
+파티션 병렬 적재 여부) 가 같으면 항상 같은 데이터를 만든다. 그래서 이 값들의 해시를 키로, 적재 중 COPY 로 흘려보낸 데이터를
+테이블별 gzip 파일로 저장해 두고, 다음 실행에서 키가 일치하면 생성 단계를 건너뛰고
+저장된 파일을 그대로 COPY 로 흘려 넣는다.
+
+    .dataset_cache/<key>/manifest.json
+    .dataset_cache/<key>/01_customers.copy.gz ...
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import mcp_settings
+from mcp_dates import REFERENCE_DATE
+from mcp_faker_pool import FAKER_POOL, FAKER_POOL_SEED, FAKER_POOL_SIZE
+from mcp_loader import TextStream, copy_stream, sync_sequences, wait_loads
+
+# 캐시 설정 (환경변수에서 로드)
+DATASET_CACHE = os.getenv("DATASET_CACHE", "1") == "1"  # 시드 실행에서만 사용
+DATASET_CACHE_DIR = os.getenv(
+    "DATASET_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".dataset_cache"),
+)
+# 생성 로직이 바뀌면 올려서 기존 캐시를 무효화
+CACHE_VERSION = 3
+
+
+def dataset_key(scenario, seed, partitioned=False):
+    """캐시 키 — 데이터 내용을 결정하는 모든 입력의 SHA-256"""
+    params = {
+        "version": CACHE_VERSION,
+        "scenario": scenario,
+        "seed": seed,
+        "locale": mcp_settings.faker_locale,
+        "reference_date": REFERENCE_DATE.isoformat(),
+        "backend": mcp_settings.GEN_BACKEND,
+        # 청크 크기가 바뀌면 청크마다 뽑는 난수 순서도 바뀐다
+        "chunk_rows": mcp_settings.GEN_CHUNK_ROWS,
+        # 파티션 병렬 적재(MCP5_PARTITIONED)는 키를 파티션별로 배정하므로 ID 가 달라진다
+        "partitioned": partitioned,
+        "faker_pool": [FAKER_POOL, FAKER_POOL_SIZE, FAKER_POOL_SEED],
+        "settings": {
+            name: getattr(mcp_settings, name)
+            for name in sorted(dir(mcp_settings))
+            if name.startswith("NUM_")
+        },
+    }
+    encoded = json.dumps(params, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+def _cache_path(key):
+    return os.path.join(DATASET_CACHE_DIR, key)
+
+
+def has_dataset(key):
+    return os.path.exists(os.path.join(_cache_path(key), "manifest.json"))
+
+
+class DatasetRecorder:
+    """COPY 스트림을 테이블별 gzip 파일로 기록 (mcp_loader.set_recorder 에 전달)"""
+
+    def __init__(self, key):
+        self.key = key
+        self.tmp_path = f"{_cache_path(key)}.tmp{os.getpid()}"
+        os.makedirs(self.tmp_path, exist_ok=True)
+        self.entries = []
+
+    def open(self, table, columns):
+        filename = f"{len(self.entries) + 1:02d}_{table.lower()}.copy.gz"
+        self.entries.append({"table": table, "columns": columns, "file": filename})
+        return gzip.open(
+            os.path.join(self.tmp_path, filename), "wt", encoding="utf-8", compresslevel=1
+        )
+
+    def commit(self):
+        with open(os.path.join(self.tmp_path, "manifest.json"), "w") as f:
+            json.dump({"key": self.key, "tables": self.entries}, f, indent=2)
+        final_path = _cache_path(self.key)
+        if os.path.exists(final_path):
+            shutil.rmtree(self.tmp_path)
+        else:
+            os.replace(self.tmp_path, final_path)
+
+    def abort(self):
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+
+
+def replay_dataset(cur, key):
+    """캐시된 COPY 파일들을 기록 순서대로 적재하고 시퀀스를 맞춤"""
+    path = _cache_path(key)
+    with open(os.path.join(path, "manifest.json")) as f:
+        manifest = json.load(f)
+    started = time.perf_counter()
+    for entry in manifest["tables"]:
+        with gzip.open(os.path.join(path, entry["file"]), "rt", encoding="utf-8") as f:
+            chunks = iter(lambda: f.read(65536), "")
+            copy_stream(cur, entry["table"], entry["columns"], TextStream(chunks))
+    wait_loads(cur)
+    sync_sequences(cur, [entry["table"] for entry in manifest["tables"]])
+    print(
+        f"🗃️ 캐시된 데이터셋 적재: {key[:12]} ({len(manifest['tables'])}개 파일, {time.perf_counter() - started:.1f}s)"
+    )
@@ -0,0 +1,29 @@
+import os
+import random
+import re
+from datetime import date, timedelta
+
+# 날짜 생성 기준일 (기본값: 오늘). 고정하면 시드 실행 결과가 날짜와 관계없이 재현된다.
+_reference_date = os.getenv("MCP_REFERENCE_DATE")
+REFERENCE_DATE = date.fromisoformat(_reference_date) if _reference_date else date.today()
+
+# Faker 의 상대 날짜 문자열("-2y", "-6M", "today")과 같은 단위 (일)
+DATE_UNITS = {"y": 365.24, "M": 30.42, "w": 7, "d": 1}
+_DATE_PATTERN = re.compile(r"^([+-]\d+)([yMwd])$")
+
+
+def day_offset(expr):
+    """상대 날짜 표현식을 기준일로부터의 일(day) 오프셋으로 변환"""
+    if expr == "today":
+        return 0
+    match = _DATE_PATTERN.match(expr)
+    if not match:
+        raise ValueError(f"지원하지 않는 날짜 표현식: {expr}")
+    return int(int(match.group(1)) * DATE_UNITS[match.group(2)])
+
+
+def date_between(start, end):
+    """faker.date_between(start, end) 대체 — 기준일 기준, 전역 random 으로 시드 가능"""
+    return REFERENCE_DATE + timedelta(
+        days=random.randint(day_offset(start), day_offset(end))
+    )
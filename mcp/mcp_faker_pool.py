@@ -0,0 +1,168 @@
+"""Faker 값 풀(pool) 캐시
+
+faker.name(), faker.catch_phrase() 같은 호출은 (특히 ko_KR 로케일에서) 느리기 때문에
+실행마다 수만 번 호출하는 대신, 로케일·시드별로 큰 값 풀을 한 번만 만들어 디스크에 저장하고
+이후 실행에서는 memory-map 으로 열어 샘플링한다.
+
+파일 포맷 (리틀 엔디언):
+    MAGIC(8) | 개수 N (uint32) | 오프셋 (uint32 × (N+1)) | UTF-8 문자열 블롭
+"""
+
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+
+from mcp_settings import faker_locale, get_faker
+
+# 풀 설정 (환경변수에서 로드)
+FAKER_POOL = os.getenv("FAKER_POOL", "1") == "1"  # 0 이면 행마다 Faker 직접 호출
+FAKER_POOL_SIZE = int(os.getenv("FAKER_POOL_SIZE", 5000))
+FAKER_POOL_SEED = int(os.getenv("FAKER_POOL_SEED", 0))
+FAKER_POOL_DIR = os.getenv(
+    "FAKER_POOL_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".faker_pool")
+)
+
+_MAGIC = b"MCPPOOL1"
+_HEADER = struct.Struct("<8sI")
+
+# 풀 종류별 Faker 호출
+POOL_KINDS = {
+    "name": lambda f: f.name(),
+    "catch_phrase": lambda f: f.catch_phrase(),
+    "sentence3": lambda f: f.sentence(nb_words=3),
+    "sentence8": lambda f: f.sentence(nb_words=8),
+}
+
+
+class ValuePool:
+    """memory-map 으로 연 문자열 풀 (읽기 전용)"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"Faker 풀 파일 형식이 올바르지 않습니다: {path}")
+        self._offsets = memoryview(self._mm)[
+            _HEADER.size : _HEADER.size + 4 * (self._count + 1)
+        ].cast("I")
+        self._blob_start = _HEADER.size + 4 * (self._count + 1)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        start = self._blob_start + self._offsets[index]
+        end = self._blob_start + self._offsets[index + 1]
+        return self._mm[start:end].decode("utf-8")
+
+    def choice(self):
+        return self[random.randrange(self._count)]
+
+    def take(self, indices):
+        """인덱스 배열(NumPy 등)에 해당하는 값 목록"""
+        if hasattr(indices, "tolist"):
+            indices = indices.tolist()
+        return [self[i] for i in indices]
+
+
+def pool_path(kind, locale=None, seed=None, size=None):
+    locale = locale or faker_locale
+    seed = FAKER_POOL_SEED if seed is None else seed
+    size = size or FAKER_POOL_SIZE
+    return os.path.join(FAKER_POOL_DIR, f"{locale}-{seed}-{size}-{kind}.pool")
+
+
+def build_pool(kind, locale=None, seed=None, size=None):
+    """Faker 로 값 풀을 생성해 바이너리 파일로 저장하고 경로를 반환"""
+    locale = locale or faker_locale
+    seed = FAKER_POOL_SEED if seed is None else seed
+    size = size or FAKER_POOL_SIZE
+    from faker import Faker
+
+    generator = Faker(locale)
+    generator.seed_instance(seed)
+    make = POOL_KINDS[kind]
+    encoded = [make(generator).encode("utf-8") for _ in range(size)]
+
+    offsets = [0]
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+
+    path = pool_path(kind, locale, seed, size)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, size))
+        f.write(struct.pack(f"<{size + 1}I", *offsets))
+        f.write(b"".join(encoded))
+    # 병렬 워커가 동시에 만들더라도 완성된 파일만 보이도록 원자적으로 교체
+    os.replace(tmp_path, path)
+    return path
+
+
+_pools = {}
+
+
+def get_pool(kind):
+    """값 풀을 반환 (메모리 → 디스크(mmap) → 새로 생성 순으로 조회)"""
+    if kind in _pools:
+        return _pools[kind]
+    path = pool_path(kind)
+    started = time.perf_counter()
+    if os.path.exists(path):
+        pool = ValuePool(path)
+        print(f"📂 Faker 풀 로드: {kind} {len(pool)}개 ({time.perf_counter() - started:.3f}s)")
+    else:
+        pool = ValuePool(build_pool(kind))
+        print(f"🧰 Faker 풀 생성: {kind} {len(pool)}개 ({time.perf_counter() - started:.2f}s)")
+    _pools[kind] = pool
+    return pool
+
+
+def fake_value(kind):
+    """Faker 값 하나 (풀 사용 시 풀에서 샘플링)"""
+    if not FAKER_POOL:
+        return POOL_KINDS[kind](get_faker())
+    return get_pool(kind).choice()
+
+
+def fake_column(kind, n, rng=None):
+    """Faker 값 n개 (rng 가 주어지면 NumPy 난수로 인덱스를 뽑는다)"""
+    if not FAKER_POOL:
+        make = POOL_KINDS[kind]
+        faker = get_faker()
+        return [make(faker) for _ in range(n)]
+    pool = get_pool(kind)
+    if rng is not None:
+        return pool.take(rng.integers(0, len(pool), n))
+    return [pool.choice() for _ in range(n)]
+
+
+if __name__ == "__main__":
+    # 풀을 (재)생성하고 콜드/웜 실행 시간을 비교해 출력
+    kinds = sys.argv[1:] or list(POOL_KINDS)
+    print(f"📦 로케일 {faker_locale}, 시드 {FAKER_POOL_SEED}, 풀 크기 {FAKER_POOL_SIZE}")
+    for kind in kinds:
+        started = time.perf_counter()
+        build_pool(kind)
+        cold = time.perf_counter() - started
+
+        started = time.perf_counter()
+        pool = ValuePool(pool_path(kind))
+        values = [pool.choice() for _ in range(FAKER_POOL_SIZE)]
+        warm = time.perf_counter() - started
+
+        started = time.perf_counter()
+        make = POOL_KINDS[kind]
+        faker = get_faker()
+        for _ in range(FAKER_POOL_SIZE):
+            make(faker)
+        direct = time.perf_counter() - started
+        print(
+            f"  {kind:<13} 콜드(생성) {cold:.2f}s | 웜(mmap+샘플 {len(values)}개) {warm:.3f}s"
+            f" | Faker 직접 호출 {direct:.2f}s"
+        )
@@ -0,0 +1,412 @@
+"""학생별 MCP 데이터베이스 일괄 복제 (fan-out)
+
+시나리오마다 데이터를 한 번만 생성해 mcpN_template 으로 고정한 뒤,
+    CREATE DATABASE mcpN_s01 TEMPLATE mcpN_template;
+로 학생 수만큼 복제한다. 서버 측 파일 복사라 데이터를 다시 생성·전송하지 않으며,
+복제는 관리용 연결 여러 개로 동시에 실행한다.
+
+학생 데이터베이스마다 같은 이름의 로그인 롤(mcpN_s01_ro)을 만든다.
+- 테이블 SELECT 권한은 템플릿에서 공용 읽기 전용 롤(FANOUT_GROUP_ROLE)에 한 번만 부여해 복제본이 물려받는다
+- 데이터베이스 CONNECT 는 PUBLIC 에서 회수하고 해당 학생 롤에만 부여한다 (다른 학생 DB 접속 불가)
+
+접속 정보는 mcp.json 의 mcpServers 항목으로 기록한다 (기존 항목은 유지, 같은 이름은 갱신).
+
+사용법:
+    python3 mcp_fanout.py provision --students 50 [--scenarios mcp1,mcp3] [--recreate]
+    python3 mcp_fanout.py status
+    python3 mcp_fanout.py drop --students 50
+"""
+
+import argparse
+import json
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote, unquote, urlsplit
+
+from psycopg2 import sql
+
+from mcp_connections import admin_connection, close_all, connect
+from mcp_settings import DB_HOST, DB_PORT
+from mcp_snapshot import create_snapshot, template_name
+
+# 복제 설정 (환경변수에서 로드)
+FANOUT_SCENARIOS = os.getenv("FANOUT_SCENARIOS", "mcp1,mcp2,mcp3,mcp4,mcp5")
+FANOUT_STUDENTS = int(os.getenv("FANOUT_STUDENTS", 50))
+FANOUT_PREFIX = os.getenv("FANOUT_PREFIX", "s")  # mcp3_s01, mcp3_s02, ...
+FANOUT_WORKERS = int(os.getenv("FANOUT_WORKERS", 8))  # 동시에 복제하는 관리용 연결 수
+FANOUT_STRATEGY = os.getenv("FANOUT_STRATEGY", "")  # PostgreSQL 15+: wal_log | file_copy (비우면 서버 기본값)
+FANOUT_GROUP_ROLE = os.getenv("FANOUT_GROUP_ROLE", "mcp_readonly")
+FANOUT_CONNECTION_LIMIT = int(os.getenv("FANOUT_CONNECTION_LIMIT", 5))  # 학생 롤 동시 접속 수 제한
+FANOUT_PASSWORD = os.getenv("FANOUT_PASSWORD")  # 비우면 학생마다 무작위 (mcp.json 에 있던 값은 재사용)
+FANOUT_PUBLIC_HOST = os.getenv("FANOUT_PUBLIC_HOST") or DB_HOST  # mcp.json 에 적을 접속 호스트
+MCP_JSON_PATH = os.getenv("MCP_JSON_PATH", "mcp.json")
+MCP_SERVER_PACKAGE = os.getenv("MCP_SERVER_PACKAGE", "@modelcontextprotocol/server-postgres")
+
+
+def student_ids(count):
+    width = max(2, len(str(count)))
+    return [f"{FANOUT_PREFIX}{i:0{width}d}" for i in range(1, count + 1)]
+
+
+def clone_name(scenario, student):
+    return f"{scenario}_{student}"
+
+
+def role_name(dbname):
+    return f"{dbname}_ro"
+
+
+def _exists(cur, dbname):
+    cur.execute("SELECT 1 FROM pg_database WHERE datname = %s", (dbname,))
+    return cur.fetchone() is not None
+
+
+def _has_data(scenario):
+    """원본 데이터베이스의 public 테이블 중 행이 있는 것이 하나라도 있는지"""
+    conn = connect(scenario)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT relname FROM pg_stat_user_tables WHERE schemaname = 'public'"
+            )
+            for (table,) in cur.fetchall():
+                cur.execute(
+                    sql.SQL("SELECT EXISTS (SELECT 1 FROM {})").format(
+                        sql.Identifier(table)
+                    )
+                )
+                if cur.fetchone()[0]:
+                    return True
+        return False
+    finally:
+        conn.close()
+
+
+def ensure_group_role(cur):
+    cur.execute("SELECT 1 FROM pg_roles WHERE rolname = %s", (FANOUT_GROUP_ROLE,))
+    if cur.fetchone() is None:
+        cur.execute(
+            sql.SQL("CREATE ROLE {} NOLOGIN").format(sql.Identifier(FANOUT_GROUP_ROLE))
+        )
+
+
+def grant_template(scenario, cur):
+    """템플릿 안의 객체에 공용 읽기 전용 권한 부여 (복제본이 그대로 물려받는다)"""
+    template = sql.Identifier(template_name(scenario))
+    # 템플릿은 평소 접속을 막아 두므로 권한 부여 동안만 잠시 연다
+    cur.execute(sql.SQL("ALTER DATABASE {} ALLOW_CONNECTIONS true").format(template))
+    try:
+        conn = connect(template_name(scenario), autocommit=True)
+        try:
+            with conn.cursor() as tcur:
+                group = sql.Identifier(FANOUT_GROUP_ROLE)
+                # PostgreSQL 14 이하는 public 스키마 CREATE 가 PUBLIC 에 열려 있다
+                tcur.execute("REVOKE CREATE ON SCHEMA public FROM PUBLIC")
+                tcur.execute(sql.SQL("GRANT USAGE ON SCHEMA public TO {}").format(group))
+                tcur.execute(
+                    sql.SQL("GRANT SELECT ON ALL TABLES IN SCHEMA public TO {}").format(group)
+                )
+        finally:
+            conn.close()
+    finally:
+        cur.execute(
+            sql.SQL("ALTER DATABASE {} ALLOW_CONNECTIONS false").format(template)
+        )
+
+
+def prepare_templates(scenarios, seed=None):
+    """시나리오마다 템플릿을 준비 (없으면 한 번만 생성 → 스냅샷) 하고 권한을 부여"""
+    cur = admin_connection().cursor()
+    ensure_group_role(cur)
+    missing = [s for s in scenarios if not _exists(cur, template_name(s))]
+    generate = [s for s in missing if not _exists(cur, s) or not _has_data(s)]
+    if generate:
+        # 생성기는 Faker·NumPy 등 무거운 모듈을 불러오므로 필요할 때만 import
+        from mcp_data_initializer import run_scenarios
+
+        print(f"🏗️ 원본 데이터 생성: {', '.join(generate)}")
+        failed = [name for name, ok, *_ in run_scenarios(generate, seed=seed) if not ok]
+        if failed:
+            raise RuntimeError(f"원본 데이터 생성 실패: {', '.join(failed)}")
+    for scenario in missing:
+        create_snapshot(scenario, cur)
+    for scenario in scenarios:
+        grant_template(scenario, cur)
+    cur.close()
+
+
+def load_config(path=MCP_JSON_PATH):
+    if not os.path.exists(path):
+        return {"mcpServers": {}}
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    config.setdefault("mcpServers", {})
+    return config
+
+
+def save_config(config, path=MCP_JSON_PATH):
+    # 쓰는 도중 중단돼도 기존 파일이 깨지지 않도록 임시 파일 → rename
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def connection_url(dbname, role, password):
+    host = quote(FANOUT_PUBLIC_HOST or "localhost", safe="")
+    return f"postgresql://{quote(role, safe='')}:{quote(password, safe='')}@{host}:{DB_PORT}/{dbname}"
+
+
+def server_entry(dbname, role, password):
+    return {
+        "command": "npx",
+        "args": ["-y", MCP_SERVER_PACKAGE, connection_url(dbname, role, password)],
+    }
+
+
+def known_password(config, dbname):
+    """mcp.json 에 이미 기록된 비밀번호 (재실행해도 학생에게 나눠 준 접속 정보가 바뀌지 않도록)"""
+    entry = config["mcpServers"].get(dbname)
+    if not entry:
+        return None
+    for arg in entry.get("args", []):
+        if arg.startswith("postgresql://"):
+            password = urlsplit(arg).password
+            return unquote(password) if password else None
+    return None
+
+
+class Cloner:
+    """워커 스레드마다 관리용 연결을 하나씩 두고 복제·롤 생성을 실행"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._conns = []
+        self._lock = threading.Lock()
+
+    def cursor(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or conn.closed:
+            conn = connect("postgres", autocommit=True)
+            self._local.conn = conn
+            with self._lock:
+                self._conns.append(conn)
+        return conn.cursor()
+
+    def close(self):
+        for conn in self._conns:
+            if not conn.closed:
+                conn.close()
+
+    def provision(self, scenario, dbname, password, recreate=False):
+        """학생 데이터베이스 하나를 복제하고 전용 롤을 설정. 'created' 또는 'existing' 반환"""
+        role = role_name(dbname)
+        with self.cursor() as cur:
+            existed = _exists(cur, dbname)
+            if existed and recreate:
+                cur.execute(
+                    sql.SQL("DROP DATABASE {} WITH (FORCE)").format(sql.Identifier(dbname))
+                )
+            if recreate or not existed:
+                create = sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(
+                    sql.Identifier(dbname), sql.Identifier(template_name(scenario))
+                )
+                if FANOUT_STRATEGY and cur.connection.server_version >= 150000:
+                    create += sql.SQL(" STRATEGY {}").format(
+                        sql.Identifier(FANOUT_STRATEGY.lower())
+                    )
+                cur.execute(create)
+
+            cur.execute("SELECT 1 FROM pg_roles WHERE rolname = %s", (role,))
+            verb = "ALTER" if cur.fetchone() else "CREATE"
+            cur.execute(
+                sql.SQL(
+                    verb + " ROLE {} LOGIN INHERIT CONNECTION LIMIT {} PASSWORD {}"
+                ).format(
+                    sql.Identifier(role),
+                    sql.Literal(FANOUT_CONNECTION_LIMIT),
+                    sql.Literal(password),
+                )
+            )
+            cur.execute(
+                sql.SQL("GRANT {} TO {}").format(
+                    sql.Identifier(FANOUT_GROUP_ROLE), sql.Identifier(role)
+                )
+            )
+            cur.execute(
+                sql.SQL("REVOKE ALL ON DATABASE {} FROM PUBLIC").format(
+                    sql.Identifier(dbname)
+                )
+            )
+            cur.execute(
+                sql.SQL("GRANT CONNECT ON DATABASE {} TO {}").format(
+                    sql.Identifier(dbname), sql.Identifier(role)
+                )
+            )
+        return "existing" if existed and not recreate else "created"
+
+    def drop(self, dbname):
+        with self.cursor() as cur:
+            cur.execute(
+                sql.SQL("DROP DATABASE IF EXISTS {} WITH (FORCE)").format(
+                    sql.Identifier(dbname)
+                )
+            )
+            cur.execute(
+                sql.SQL("DROP ROLE IF EXISTS {}").format(sql.Identifier(role_name(dbname)))
+            )
+
+
+def provision(scenarios, count, workers=FANOUT_WORKERS, recreate=False, seed=None, config_path=MCP_JSON_PATH):
+    """scenarios × count 개의 학생 데이터베이스를 만들고 mcp.json 을 갱신"""
+    started = time.perf_counter()
+    prepare_templates(scenarios, seed)
+    print(f"🧬 템플릿 준비 완료 ({time.perf_counter() - started:.1f}s)")
+
+    config = load_config(config_path)
+    jobs = []
+    for student in student_ids(count):
+        for scenario in scenarios:
+            dbname = clone_name(scenario, student)
+            password = (
+                FANOUT_PASSWORD
+                or known_password(config, dbname)
+                or secrets.token_urlsafe(12)
+            )
+            jobs.append((scenario, dbname, password))
+
+    cloner = Cloner()
+    summary = {"created": 0, "existing": 0, "failed": 0}
+    cloned_at = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {
+                executor.submit(cloner.provision, scenario, dbname, password, recreate): (
+                    dbname,
+                    password,
+                )
+                for scenario, dbname, password in jobs
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                dbname, password = futures[future]
+                try:
+                    summary[future.result()] += 1
+                except Exception as e:
+                    summary["failed"] += 1
+                    print(f"❌ {dbname}: {e}")
+                    continue
+                config["mcpServers"][dbname] = server_entry(
+                    dbname, role_name(dbname), password
+                )
+                if done % 50 == 0 or done == len(jobs):
+                    print(f"  📦 {done}/{len(jobs)}")
+    finally:
+        cloner.close()
+        # 중간에 실패해도 만들어진 데이터베이스의 접속 정보는 남긴다
+        save_config(config, config_path)
+
+    print(
+        f"✅ 생성 {summary['created']} / 기존 {summary['existing']} / 실패 {summary['failed']} "
+        f"(복제 {time.perf_counter() - cloned_at:.1f}s, {workers}개 연결)"
+    )
+    print(f"📝 {config_path}: {len(config['mcpServers'])}개 서버 항목")
+    return summary
+
+
+def drop(scenarios, count, workers=FANOUT_WORKERS, config_path=MCP_JSON_PATH):
+    names = [clone_name(s, student) for student in student_ids(count) for s in scenarios]
+    config = load_config(config_path)
+    cloner = Cloner()
+    failed = 0
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {executor.submit(cloner.drop, name): name for name in names}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    future.result()
+                    config["mcpServers"].pop(name, None)
+                except Exception as e:
+                    failed += 1
+                    print(f"❌ {name}: {e}")
+    finally:
+        cloner.close()
+        save_config(config, config_path)
+    print(f"🗑️ 학생 데이터베이스 {len(names) - failed}개 삭제")
+    return failed
+
+
+def status(scenarios):
+    cur = admin_connection().cursor()
+    for scenario in scenarios:
+        cur.execute(
+            """
+            SELECT count(*), coalesce(sum(pg_database_size(datname)), 0)
+            FROM pg_database WHERE datname LIKE %s
+            """,
+            (f"{scenario}\\_{FANOUT_PREFIX}%",),
+        )
+        clones, size = cur.fetchone()
+        template = "✅" if _exists(cur, template_name(scenario)) else "⚠️ 없음"
+        print(
+            f"📊 {scenario}: 템플릿 {template}, 학생 DB {clones}개 ({size / 1024 / 1024:.0f} MB)"
+        )
+    cur.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="학생별 MCP 데이터베이스 일괄 복제")
+    parser.add_argument("command", choices=["provision", "drop", "status"])
+    parser.add_argument(
+        "--students",
+        type=int,
+        default=FANOUT_STUDENTS,
+        help="학생 수 (기본값: FANOUT_STUDENTS)",
+    )
+    parser.add_argument(
+        "--scenarios",
+        default=FANOUT_SCENARIOS,
+        help="쉼표로 구분한 시나리오 목록 (기본값: FANOUT_SCENARIOS)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=FANOUT_WORKERS,
+        help="동시에 복제하는 연결 수 (기본값: FANOUT_WORKERS)",
+    )
+    parser.add_argument(
+        "--recreate",
+        action="store_true",
+        help="이미 있는 학생 데이터베이스도 템플릿에서 다시 복제",
+    )
+    parser.add_argument(
+        "--seed", type=int, help="원본 데이터를 새로 생성할 때 사용할 시드"
+    )
+    parser.add_argument(
+        "--config",
+        default=MCP_JSON_PATH,
+        help="갱신할 MCP 설정 파일 (기본값: MCP_JSON_PATH)",
+    )
+    args = parser.parse_args()
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+
+    started = time.perf_counter()
+    if args.command == "status":
+        status(scenarios)
+    elif args.command == "drop":
+        failed = drop(scenarios, args.students, args.workers, args.config)
+    else:
+        print(
+            f"👥 학생 {args.students}명 × 시나리오 {len(scenarios)}개 = {args.students * len(scenarios)}개 데이터베이스"
+        )
+        failed = provision(
+            scenarios, args.students, args.workers, args.recreate, args.seed, args.config
+        )["failed"]
+    close_all()
+    print(f"⏱️ 전체 소요 시간: {time.perf_counter() - started:.1f}s")
+    if args.command != "status" and failed:
+        raise SystemExit(1)
@@ -0,0 +1,413 @@
+import functools
+import io
+import itertools
+import os
+import random
+import time
+from array import array
+
+from mcp_settings import GEN_CHUNK_ROWS
+
+# 적재 방식 설정 (copy: COPY FROM STDIN 일괄 적재, insert: 행 단위 INSERT)
+LOAD_METHOD = os.getenv("LOAD_METHOD", "copy").lower()
+LOAD_METHODS = ("copy", "insert")
+# 열 배열 적재 시 한 번에 텍스트로 변환할 행 수
+COPY_CHUNK_ROWS = int(os.getenv("COPY_CHUNK_ROWS", 100000))
+
+
+_COPY_SPECIAL = ("\\", "\t", "\n", "\r")
+
+
+def _copy_value(value):
+    """COPY TEXT 포맷에 맞게 값 하나를 문자열로 변환"""
+    if value is None:
+        return "\\N"
+    text = str(value)
+    return (
+        text.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class TextStream(io.TextIOBase):
+    """문자열 조각 제너레이터를 COPY FROM STDIN 용 파일 객체로 감싸는 어댑터
+
+    전체 데이터를 메모리에 올리지 않고 read() 요청이 올 때마다
+    필요한 만큼만 조각을 꺼내 넘겨준다.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = _timed(chunks)
+        self._buffer = ""
+        self.tee = None  # 지정하면 읽어 간 내용을 그대로 복사해 기록 (데이터셋 캐시용)
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            chunk, self._buffer = self._buffer, ""
+        else:
+            chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        if self.tee is not None:
+            self.tee.write(chunk)
+        return chunk
+
+
+class RowStream(TextStream):
+    """행 제너레이터를 TEXT 포맷 줄 단위로 변환해 흘려보내는 스트림"""
+
+    def __init__(self, rows):
+        self.row_count = 0
+        super().__init__(self._lines(rows))
+
+    def _lines(self, rows):
+        for row in rows:
+            self.row_count += 1
+            if self.row_count % PROGRESS_EVERY_ROWS == 0:
+                _report_progress(self.row_count)
+            yield "\t".join(_copy_value(v) for v in row) + "\n"
+
+
+_recorder = None
+
+
+def set_recorder(recorder):
+    """COPY 로 흘려보내는 데이터를 함께 기록할 recorder 지정 (None 이면 해제)
+
+    recorder 는 open(table, columns) 로 쓰기용 텍스트 파일을 돌려주는 객체다.
+    """
+    global _recorder
+    _recorder = recorder
+
+
+_copy_handlers = {}
+
+
+def set_copy_handler(table, handler):
+    """table 로 가는 COPY 를 handler(table, columns, stream) 가 대신 처리하도록 지정 (None 이면 해제)
+
+    파티션 병렬 적재(mcp_partitions.PartitionedLoad)가 COPY 텍스트를 파티션별로 나누는 데 쓴다.
+    handler 에 wait_loads() 가 있으면 wait_loads(cur) 에서 함께 기다린다.
+    """
+    if handler is None:
+        _copy_handlers.pop(table.lower(), None)
+    else:
+        _copy_handlers[table.lower()] = handler
+
+
+_observer = None
+_progress = None
+_current_table = None
+_generate_seconds = 0.0
+# 라이브 진행 표시 콜백을 부르는 간격 (행 수)
+PROGRESS_EVERY_ROWS = int(os.getenv("PROGRESS_EVERY_ROWS", 50000))
+
+
+def set_observer(observer, progress=None):
+    """적재 계측 콜백 지정 (None 이면 해제)
+
+    observer(table, rows, seconds, generate_seconds): 테이블 적재가 끝날 때마다 호출.
+        스트리밍 적재에서는 행 생성과 전송이 겹치므로 seconds 는 전체 시간이고,
+        generate_seconds 는 그중 클라이언트에서 행을 만들고 텍스트로 바꾸는 데 쓴 시간이다.
+    progress(table, rows): 적재 도중 PROGRESS_EVERY_ROWS 행마다 호출 (라이브 진행 표시용).
+    """
+    global _observer, _progress
+    _observer = observer
+    _progress = progress
+
+
+def _report_progress(rows):
+    if _progress is not None:
+        _progress(_current_table, rows)
+
+
+def _timed(iterable):
+    """iterable 에서 값을 꺼내는 데 걸린 시간(= 클라이언트 측 생성 시간)을 누적"""
+    global _generate_seconds
+    iterator = iter(iterable)
+    while True:
+        started = time.perf_counter()
+        try:
+            value = next(iterator)
+        except StopIteration:
+            _generate_seconds += time.perf_counter() - started
+            return
+        _generate_seconds += time.perf_counter() - started
+        yield value
+
+
+def _observed(load):
+    @functools.wraps(load)
+    def wrapper(cur, table, columns, rows):
+        global _current_table, _generate_seconds
+        _current_table, _generate_seconds = table, 0.0
+        started = time.perf_counter()
+        count = load(cur, table, columns, rows)
+        if _observer is not None:
+            _observer(table, count, time.perf_counter() - started, _generate_seconds)
+        return count
+
+    return wrapper
+
+
+def copy_stream(cur, table, columns, stream):
+    """TextStream 하나를 COPY ... FROM STDIN 으로 적재 (recorder 가 있으면 함께 기록)"""
+    if _recorder is not None:
+        stream.tee = _recorder.open(table, columns)
+    try:
+        handler = _copy_handlers.get(table.lower())
+        if handler is not None:
+            handler(table, columns, stream)
+        else:
+            cur.copy_expert(
+                f"COPY {table} ({', '.join(columns)}) FROM STDIN", stream, size=65536
+            )
+    finally:
+        if stream.tee is not None:
+            stream.tee.close()
+
+
+@_observed
+def copy_rows(cur, table, columns, rows):
+    """COPY ... FROM STDIN 으로 행들을 한 번의 스트림으로 적재"""
+    stream = RowStream(rows)
+    copy_stream(cur, table, columns, stream)
+    return stream.row_count
+
+
+def _column_text(values):
+    """열 배열 하나를 COPY TEXT 값 목록으로 변환
+
+    숫자/날짜 배열(NumPy)은 이스케이프가 필요 없으므로 astype(str) 로 한 번에 변환한다.
+    문자열만 있는 열(범주형 값, Faker 풀)은 한 번에 이어 붙여 특수 문자가 없으면 그대로 쓴다.
+    """
+    if getattr(values, "dtype", None) is not None and values.dtype.kind in "iufM":
+        return values.astype(str).tolist()
+    if hasattr(values, "tolist"):
+        values = values.tolist()
+    elif not isinstance(values, (list, tuple)):
+        values = list(values)
+    try:
+        joined = "".join(values)
+    except TypeError:
+        joined = None  # None·숫자 등 문자열이 아닌 값이 섞여 있음
+    if joined is not None and not any(c in joined for c in _COPY_SPECIAL):
+        return values
+    return [_copy_value(v) for v in values]
+
+
+def _columns_text(arrays):
+    """열 배열 묶음 하나를 COPY TEXT 블록 하나로 변환"""
+    texts = [_column_text(a) for a in arrays]
+    return "\n".join(map("\t".join, zip(*texts))) + "\n"
+
+
+def chunk_ranges(total, chunk_rows=GEN_CHUNK_ROWS):
+    """0 ~ total 구간을 chunk_rows 크기의 (start, stop) 구간으로 나눠 차례로 반환"""
+    for start in range(0, total, chunk_rows):
+        yield start, min(start + chunk_rows, total)
+
+
+def split_columns(arrays, chunk_rows=COPY_CHUNK_ROWS):
+    """이미 만들어 둔 열 배열 묶음을 chunk_rows 행 단위 묶음들로 나눔"""
+    total = len(arrays[0]) if arrays else 0
+    for start, stop in chunk_ranges(total, chunk_rows):
+        yield [a[start:stop] for a in arrays]
+
+
+@_observed
+def copy_column_chunks(cur, table, columns, chunks):
+    """열 배열 묶음(chunk)들을 하나씩 텍스트로 바꿔 한 번의 COPY 스트림으로 적재
+
+    chunks 가 제너레이터면 청크 하나를 만들고 → 변환하고 → 흘려보낸 뒤 버리므로
+    테이블 크기와 관계없이 청크 하나만큼의 메모리만 사용한다.
+    """
+    total = 0
+
+    def texts():
+        nonlocal total
+        for arrays in chunks:
+            if len(arrays[0]) == 0:
+                continue
+            total += len(arrays[0])
+            yield _columns_text(arrays)
+            _report_progress(total)
+
+    copy_stream(cur, table, columns, TextStream(texts()))
+    return total
+
+
+@_observed
+def insert_rows(cur, table, columns, rows):
+    """기존 방식: 행마다 INSERT 를 한 번씩 실행 (비교용)"""
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+    count = 0
+    for row in _timed(rows):
+        cur.execute(sql, row)
+        count += 1
+        if count % PROGRESS_EVERY_ROWS == 0:
+            _report_progress(count)
+    return count
+
+
+def load_rows(cur, table, columns, rows, method=None):
+    """설정된 적재 방식(LOAD_METHOD)에 따라 행들을 테이블에 적재"""
+    method = (method or LOAD_METHOD).lower()
+    if method == "copy":
+        return copy_rows(cur, table, columns, rows)
+    if method == "insert":
+        return insert_rows(cur, table, columns, rows)
+    raise ValueError(f"지원하지 않는 LOAD_METHOD: {method} (사용 가능: {LOAD_METHODS})")
+
+
+def load_column_chunks(cur, table, columns, chunks, method=None):
+    """열 배열 묶음들을 청크 단위로 받아 설정된 적재 방식으로 적재"""
+    method = (method or LOAD_METHOD).lower()
+    if method == "copy":
+        return copy_column_chunks(cur, table, columns, chunks)
+    rows = (
+        row
+        for arrays in chunks
+        for row in zip(*(a.tolist() if hasattr(a, "tolist") else a for a in arrays))
+    )
+    return load_rows(cur, table, columns, rows, method)
+
+
+def load_columns(cur, table, columns, arrays, method=None):
+    """열 배열(NumPy 배열 또는 리스트) 묶음을 설정된 적재 방식으로 적재"""
+    return load_column_chunks(cur, table, columns, split_columns(arrays), method)
+
+
+class IdPool:
+    """부모 테이블 기본키 풀
+
+    자식 행의 외래키를 `(SELECT ... ORDER BY RANDOM() LIMIT 1)` 서브쿼리 대신
+    클라이언트에서 균등 샘플링한다. 연속 구간은 range 로, 그 외에는
+    array('l') 로 보관해 키 하나당 8바이트 이하만 사용한다.
+    """
+
+    def __init__(self, ids):
+        self.ids = ids if isinstance(ids, range) else array("l", ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def choice(self):
+        return self.ids[random.randrange(len(self.ids))]
+
+    def sample(self, k):
+        """복원추출로 k개의 키를 한 번에 뽑는다 (O(k))"""
+        return random.choices(self.ids, k=k)
+
+    def iter_sample(self, k, chunk_rows=GEN_CHUNK_ROWS):
+        """sample(k) 를 chunk_rows 개씩 나눠 뽑아 차례로 내보낸다 (메모리 O(chunk_rows))"""
+        for start, stop in chunk_ranges(k, chunk_rows):
+            yield from random.choices(self.ids, k=stop - start)
+
+
+def wait_loads(cur):
+    """비동기 적재 세션·파티션 병렬 적재가 진행 중이면 COPY 가 모두 끝날 때까지 기다림 (그 외에는 아무 일도 없음)"""
+    wait = getattr(cur, "wait_loads", None)
+    if wait is not None:
+        wait()
+    for handler in list(dict.fromkeys(_copy_handlers.values())):
+        wait = getattr(handler, "wait_loads", None)
+        if wait is not None:
+            wait()
+
+
+def reserve_ids(cur, table, id_column, count):
+    """SERIAL 시퀀스에서 count개의 키를 한 번에 예약해 IdPool 로 반환
+
+    예약한 키는 적재할 행에 직접 넣어 주므로, 적재 후 다시 조회할 필요가 없다.
+    """
+    if count <= 0:
+        return IdPool(range(0))
+    cur.execute(
+        "SELECT setval(pg_get_serial_sequence(%s, %s), nextval(pg_get_serial_sequence(%s, %s)) + %s - 1)",
+        (table.lower(), id_column, table.lower(), id_column, count),
+    )
+    last = cur.fetchone()[0]
+    return IdPool(range(last - count + 1, last + 1))
+
+
+def fetch_ids(cur, table, id_column):
+    """이미 존재하는 테이블의 기본키를 한 번만 조회해 IdPool 로 반환"""
+    cur.execute(f"SELECT {id_column} FROM {table}")
+    return IdPool(row[0] for row in cur.fetchall())
+
+
+def extend_ids(cur, table, id_column, count, have=0):
+    """새 키 count 개를 예약해 (새 키 풀, 기존 키 + 새 키 풀) 로 반환
+
+    증분 적재에서 자식 행의 외래키는 기존 부모와 새 부모 모두에서 뽑는다.
+    기존 행이 없으면(have == 0) 기존 키를 조회하지 않는다.
+    """
+    new_ids = reserve_ids(cur, table, id_column, count)
+    if not have:
+        return new_ids, new_ids
+    existing = fetch_ids(cur, table, id_column)
+    return new_ids, IdPool(itertools.chain(existing, new_ids))
+
+
+def table_counts(cur, tables, exact=True):
+    """테이블별 현재 행 수 {소문자 테이블명: 행 수}
+
+    exact=False 이면 pg_class.reltuples 추정치를 쓰고, 통계가 없는 테이블(-1)만 COUNT(*) 로 센다.
+    """
+    counts = {}
+    if not exact:
+        cur.execute(
+            """
+            SELECT c.relname, c.reltuples::bigint
+            FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'public' AND c.relname = ANY(%s)
+            """,
+            ([t.lower() for t in tables],),
+        )
+        counts = {name: rows for name, rows in cur.fetchall() if rows >= 0}
+    for table in tables:
+        if table.lower() not in counts:
+            cur.execute(f"SELECT COUNT(*) FROM {table}")
+            counts[table.lower()] = cur.fetchone()[0]
+    return counts
+
+
+def restart_sequences(cur):
+    """public 스키마의 모든 시퀀스를 1부터 다시 시작 (빈 데이터베이스에서 키를 재현하기 위함)"""
+    cur.execute(
+        """
+        SELECT setval(c.oid, 1, false)
+        FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind = 'S' AND n.nspname = 'public'
+        """
+    )
+
+
+def sync_sequences(cur, tables):
+    """명시적 키로 적재한 테이블들의 SERIAL 시퀀스를 현재 최댓값 다음으로 맞춤"""
+    cur.execute(
+        """
+        SELECT table_name, column_name
+        FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = ANY(%s)
+          AND column_default LIKE 'nextval(%%'
+        """,
+        ([t.lower() for t in tables],),
+    )
+    for table, column in cur.fetchall():
+        cur.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, %s), COALESCE(MAX({column}), 1), MAX({column}) IS NOT NULL) FROM {table}",
+            (table, column),
+        )
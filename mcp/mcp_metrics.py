@@ -0,0 +1,214 @@
+"""데이터 생성·적재 단계 계측과 메트릭 내보내기
+
+시나리오마다 다음 단계를 계측한다.
+- 시나리오 단계: 스키마(DDL) → 준비 → 적재 → (deferred 모드) 기본키·외래키·인덱스·LOGGED·ANALYZE → 커밋
+- 테이블별 적재: 행 수, 클라이언트 생성 시간, 서버 전송 시간, 초당 행 수 (mcp_loader 관찰 콜백)
+
+출력:
+- 라이브 진행 표시 (MCP_PROGRESS: auto=터미널일 때만, 1=항상, 0=끄기)
+- JSON lines (MCP_METRICS_JSONL): 이벤트마다 한 줄씩 추가 — 병렬 워커도 같은 파일에 기록
+- Prometheus textfile (MCP_METRICS_PROM): 실행이 끝나면 node_exporter textfile collector 용 .prom 파일을 원자적으로 교체
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+import mcp_loader
+
+# 계측 출력 설정 (환경변수에서 로드)
+MCP_PROGRESS = os.getenv("MCP_PROGRESS", "auto").lower()
+MCP_METRICS_JSONL = os.getenv("MCP_METRICS_JSONL")
+MCP_METRICS_PROM = os.getenv("MCP_METRICS_PROM")
+
+PHASE_LABELS = {
+    "ddl": "스키마",
+    "prepare": "준비",
+    "load": "적재",
+    "primary_key": "기본키",
+    "foreign_key": "외래키",
+    "foreign_key_partitioned": "파티션 외래키",
+    "index": "인덱스",
+    "logged": "LOGGED",
+    "analyze": "ANALYZE",
+    "workload": "워크로드",
+    "commit": "커밋",
+}
+
+_events = []
+_scenario = None
+_live_line = False  # \r 로 덮어쓰는 진행 줄이 화면에 떠 있는지
+
+
+def _live_enabled():
+    if MCP_PROGRESS == "auto":
+        return sys.stdout.isatty()
+    return MCP_PROGRESS == "1"
+
+
+def _clear_live_line():
+    global _live_line
+    if _live_line:
+        print("\r\033[K", end="")
+        _live_line = False
+
+
+def _emit(event):
+    event = {"ts": round(time.time(), 3), "scenario": _scenario, **event}
+    _events.append(event)
+    if MCP_METRICS_JSONL:
+        # 한 줄씩 append 하므로 병렬 워커가 같은 파일에 써도 줄이 섞이지 않는다
+        with open(MCP_METRICS_JSONL, "a", encoding="utf-8") as f:
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+
+def take_events():
+    """지금까지 모은 이벤트를 반환하고 비움 (병렬 워커 → 부모 프로세스 전달용)"""
+    events = list(_events)
+    _events.clear()
+    return events
+
+
+def _on_progress(table, rows):
+    global _live_line
+    print(f"\r\033[K  ⏳ {_scenario}.{table.lower()} {rows:,}행 적재 중...", end="", flush=True)
+    _live_line = True
+
+
+def _on_table(table, rows, seconds, generate_seconds):
+    load_seconds = max(seconds - generate_seconds, 0.0)
+    rows_per_s = rows / seconds if seconds else 0.0
+    _emit(
+        {
+            "kind": "table",
+            "table": table.lower(),
+            "rows": rows,
+            "seconds": round(seconds, 4),
+            "generate_seconds": round(generate_seconds, 4),
+            "load_seconds": round(load_seconds, 4),
+            "rows_per_s": round(rows_per_s, 1),
+        }
+    )
+    _clear_live_line()
+    print(
+        f"  📥 {_scenario}.{table.lower()} {rows:,}행 | 생성 {generate_seconds:.2f}s"
+        f" · 전송 {load_seconds:.2f}s | {rows_per_s:,.0f} rows/s"
+    )
+
+
+def install():
+    """mcp_loader 에 테이블 계측 콜백 등록"""
+    mcp_loader.set_observer(_on_table, _on_progress if _live_enabled() else None)
+
+
+install()
+
+
+class PhaseTimer:
+    """시나리오 하나의 단계별 소요 시간 기록"""
+
+    def __init__(self, name):
+        global _scenario
+        _scenario = name
+        self.name = name
+        self.phases = {}
+        self._first_event = len(_events)
+
+    @contextmanager
+    def phase(self, key):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.phases[key] = self.phases.get(key, 0.0) + elapsed
+            _emit({"kind": "phase", "phase": key, "seconds": round(elapsed, 4)})
+
+    def report(self):
+        tables = [e for e in _events[self._first_event :] if e["kind"] == "table"]
+        generate = sum(e["generate_seconds"] for e in tables)
+        load = sum(e["load_seconds"] for e in tables)
+        rows = sum(e["rows"] for e in tables)
+        parts = []
+        for key, elapsed in self.phases.items():
+            part = f"{PHASE_LABELS.get(key, key)} {elapsed:.2f}s"
+            if key == "load" and tables:
+                part += f" (생성 {generate:.2f}s + 전송 {load:.2f}s)"
+            parts.append(part)
+        _emit(
+            {
+                "kind": "scenario",
+                "rows": rows,
+                "seconds": round(sum(self.phases.values()), 4),
+                "generate_seconds": round(generate, 4),
+                "load_seconds": round(load, 4),
+                "phases": {key: round(v, 4) for key, v in self.phases.items()},
+            }
+        )
+        print(f"⏱️ {self.name} 단계별 소요 시간: {' | '.join(parts)}")
+
+
+def _prom_labels(**labels):
+    return ",".join(f'{k}="{str(v)}"' for k, v in labels.items())
+
+
+def write_prometheus(path, events, results=()):
+    """이벤트와 시나리오 결과를 Prometheus textfile 포맷으로 원자적으로 기록
+
+    results: (이름, 성공 여부, 소요 시간, ...) 튜플 목록
+    """
+    metrics = {
+        "mcp_phase_duration_seconds": ("gauge", "시나리오 단계별 소요 시간", {}),
+        "mcp_table_rows": ("gauge", "테이블별 적재 행 수", {}),
+        "mcp_table_generate_seconds": ("gauge", "테이블별 클라이언트 생성 시간", {}),
+        "mcp_table_load_seconds": ("gauge", "테이블별 서버 전송 시간", {}),
+        "mcp_table_rows_per_second": ("gauge", "테이블별 초당 적재 행 수", {}),
+        "mcp_scenario_duration_seconds": ("gauge", "시나리오 전체 소요 시간", {}),
+        "mcp_scenario_success": ("gauge", "시나리오 성공 여부 (1=성공)", {}),
+    }
+
+    # 같은 레이블 조합이 두 번 나오면 textfile collector 가 파일 전체를 거부하므로 합산한다
+    def add(name, labels, value):
+        samples = metrics[name][2]
+        samples[labels] = samples.get(labels, 0) + value
+
+    table_seconds = {}
+    for e in events:
+        if e["kind"] == "phase":
+            labels = _prom_labels(scenario=e["scenario"], phase=e["phase"])
+            add("mcp_phase_duration_seconds", labels, e["seconds"])
+        elif e["kind"] == "table":
+            labels = _prom_labels(scenario=e["scenario"], table=e["table"])
+            add("mcp_table_rows", labels, e["rows"])
+            add("mcp_table_generate_seconds", labels, e["generate_seconds"])
+            add("mcp_table_load_seconds", labels, e["load_seconds"])
+            table_seconds[labels] = table_seconds.get(labels, 0) + e["seconds"]
+    for labels, seconds in table_seconds.items():
+        rows = metrics["mcp_table_rows"][2][labels]
+        metrics["mcp_table_rows_per_second"][2][labels] = round(rows / seconds, 1) if seconds else 0.0
+    for name, ok, elapsed, *_ in results:
+        labels = _prom_labels(scenario=name)
+        add("mcp_scenario_duration_seconds", labels, elapsed)
+        success = metrics["mcp_scenario_success"][2]
+        success[labels] = min(success.get(labels, 1), int(ok))
+
+    lines = []
+    for name, (kind, help_text, samples) in metrics.items():
+        if not samples:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(
+            f"{name}{{{labels}}} {round(value, 4)}" for labels, value in samples.items()
+        )
+    lines.append("# HELP mcp_last_run_timestamp_seconds 마지막 실행 종료 시각")
+    lines.append("# TYPE mcp_last_run_timestamp_seconds gauge")
+    lines.append(f"mcp_last_run_timestamp_seconds {time.time():.0f}")
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    # textfile collector 가 반쯤 쓴 파일을 읽지 않도록 원자적으로 교체
+    os.replace(tmp_path, path)
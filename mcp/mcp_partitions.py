@@ -0,0 +1,471 @@
+"""파티션 테이블 구성과 파티션 병렬 적재 (MCP5_PARTITIONED=1)
+
+mcp5 의 Attendance 를 학기(LIST) → 출석 날짜 월(RANGE) 2단계로, Grades 를 학기(LIST)로 나눈다.
+학생들이 날짜 범위·학기로 조회하면 해당 파티션만 읽는다 (partition pruning).
+
+    attendance
+    ├── attendance_2025_1            FOR VALUES IN ('2025-1')  PARTITION BY RANGE (attendance_date)
+    │   ├── attendance_2025_1_202506 FOR VALUES FROM ('2025-06-01') TO ('2025-07-01')
+    │   ├── ...
+    │   └── attendance_2025_1_default
+    ├── attendance_2024_1            FOR VALUES IN ('2024-1')
+    └── attendance_default
+
+빈 파티션은 스키마 생성 시 모두 만들어 두므로 INSERT·캐시 재생·비동기 백엔드·증분 적재는
+서버가 그대로 파티션으로 분배한다. 동기 COPY 경로에서는 PartitionedLoad 가
+1. COPY 텍스트를 클라이언트에서 파티션별로 나눠 워커 연결(PARTITION_WORKERS)의 적재용 테이블로 동시에 COPY 하고
+2. 워커가 각자 기본키·인덱스·파티션 범위 CHECK 를 만든 뒤 커밋하면
+3. 시나리오 트랜잭션에서 빈 파티션을 적재용 테이블로 바꿔 끼운다 (ATTACH PARTITION).
+인덱스와 CHECK 가 미리 있으므로 ATTACH 는 인덱스를 다시 만들거나 범위를 검사하지 않고,
+시나리오 전체는 여전히 한 트랜잭션으로 커밋·롤백된다.
+"""
+
+import io
+import os
+import queue
+import threading
+from datetime import date
+
+from psycopg2 import sql
+
+from mcp_connections import connect
+from mcp_loader import reserve_ids, set_copy_handler
+
+# 파티션 설정 (환경변수에서 로드)
+MCP5_PARTITIONED = os.getenv("MCP5_PARTITIONED", "0") == "1"
+PARTITION_WORKERS = int(os.getenv("PARTITION_WORKERS", 4))  # 파티션을 동시에 적재하는 연결 수
+PARTITION_FLUSH_BYTES = int(os.getenv("PARTITION_FLUSH_BYTES", 1 << 20))  # 파티션별로 모았다가 보내는 크기
+PARTITION_QUEUE_CHUNKS = int(os.getenv("PARTITION_QUEUE_CHUNKS", 8))  # 워커마다 대기시킬 최대 조각 수
+
+
+def _slug(value):
+    return "".join(c if c.isalnum() else "_" for c in str(value)).lower()
+
+
+def _next_month(month):
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _months(start, end):
+    """start 가 속한 달부터 end 가 속한 달까지 각 달의 1일"""
+    month = date(start.year, start.month, 1)
+    while month <= end:
+        yield month
+        month = _next_month(month)
+
+
+class Leaf:
+    """데이터가 실제로 저장되는 말단 파티션"""
+
+    def __init__(self, name, parent, bound, check=None):
+        self.name = name
+        self.parent = parent
+        self.bound = bound  # FOR VALUES ... 또는 DEFAULT
+        self.check = check  # 파티션 범위와 같은 CHECK (ATTACH 시 범위 검사 생략용)
+
+    @property
+    def stage(self):
+        return f"{self.name}_load"
+
+
+class PartitionLayout:
+    """테이블 하나의 파티션 구성: list_column 값마다 파티션, ranged 에 있는 값은 range_column 월별로 한 번 더
+
+    ranged: {list 값: (시작일, 종료일)} — 이 구간의 달마다 말단 파티션을 만든다
+    indexes: 부모에 만들 보조 인덱스 열 (파티션마다 같은 인덱스가 생긴다)
+    """
+
+    def __init__(self, table, list_column, values, range_column=None, ranged=None, indexes=()):
+        self.table = table.lower()
+        self.list_column = list_column
+        self.values = list(values)
+        self.range_column = range_column
+        self.ranged = ranged or {}
+        self.indexes = list(indexes)
+        self._months = {}  # list 값 → {"YYYY-MM": Leaf}
+        self._defaults = {}  # list 값 → Leaf (값별 파티션 또는 월 범위 밖 DEFAULT)
+        self.leaves = []
+        for value in self.values:
+            part = f"{self.table}_{_slug(value)}"
+            bound = sql.SQL("FOR VALUES IN ({})").format(sql.Literal(value))
+            if value not in self.ranged:
+                leaf = Leaf(part, self.table, bound, self._equals(value))
+                self._defaults[value] = leaf
+                self.leaves.append(leaf)
+                continue
+            start, end = self.ranged[value]
+            months = {}
+            for month in _months(start, end):
+                upper = _next_month(month)
+                leaf = Leaf(
+                    f"{part}_{month:%Y%m}",
+                    part,
+                    sql.SQL("FOR VALUES FROM ({}) TO ({})").format(
+                        sql.Literal(month), sql.Literal(upper)
+                    ),
+                    sql.SQL("{} AND {} >= {} AND {} < {}").format(
+                        self._equals(value),
+                        sql.Identifier(range_column),
+                        sql.Literal(month),
+                        sql.Identifier(range_column),
+                        sql.Literal(upper),
+                    ),
+                )
+                months[f"{month:%Y-%m}"] = leaf
+                self.leaves.append(leaf)
+            self._months[value] = months
+            self._defaults[value] = Leaf(f"{part}_default", part, sql.SQL("DEFAULT"))
+            self.leaves.append(self._defaults[value])
+        self.default = Leaf(f"{self.table}_default", self.table, sql.SQL("DEFAULT"))
+        self.leaves.append(self.default)
+
+    def _equals(self, value):
+        return sql.SQL("{} = {}").format(sql.Identifier(self.list_column), sql.Literal(value))
+
+    def ddl(self):
+        """학기·월 파티션과 부모 보조 인덱스 DDL (CREATE TABLE 로 부모를 만든 뒤 실행)"""
+        statements = []
+        for value in self.values:
+            if value in self.ranged:
+                statements.append(
+                    sql.SQL("CREATE TABLE IF NOT EXISTS {} PARTITION OF {} {} PARTITION BY RANGE ({})").format(
+                        sql.Identifier(f"{self.table}_{_slug(value)}"),
+                        sql.Identifier(self.table),
+                        sql.SQL("FOR VALUES IN ({})").format(sql.Literal(value)),
+                        sql.Identifier(self.range_column),
+                    )
+                )
+        for leaf in self.leaves:
+            statements.append(
+                sql.SQL("CREATE TABLE IF NOT EXISTS {} PARTITION OF {} {}").format(
+                    sql.Identifier(leaf.name), sql.Identifier(leaf.parent), leaf.bound
+                )
+            )
+        for column in self.indexes:
+            statements.append(
+                sql.SQL("CREATE INDEX IF NOT EXISTS {} ON {} ({})").format(
+                    sql.Identifier(f"{self.table}_{column}_idx"),
+                    sql.Identifier(self.table),
+                    sql.Identifier(column),
+                )
+            )
+        return statements
+
+    def router(self, columns):
+        """COPY 텍스트 한 줄 → 말단 파티션 함수 (columns 는 이번 COPY 의 열 순서)"""
+        columns = [c.lower() for c in columns]
+        list_at = columns.index(self.list_column)
+        range_at = columns.index(self.range_column) if self.range_column else None
+
+        def route(fields):
+            value = fields[list_at]
+            if value not in self._defaults:
+                return self.default
+            months = self._months.get(value)
+            if months is None:
+                return self._defaults[value]
+            # DATE 는 COPY 텍스트에서 YYYY-MM-DD 이므로 앞 7자가 월
+            return months.get(fields[range_at][:7], self._defaults[value])
+
+        return route
+
+
+def create_partitions(cur, layouts):
+    for layout in layouts:
+        for statement in layout.ddl():
+            cur.execute(statement)
+
+
+class _Worker(threading.Thread):
+    """연결 하나로 맡은 파티션의 적재용 테이블에 COPY 하고, 끝나면 인덱스·CHECK 를 만들어 커밋"""
+
+    def __init__(self, dbname, plans):
+        super().__init__(daemon=True)
+        self.dbname = dbname
+        self.plans = plans  # 테이블 → (열 정의, 기본키 열)
+        self.queue = queue.Queue(maxsize=PARTITION_QUEUE_CHUNKS)
+        self.leaves = {}  # Leaf → PartitionLayout
+        self.error = None
+
+    def run(self):
+        conn = None
+        stopped = False
+        try:
+            conn = connect(self.dbname)
+            with conn.cursor() as cur:
+                while True:
+                    item = self.queue.get()
+                    if item is None:
+                        stopped = True
+                        break
+                    self._copy(cur, *item)
+                for leaf, layout in self.leaves.items():
+                    self._finish(cur, leaf, layout)
+            conn.commit()
+        except Exception as e:
+            self.error = e
+            # 생산자가 멈추지 않도록 종료 신호가 올 때까지 남은 조각은 버린다
+            while not stopped:
+                stopped = self.queue.get() is None
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _copy(self, cur, layout, leaf, columns, text):
+        if leaf not in self.leaves:
+            self.leaves[leaf] = layout
+            cur.execute(
+                sql.SQL("DROP TABLE IF EXISTS {}; CREATE TABLE {} ({})").format(
+                    sql.Identifier(leaf.stage),
+                    sql.Identifier(leaf.stage),
+                    self.plans[layout.table][0],
+                )
+            )
+        cur.copy_expert(
+            sql.SQL("COPY {} ({}) FROM STDIN")
+            .format(
+                sql.Identifier(leaf.stage),
+                sql.SQL(", ").join(map(sql.Identifier, columns)),
+            )
+            .as_string(cur),
+            io.StringIO(text),
+            size=65536,
+        )
+
+    def _finish(self, cur, leaf, layout):
+        """파티션 하나의 기본키·보조 인덱스·범위 CHECK 생성 (부모와 같은 정의 → ATTACH 때 그대로 재사용)"""
+        stage = sql.Identifier(leaf.stage)
+        primary_key = self.plans[layout.table][1]
+        if primary_key:
+            cur.execute(
+                sql.SQL("ALTER TABLE {} ADD CONSTRAINT {} PRIMARY KEY ({})").format(
+                    stage,
+                    sql.Identifier(f"{leaf.stage}_pkey"),
+                    sql.SQL(", ").join(map(sql.Identifier, primary_key)),
+                )
+            )
+        for column in layout.indexes:
+            cur.execute(
+                sql.SQL("CREATE INDEX {} ON {} ({})").format(
+                    sql.Identifier(f"{leaf.stage}_{column}_idx"), stage, sql.Identifier(column)
+                )
+            )
+        if leaf.check is not None:
+            cur.execute(
+                sql.SQL("ALTER TABLE {} ADD CONSTRAINT {} CHECK ({})").format(
+                    stage, sql.Identifier(f"{leaf.stage}_bound"), leaf.check
+                )
+            )
+
+
+class PartitionedLoad:
+    """with 블록 동안 파티션 테이블로 가는 COPY 를 가로채 파티션별로 병렬 적재
+
+    with 블록이 끝나면 워커를 기다린 뒤 시나리오 트랜잭션(cur)에서 빈 파티션을 적재용 테이블로 교체한다.
+    워커 연결은 스키마를 볼 수 있어야 하므로 테이블 생성(DDL)을 먼저 커밋해 두어야 한다.
+    """
+
+    def __init__(self, cur, layouts, specs, workers=PARTITION_WORKERS):
+        self.cur = cur
+        self.layouts = {layout.table: layout for layout in layouts}
+        self.specs = {spec.name: spec for spec in specs}
+        self.workers = []
+        self._worker_count = max(1, workers)
+        self._assigned = {}  # Leaf → _Worker
+        self._stopped = False
+        self._serial = {}  # 테이블 → SERIAL 열
+        self.rows = {}  # Leaf 이름 → 행 수
+
+    def _plans(self):
+        """테이블별 (적재용 테이블 열 정의, 기본키 열) — 시나리오 트랜잭션에서 카탈로그를 읽어 만든다
+
+        SERIAL 열도 함께 찾아 둔다 (워커마다 nextval 을 부르면 시드 실행에서도 키 순서가 달라지므로
+        키는 라우팅할 때 시나리오 트랜잭션에서 예약해 넣는다).
+        """
+        plans = {}
+        for table in self.layouts:
+            self.cur.execute(
+                """
+                SELECT a.attname, format_type(a.atttypid, a.atttypmod), a.attnotnull,
+                       pg_get_expr(d.adbin, d.adrelid)
+                FROM pg_attribute a
+                LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+                WHERE a.attrelid = %s::regclass AND a.attnum > 0 AND NOT a.attisdropped
+                ORDER BY a.attnum
+                """,
+                (table,),
+            )
+            columns = []
+            for name, type_name, not_null, default in self.cur.fetchall():
+                column = sql.SQL("{} {}").format(sql.Identifier(name), sql.SQL(type_name))
+                if default is not None:
+                    column += sql.SQL(" DEFAULT {}").format(sql.SQL(default))
+                    if default.startswith("nextval("):
+                        self._serial[table] = name
+                if not_null:
+                    column += sql.SQL(" NOT NULL")
+                columns.append(column)
+            spec = self.specs.get(table)
+            primary_key = (
+                [c.strip() for c in spec.primary_key.split(",")]
+                if spec is not None and spec.primary_key
+                else []
+            )
+            plans[table] = (sql.SQL(", ").join(columns), primary_key)
+        return plans
+
+    def __enter__(self):
+        plans = self._plans()
+        dbname = self.cur.connection.info.dbname
+        for _ in range(self._worker_count):
+            worker = _Worker(dbname, plans)
+            worker.start()
+            self.workers.append(worker)
+        for table in self.layouts:
+            set_copy_handler(table, self)
+        return self
+
+    def _send(self, layout, leaf, columns, text):
+        worker = self._assigned.get(leaf)
+        if worker is None:
+            worker = self.workers[len(self._assigned) % len(self.workers)]
+            self._assigned[leaf] = worker
+        if worker.error is not None:
+            raise worker.error
+        worker.queue.put((layout, leaf, columns, text))
+
+    def __call__(self, table, columns, stream):
+        """copy_stream 대신 호출: COPY 텍스트를 줄 단위로 파티션에 나눠 워커로 보낸다"""
+        layout = self.layouts[table.lower()]
+        route = layout.router(columns)
+        columns = [c.lower() for c in columns]
+        serial = self._serial.get(layout.table)
+        if serial in columns:
+            serial = None  # 키를 직접 넣는 COPY
+        buffers = {}
+        sizes = {}
+        rest = ""
+        while True:
+            chunk = stream.read(65536)
+            if not chunk:
+                break
+            lines = (rest + chunk).split("\n")
+            rest = lines.pop()
+            for line in lines:
+                leaf = route(line.split("\t"))
+                buffers.setdefault(leaf, []).append(line)
+                sizes[leaf] = sizes.get(leaf, 0) + len(line) + 1
+                if sizes[leaf] >= PARTITION_FLUSH_BYTES:
+                    self._flush(layout, leaf, columns, serial, buffers, sizes)
+        if rest:
+            leaf = route(rest.split("\t"))
+            buffers.setdefault(leaf, []).append(rest)
+        for leaf in list(buffers):
+            self._flush(layout, leaf, columns, serial, buffers, sizes)
+
+    def _flush(self, layout, leaf, columns, serial, buffers, sizes):
+        lines = buffers.pop(leaf)
+        sizes[leaf] = 0
+        self.rows[leaf.name] = self.rows.get(leaf.name, 0) + len(lines)
+        if serial:
+            ids = reserve_ids(self.cur, layout.table, serial, len(lines)).ids
+            lines = [f"{key}\t{line}" for key, line in zip(ids, lines)]
+            columns = [serial] + columns
+        self._send(layout, leaf, columns, "\n".join(lines) + "\n")
+
+    def _stop_workers(self):
+        if self._stopped:
+            return
+        self._stopped = True
+        for table in self.layouts:
+            set_copy_handler(table, None)
+        for worker in self.workers:
+            worker.queue.put(None)
+        for worker in self.workers:
+            worker.join()
+
+    def wait_loads(self):
+        """워커를 모두 기다린 뒤 파티션을 연결 (mcp_loader.wait_loads 에서도 호출)
+
+        캐시 재생처럼 적재 직후 시퀀스를 맞추는 경우, 연결 전에는 시나리오 트랜잭션에서
+        파티션 행이 보이지 않으므로 먼저 연결해야 한다. 이후 COPY 는 서버가 파티션으로 분배한다.
+        """
+        if self._stopped:
+            return
+        self._stop_workers()
+        for worker in self.workers:
+            if worker.error is not None:
+                raise worker.error
+        self.attach()
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.wait_loads()
+                return False
+        except Exception:
+            self._drop_stages()
+            raise
+        self._stop_workers()
+        self._drop_stages()
+        return False
+
+    def attach(self):
+        """빈 파티션을 버리고 적재용 테이블을 같은 범위로 붙인 뒤 이름을 바꾼다"""
+        cur = self.cur
+        for leaf in self._assigned:
+            stage = sql.Identifier(leaf.stage)
+            cur.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(leaf.name)))
+            cur.execute(
+                sql.SQL("ALTER TABLE {} ATTACH PARTITION {} {}").format(
+                    sql.Identifier(leaf.parent), stage, leaf.bound
+                )
+            )
+            if leaf.check is not None:
+                cur.execute(
+                    sql.SQL("ALTER TABLE {} DROP CONSTRAINT {}").format(
+                        stage, sql.Identifier(f"{leaf.stage}_bound")
+                    )
+                )
+            cur.execute(
+                sql.SQL("ALTER TABLE {} RENAME TO {}").format(stage, sql.Identifier(leaf.name))
+            )
+            cur.execute(
+                "SELECT indexrelid::regclass::text FROM pg_index WHERE indrelid = %s::regclass",
+                (leaf.name,),
+            )
+            for (index,) in cur.fetchall():
+                if index.startswith(leaf.stage):
+                    cur.execute(
+                        sql.SQL("ALTER INDEX {} RENAME TO {}").format(
+                            sql.Identifier(index),
+                            sql.Identifier(leaf.name + index[len(leaf.stage) :]),
+                        )
+                    )
+        print(
+            f"  🧩 파티션 {len(self._assigned)}개 병렬 적재 후 연결 ({len(self.workers)}개 연결, "
+            f"{sum(self.rows.values()):,}행)"
+        )
+
+    def _drop_stages(self):
+        drop_stages(self.cur, list(self._assigned))
+
+
+def drop_stages(cur, leaves):
+    """실패 시 워커가 커밋한 적재용 테이블 정리 (시나리오 트랜잭션을 먼저 롤백해 잠금을 푼다)
+
+    ATTACH·이름 변경은 시나리오 트랜잭션에서 일어나므로, with 블록이 끝난 뒤 시나리오가
+    실패해도(제약조건 생성, 커밋 등) 롤백되면 커밋된 적재용 테이블이 다시 남는다.
+    """
+    if not leaves:
+        return
+    cur.connection.rollback()
+    conn = connect(cur.connection.info.dbname, autocommit=True)
+    try:
+        with conn.cursor() as drop_cur:
+            for leaf in leaves:
+                drop_cur.execute(
+                    sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(leaf.stage))
+                )
+    finally:
+        conn.close()
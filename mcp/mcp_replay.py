@@ -0,0 +1,412 @@
+"""MCP 쿼리 워크로드 동시 재생 부하 테스트
+
+수업 중에는 학생 수십 명의 Claude Desktop MCP PostgreSQL 서버가 같은 mcpN 데이터베이스에 동시에 쿼리를 보낸다.
+이 도구는 가상 클라이언트 N개(스레드)를 띄워 시나리오 분석 쿼리(mcp_workload.WORKLOADS)와 MCP 서버의
+스키마 조회 쿼리를 가중치대로 섞어 DATABASE_LIST 데이터베이스에 반복 실행하고 다음을 보고한다.
+- 쿼리별·전체 지연 시간 p50/p95/p99/최대, 처리량(req/s), 오류 수
+- 연결 사용량: pg_stat_activity 표본의 총 연결·실행 중 연결 최대/평균, max_connections, 풀 대기 시간
+
+MCP 서버처럼 쿼리마다 읽기 전용 트랜잭션(BEGIN READ ONLY … ROLLBACK)으로 실행한다.
+기본은 클라이언트마다 데이터베이스별 연결을 하나씩 계속 쥐고 있는 방식(학생마다 MCP 서버 프로세스)이고,
+--pool M 을 주면 데이터베이스별 최대 M 개 연결을 모든 클라이언트가 나눠 쓴다(pgbouncer 등 앞단 풀).
+
+사용법:
+    python3 mcp_replay.py --clients 40 --duration 60
+    python3 mcp_replay.py --clients 40 --pool 10 --mix long_absence=5,schema=2 --output before.json
+    python3 mcp_workload.py apply && python3 mcp_replay.py --clients 40 --output after.json   # 인덱스 효과 비교
+    python3 mcp_replay.py --databases mcp5_s001,mcp5_s002 --clients 20   # fan-out 복제본 대상
+"""
+
+import argparse
+import json
+import math
+import os
+import queue
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+import psycopg2
+
+from mcp_connections import connect
+from mcp_workload import WORKLOADS, Query
+
+# 부하 재생 설정 (환경변수에서 로드)
+REPLAY_CLIENTS = int(os.getenv("REPLAY_CLIENTS", 20))  # 동시 가상 클라이언트 수
+REPLAY_DURATION = float(os.getenv("REPLAY_DURATION", 30))  # 측정 시간(초)
+REPLAY_WARMUP = float(os.getenv("REPLAY_WARMUP", 2))  # 결과에서 제외할 시작 구간(초)
+REPLAY_THINK_MS = float(os.getenv("REPLAY_THINK_MS", 200))  # 쿼리 사이 평균 대기(지수 분포, 0 이면 쉬지 않음)
+REPLAY_POOL = int(os.getenv("REPLAY_POOL", 0))  # 데이터베이스별 공유 연결 수 (0 이면 클라이언트별 전용 연결)
+REPLAY_TIMEOUT_MS = int(os.getenv("REPLAY_TIMEOUT_MS", 30000))  # statement_timeout
+REPLAY_SAMPLE_INTERVAL = float(os.getenv("REPLAY_SAMPLE_INTERVAL", 0.5))  # 연결 사용량 표본 간격(초)
+
+# 대상 데이터베이스 목록 (환경변수에서 로드)
+database_list = os.getenv("DATABASE_LIST", "mcp1,mcp2,mcp3,mcp4,mcp5")
+databases = [db.strip() for db in database_list.split(",")]
+
+# MCP 서버가 리소스(테이블 스키마)를 나열할 때 보내는 쿼리
+SCHEMA_QUERY = Query(
+    "schema",
+    "테이블·열 목록 (MCP 리소스 조회)",
+    """
+    SELECT c.table_name, c.column_name, c.data_type
+    FROM information_schema.tables t
+    JOIN information_schema.columns c
+      ON c.table_schema = t.table_schema AND c.table_name = t.table_name
+    WHERE t.table_schema = 'public'
+    """,
+)
+
+
+def scenario_of(dbname):
+    """데이터베이스 이름의 시나리오 (fan-out 복제본 mcp5_s001 → mcp5)"""
+    scenario = dbname.split("_")[0]
+    if scenario not in WORKLOADS:
+        raise ValueError(f"워크로드가 없는 데이터베이스입니다: {dbname}")
+    return scenario
+
+
+def parse_mix(text):
+    """'long_absence=5,schema=2' → {쿼리 이름: 가중치} (지정하지 않은 쿼리는 1)"""
+    weights = {}
+    for item in filter(None, (part.strip() for part in (text or "").split(","))):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def build_mix(names, weights):
+    """(데이터베이스, 쿼리) 목록과 가중치 — 각 데이터베이스의 워크로드 쿼리 + 스키마 조회"""
+    known = {SCHEMA_QUERY.name} | {
+        query.name for workload in WORKLOADS.values() for query in workload["queries"]
+    }
+    unknown = set(weights) - known
+    if unknown:
+        raise ValueError(f"알 수 없는 쿼리: {', '.join(sorted(unknown))}")
+    entries = []
+    for db in names:
+        for query in [*WORKLOADS[scenario_of(db)]["queries"], SCHEMA_QUERY]:
+            weight = weights.get(query.name, 1)
+            if weight > 0:
+                entries.append((db, query, weight))
+    if not entries:
+        raise ValueError("실행할 쿼리가 없습니다 (가중치를 확인하세요)")
+    return entries
+
+
+def percentile(sorted_values, p):
+    """정렬된 값의 p 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _open(dbname):
+    conn = connect(dbname)
+    # MCP 서버처럼 쿼리마다 읽기 전용 트랜잭션
+    conn.set_session(readonly=True)
+    with conn.cursor() as cur:
+        cur.execute("SET statement_timeout = %s", (REPLAY_TIMEOUT_MS,))
+    conn.commit()
+    return conn
+
+
+class PrivateConnections:
+    """클라이언트마다 데이터베이스별 전용 연결 (학생마다 MCP 서버 프로세스가 연결을 쥐고 있는 경우)"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all = []
+
+    def acquire(self, db):
+        conns = self._local.__dict__.setdefault("conns", {})
+        conn = conns.get(db)
+        if conn is None or conn.closed:
+            conn = conns[db] = _open(db)
+            with self._lock:
+                self._all.append(conn)
+        return conn
+
+    def release(self, db, conn):
+        pass
+
+    def close(self):
+        for conn in self._all:
+            conn.close()
+
+
+class SharedPool:
+    """데이터베이스별 최대 size 개 연결을 모든 클라이언트가 나눠 쓰는 풀 (빈 연결이 없으면 기다린다)"""
+
+    def __init__(self, size):
+        self.size = size
+        self._lock = threading.Lock()
+        self._idle = {}  # db → queue.Queue
+        self._opened = Counter()
+        self._all = []
+
+    def acquire(self, db):
+        while True:
+            with self._lock:
+                idle = self._idle.setdefault(db, queue.Queue())
+                grow = idle.empty() and self._opened[db] < self.size
+                if grow:
+                    self._opened[db] += 1
+            if grow:
+                try:
+                    conn = _open(db)
+                except psycopg2.Error:
+                    self.release(db, None)
+                    raise
+                with self._lock:
+                    self._all.append(conn)
+                return conn
+            conn = idle.get()
+            if conn is not None:
+                return conn
+            # None 은 연결 자리가 비었다는 신호이므로 다시 확인해 새 연결을 연다
+
+    def release(self, db, conn):
+        if conn is None or conn.closed:
+            # 끊어진 연결은 버리고, 기다리는 클라이언트를 깨워 새 연결을 열게 한다
+            with self._lock:
+                self._opened[db] -= 1
+            self._idle[db].put(None)
+            return
+        self._idle[db].put(conn)
+
+    def close(self):
+        for conn in self._all:
+            conn.close()
+
+
+class ConnectionSampler(threading.Thread):
+    """REPLAY_SAMPLE_INTERVAL 마다 대상 데이터베이스의 연결 수를 pg_stat_activity 에서 표본 추출"""
+
+    def __init__(self, names):
+        super().__init__(daemon=True)
+        self.names = names
+        self.samples = []  # (총 연결, 실행 중 연결)
+        self.max_connections = None
+        self._done = threading.Event()
+
+    def run(self):
+        conn = connect("postgres", autocommit=True)
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SHOW max_connections")
+                self.max_connections = int(cur.fetchone()[0])
+                while not self._done.wait(REPLAY_SAMPLE_INTERVAL):
+                    cur.execute(
+                        """
+                        SELECT count(*), count(*) FILTER (WHERE state = 'active')
+                        FROM pg_stat_activity WHERE datname = ANY(%s)
+                        """,
+                        (self.names,),
+                    )
+                    self.samples.append(cur.fetchone())
+        finally:
+            conn.close()
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+    def summary(self):
+        totals = [total for total, _ in self.samples] or [0]
+        active = [running for _, running in self.samples] or [0]
+        return {
+            "max_connections": self.max_connections,
+            "peak": max(totals),
+            "mean": round(sum(totals) / len(totals), 1),
+            "peak_active": max(active),
+            "mean_active": round(sum(active) / len(active), 1),
+            "samples": len(self.samples),
+        }
+
+
+def _client(mix, connections, deadline, measure_from, think_ms, records):
+    """가상 클라이언트 하나: deadline 까지 가중치대로 쿼리를 골라 실행하고 records 에 기록"""
+    population = [(db, query) for db, query, _ in mix]
+    weights = [weight for *_, weight in mix]
+    rng = random.Random()
+    while time.monotonic() < deadline:
+        db, query = rng.choices(population, weights)[0]
+        started = acquired = time.monotonic()
+        error = None
+        conn = None
+        try:
+            conn = connections.acquire(db)
+            acquired = time.monotonic()
+            with conn.cursor() as cur:
+                cur.execute(query.text)
+                cur.fetchall()
+            conn.rollback()
+        except psycopg2.Error as e:
+            error = type(e).__name__
+            if conn is not None and not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    conn.close()
+        finally:
+            if conn is not None:
+                connections.release(db, conn)
+        finished = time.monotonic()
+        if started >= measure_from:
+            records.append((f"{db}.{query.name}", finished - started, acquired - started, error))
+        if think_ms > 0:
+            time.sleep(rng.expovariate(1000 / think_ms))
+
+
+def _latency_stats(latencies):
+    ordered = sorted(latencies)
+    stats = {"count": len(ordered)}
+    for p in (50, 95, 99):
+        stats[f"p{p}_ms"] = round(percentile(ordered, p) * 1000, 2)
+    stats["max_ms"] = round(ordered[-1] * 1000, 2) if ordered else 0.0
+    return stats
+
+
+def replay(
+    names,
+    clients=REPLAY_CLIENTS,
+    duration=REPLAY_DURATION,
+    warmup=REPLAY_WARMUP,
+    think_ms=REPLAY_THINK_MS,
+    pool=REPLAY_POOL,
+    weights=None,
+):
+    """부하를 재생하고 결과 dict 를 반환"""
+    mix = build_mix(names, weights or {})
+    connections = SharedPool(pool) if pool > 0 else PrivateConnections()
+    sampler = ConnectionSampler(names)
+    sampler.start()
+
+    start = time.monotonic()
+    measure_from = start + warmup
+    deadline = measure_from + duration
+    records = [[] for _ in range(clients)]  # 클라이언트마다 따로 모아 잠금 없이 기록
+    threads = [
+        threading.Thread(
+            target=_client,
+            args=(mix, connections, deadline, measure_from, think_ms, records[i]),
+            daemon=True,
+        )
+        for i in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - measure_from
+    sampler.stop()
+    connections.close()
+
+    merged = [record for client_records in records for record in client_records]
+    by_query = {}
+    for key, latency, _, error in merged:
+        entry = by_query.setdefault(key, {"latencies": [], "errors": Counter()})
+        entry["latencies"].append(latency)
+        if error:
+            entry["errors"][error] += 1
+    queries = {
+        key: {**_latency_stats(entry["latencies"]), "errors": dict(entry["errors"])}
+        for key, entry in sorted(by_query.items())
+    }
+    errors = sum(1 for *_, error in merged if error)
+    return {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "settings": {
+            "databases": names,
+            "clients": clients,
+            "duration_s": duration,
+            "warmup_s": warmup,
+            "think_ms": think_ms,
+            "pool": pool,
+            "weights": weights or {},
+        },
+        "requests": len(merged),
+        "errors": errors,
+        "throughput_rps": round(len(merged) / elapsed, 1) if elapsed > 0 else 0.0,
+        "latency": _latency_stats([latency for _, latency, _, _ in merged]),
+        "wait": _latency_stats([wait for _, _, wait, _ in merged]),
+        "queries": queries,
+        "connections": sampler.summary(),
+    }
+
+
+def print_report(result):
+    settings = result["settings"]
+    mode = f"공유 풀 {settings['pool']}개/DB" if settings["pool"] else "클라이언트별 전용 연결"
+    print(
+        f"📊 재생 결과: 클라이언트 {settings['clients']}개 ({mode}), {settings['duration_s']:g}s,"
+        f" 요청 {result['requests']}건 ({result['throughput_rps']} req/s), 오류 {result['errors']}건"
+    )
+    print(f"   {'쿼리':<34} {'건수':>4} {'p50':>9} {'p95':>9} {'p99':>9} {'최대':>7}")
+    rows = [*result["queries"].items(), ("전체", {**result["latency"], "errors": {}})]
+    for key, stats in rows:
+        errors = sum(stats["errors"].values())
+        print(
+            f"   {key:<36} {stats['count']:>6} {stats['p50_ms']:>7.2f}ms {stats['p95_ms']:>7.2f}ms"
+            f" {stats['p99_ms']:>7.2f}ms {stats['max_ms']:>7.2f}ms"
+            + (f"  ⚠️ 오류 {errors}건" if errors else "")
+        )
+    conns = result["connections"]
+    print(
+        f"🔌 연결: 최대 {conns['peak']}개 (실행 중 최대 {conns['peak_active']}개),"
+        f" 평균 {conns['mean']}개 (실행 중 {conns['mean_active']}개) / max_connections {conns['max_connections']}"
+    )
+    if settings["pool"]:
+        wait = result["wait"]
+        print(f"⏳ 풀 대기: p50 {wait['p50_ms']:.2f}ms, p95 {wait['p95_ms']:.2f}ms, p99 {wait['p99_ms']:.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MCP 쿼리 워크로드 동시 재생 부하 테스트")
+    parser.add_argument(
+        "--databases", default=",".join(databases), help="대상 데이터베이스 (기본값: DATABASE_LIST)"
+    )
+    parser.add_argument("--clients", type=int, default=REPLAY_CLIENTS, help="동시 가상 클라이언트 수")
+    parser.add_argument("--duration", type=float, default=REPLAY_DURATION, help="측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=REPLAY_WARMUP, help="결과에서 제외할 시작 구간(초)")
+    parser.add_argument(
+        "--think-ms", type=float, default=REPLAY_THINK_MS, help="쿼리 사이 평균 대기(ms, 0 이면 쉬지 않음)"
+    )
+    parser.add_argument(
+        "--pool", type=int, default=REPLAY_POOL, help="데이터베이스별 공유 연결 수 (0 이면 클라이언트별 전용 연결)"
+    )
+    parser.add_argument("--mix", help="쿼리 가중치 (예: long_absence=5,schema=2,user_feedback=0)")
+    parser.add_argument("--output", help="결과를 JSON 으로 저장할 경로")
+    args = parser.parse_args()
+
+    names = [db.strip() for db in args.databases.split(",") if db.strip()]
+    try:
+        weights = parse_mix(args.mix)
+        build_mix(names, weights)
+    except ValueError as e:
+        parser.error(str(e))
+    print(
+        f"🚦 {len(names)}개 데이터베이스에 클라이언트 {args.clients}개로"
+        f" {args.warmup:g}s 예열 후 {args.duration:g}s 동안 재생합니다."
+    )
+    result = replay(
+        names,
+        clients=args.clients,
+        duration=args.duration,
+        warmup=args.warmup,
+        think_ms=args.think_ms,
+        pool=args.pool,
+        weights=weights,
+    )
+    print_report(result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.output}")
+    if result["errors"]:
+        raise SystemExit(1)
@@ -0,0 +1,413 @@
+"""MCP 시나리오 선언형 명세 (GEN_BACKEND=numpy 에서 mcp_spec.compile_scenario 로 생성기를 만든다)
+
+테이블은 선언 순서대로 생성하므로 부모 테이블을 먼저 적는다. 스키마와 시나리오 특성
+(mcp5 고학점자 비율, 장기결석자, 성적 가중치 등)은 Python 백엔드(generate_mcpN)와 같다.
+"""
+
+import numpy as np
+
+import mcp_vectorized as vec
+from mcp_dates import DATE_UNITS
+from mcp_settings import (
+    NUM_ACTIVITIES,
+    NUM_CAMPAIGNS,
+    NUM_COURSES,
+    NUM_CUSTOMERS,
+    NUM_EMPLOYEES,
+    NUM_ENROLLMENTS,
+    NUM_EVENTS,
+    NUM_FEEDBACKS,
+    NUM_ORDERS,
+    NUM_PROFESSORS,
+    NUM_PROJECTS,
+    NUM_STUDENTS,
+    NUM_SUPPLY_REQUESTS,
+    NUM_TRANSACTIONS,
+    NUM_USERS,
+    TARGET_LONG_ABSENT,
+)
+from mcp_spec import (
+    Blocks,
+    Case,
+    Choice,
+    Concat,
+    Const,
+    DateRange,
+    Expr,
+    Fake,
+    ForeignKey,
+    IntRange,
+    Parent,
+    Per,
+    Pick,
+    Ref,
+    RowNumber,
+    Scenario,
+    Skew,
+    Slot,
+    Table,
+    Uniform,
+)
+
+# ---------------------------------------------------------------------------
+# mcp1 – 이커머스 & 마케팅 성과 분석
+# ---------------------------------------------------------------------------
+
+MCP1 = Scenario(
+    "mcp1",
+    [
+        Table(
+            "Customers",
+            rows=NUM_CUSTOMERS,
+            key="customer_id",
+            columns={
+                "name": Fake("name"),
+                "segment": Choice(["일반", "VIP", "기업"]),
+                "signup_date": DateRange("-2y", "today"),
+                "acquisition_channel": Choice(["SNS 광고", "검색엔진", "이메일"]),
+            },
+        ),
+        Table(
+            "Campaigns",
+            rows=NUM_CAMPAIGNS,
+            key="campaign_id",
+            columns={
+                "campaign_name": Concat("Campaign_", RowNumber()),
+                "start_date": DateRange("-3M", "-1M"),
+                "end_date": Expr(lambda c: c["start_date"] + 30),
+                "budget": IntRange(1000, 5000),
+            },
+        ),
+        # 캠페인별 최근 30일 성과 (노출 ≥ 클릭 ≥ 전환)
+        Table(
+            "Campaign_Performance",
+            per=Per("Campaigns", 30),
+            columns={
+                "campaign_id": Parent("campaign_id"),
+                "date": Expr(lambda c: vec.today() - 30 + c.slot),
+                "impressions": IntRange(1000, 10000),
+                "clicks": IntRange(100, Ref("impressions")),
+                "conversions": IntRange(0, Ref("clicks")),
+            },
+        ),
+        Table(
+            "Orders",
+            rows=NUM_ORDERS,
+            columns={
+                "customer_id": ForeignKey("Customers"),
+                "order_date": DateRange("-1y", "today"),
+                "amount": IntRange(10000, 300000),
+                "product_id": IntRange(1, 100),
+            },
+        ),
+    ],
+)
+
+# ---------------------------------------------------------------------------
+# mcp2 – 금융/결제 거래 분석
+# ---------------------------------------------------------------------------
+
+MCP2 = Scenario(
+    "mcp2",
+    [
+        Table(
+            "Users",
+            rows=NUM_USERS,
+            key="user_id",
+            columns={
+                "name": Fake("name"),
+                "join_date": DateRange("-2y", "today"),
+                "segment": Choice(["일반", "VIP", "기업"]),
+            },
+        ),
+        Table(
+            "Transactions",
+            rows=NUM_TRANSACTIONS,
+            key="transaction_id",
+            columns={
+                "user_id": ForeignKey("Users"),
+                "date": DateRange("-6M", "today"),
+                "type": Choice(["purchase", "refund", "reward"]),
+                # 환불은 음수 금액
+                "amount": Expr(
+                    lambda c: vec.randint(1000, 100000, c.n) * np.where(c["type"] == "refund", -1, 1)
+                ),
+            },
+        ),
+        # 거래 1건당 결제수단 1건
+        Table(
+            "PaymentMethods",
+            per=Per("Transactions"),
+            columns={
+                "transaction_id": Parent("transaction_id"),
+                "method": Choice(["카드", "계좌이체", "포인트"]),
+                "status": Choice(["성공", "실패"]),
+            },
+        ),
+    ],
+)
+
+# ---------------------------------------------------------------------------
+# mcp3 – 금융 IT 서비스 로그 & 사용자 피드백 분석
+# ---------------------------------------------------------------------------
+
+MCP3 = Scenario(
+    "mcp3",
+    [
+        Table(
+            "Users",
+            rows=NUM_USERS,
+            key="user_id",
+            columns={
+                "name": Fake("name"),
+                "signup_date": DateRange("-1y", "today"),
+                "acquisition_channel": Choice(["검색", "SNS", "광고", "지인추천"]),
+            },
+        ),
+        Table(
+            "UserActivity",
+            rows=NUM_ACTIVITIES,
+            columns={
+                "user_id": ForeignKey("Users"),
+                "activity_date": DateRange("-6M", "today"),
+                "activity_type": Choice(["로그인", "검색", "상품조회", "결제"]),
+            },
+        ),
+        Table(
+            "Feedback",
+            rows=NUM_FEEDBACKS,
+            columns={
+                "user_id": ForeignKey("Users"),
+                "date": DateRange("-3M", "today"),
+                "rating": IntRange(1, 5),
+                "sentiment": Choice(["positive", "neutral", "negative"]),
+                "category": Choice(["배송", "제품", "가격", "서비스"]),
+                "comments": Fake("sentence8"),
+            },
+        ),
+    ],
+)
+
+# ---------------------------------------------------------------------------
+# mcp4 – 공공 행정 & 문화-관광 사업 분석
+# ---------------------------------------------------------------------------
+
+MCP4 = Scenario(
+    "mcp4",
+    [
+        Table(
+            "Employees",
+            rows=NUM_EMPLOYEES,
+            key="emp_id",
+            columns={
+                "name": Fake("name"),
+                "grade": Choice(["9급", "8급", "7급", "6급", "5급", "4급"]),
+                "dept": Choice(
+                    ["문화정책과", "관광산업과", "스포츠진흥과", "국제협력담당관", "홍보담당관"]
+                ),
+                "join_date": DateRange("-10y", "today"),
+            },
+        ),
+        Table(
+            "Projects",
+            rows=NUM_PROJECTS,
+            key="proj_id",
+            columns={
+                "title": Concat("프로젝트_", RowNumber(width=2)),
+                "category": Choice(["문화", "관광", "스포츠"]),
+                "start_date": DateRange("-18M", "-6M"),
+                "end_date": Expr(lambda c: c["start_date"] + vec.randint(90, 365, c.n)),
+                "owner_emp": ForeignKey("Employees"),
+            },
+        ),
+        # 프로젝트별 분기 예산 요청
+        Table(
+            "BudgetRequests",
+            per=Per("Projects", 3),
+            columns={
+                "proj_id": Parent("proj_id"),
+                "quarter": Slot(["2024Q4", "2025Q1", "2025Q2"]),
+                "amount": IntRange(5_000_000, 200_000_000),
+                "status": Choice(["제출", "검토중", "승인", "반려"]),
+            },
+        ),
+        Table(
+            "Events",
+            rows=NUM_EVENTS,
+            columns={
+                "proj_id": ForeignKey("Projects"),
+                "event_name": Fake("sentence3"),
+                "event_date": DateRange("-6M", "today"),
+                "location": Choice(
+                    ["세종문화회관", "DDP", "광화문광장", "부산 벡스코", "인천 아시아드주경기장"]
+                ),
+                "attendance": IntRange(100, 10000),
+            },
+        ),
+        Table(
+            "SuppliesRequests",
+            rows=NUM_SUPPLY_REQUESTS,
+            columns={
+                "emp_id": ForeignKey("Employees"),
+                "request_date": DateRange("-3M", "today"),
+                "item": Choice(["A4용지", "볼펜", "현수막", "배너", "기념품", "행사간식"]),
+                "quantity": IntRange(1, 200),
+                "purpose": Choice(["회의", "행사", "홍보물", "민원 대응"]),
+                "approval_status": Choice(["대기", "승인", "반려"]),
+            },
+        ),
+    ],
+)
+
+# ---------------------------------------------------------------------------
+# mcp5 – 학사 행정 관리
+# ---------------------------------------------------------------------------
+
+DEPARTMENTS = [
+    "컴퓨터공학과",
+    "경영학과",
+    "국어국문학과",
+    "영어영문학과",
+    "수학과",
+    "물리학과",
+    "화학과",
+    "생물학과",
+    "미술학과",
+    "음악학과",
+    "체육학과",
+    "법학과",
+]
+COURSE_PREFIXES = ["CS", "BU", "KL", "EN", "MA", "PH", "CH", "BI", "AR", "MU", "PE", "LA"]
+SEMESTERS = ["2024-1", "2024-2", "2025-1"]
+LETTER_GRADES = np.array(["A+", "A", "B+", "B", "C+", "C", "D+", "D", "F"])
+GRADE_POINTS = np.array([4.5, 4.0, 3.5, 3.0, 2.5, 2.0, 1.5, 1.0, 0.0])
+FAILED = len(LETTER_GRADES) - 1
+
+
+def _active(students):
+    return students["status"] == "재학"
+
+
+def _admission_date(c):
+    # 입학 연도부터 오늘 사이의 입학일 (Python 백엔드의 date_between(f"-{2025-year}y", "today"))
+    spans = ((2025 - c["_year"]) * DATE_UNITS["y"]).astype(int)
+    return vec.today() - (c.random() * (spans + 1)).astype(int)
+
+
+def _score(failed_range, passed_range):
+    return Case(Ref("_failed"), Uniform(*failed_range), Uniform(*passed_range))
+
+
+MCP5 = Scenario(
+    "mcp5",
+    [
+        Table(
+            "Professors",
+            rows=NUM_PROFESSORS,
+            key="prof_id",
+            columns={
+                "name": Fake("name"),
+                "dept": Choice(DEPARTMENTS),
+                "position": Choice(["교수", "부교수", "조교수", "겸임교수"]),
+            },
+        ),
+        # 앞쪽 20%는 고학점자(3.8~4.5), 나머지는 1.0~3.9
+        # 장기결석자: 학생 수의 9% (TARGET_LONG_ABSENT), 그중 15%는 GPA 4.0 이상 재학생
+        Table(
+            "Students",
+            rows=NUM_STUDENTS,
+            key="student_id",
+            columns={
+                "_year": IntRange(2020, 2024),
+                "student_number": Concat(Ref("_year"), RowNumber(width=5)),
+                "name": Fake("name"),
+                "grade": IntRange(1, 4),
+                "major": Choice(DEPARTMENTS),
+                "admission_date": Expr(_admission_date),
+                "status": Choice(["재학", "휴학", "졸업", "제적"]),
+                "gpa": Blocks((0.2, Uniform(3.8, 4.5, 2)), (None, Uniform(1.0, 3.9, 2))),
+            },
+            keep=("status", "gpa"),
+            derive={
+                "attendance_rate": Skew(
+                    default=Uniform(0.7, 0.95),
+                    budget=TARGET_LONG_ABSENT,
+                    picks=[
+                        Pick(0.3, where=lambda s: _active(s) & (s["gpa"] >= 4.0), share=0.15),
+                        Pick(0.35, where=_active, probability=0.1),
+                    ],
+                )
+            },
+        ),
+        Table(
+            "Courses",
+            rows=NUM_COURSES,
+            key="course_id",
+            columns={
+                "course_code": Concat(Choice(COURSE_PREFIXES), IntRange(100, 499)),
+                "course_name": Concat(Fake("catch_phrase"), Choice(["이론", "실습", "세미나", "특강"]), sep=" "),
+                "credits": Choice([1, 2, 3]),
+                "semester": Choice(SEMESTERS),
+                "prof_id": ForeignKey("Professors"),
+                "max_students": IntRange(30, 120),
+            },
+        ),
+        Table(
+            "Enrollments",
+            rows=NUM_ENROLLMENTS,
+            columns={
+                "student_id": ForeignKey("Students"),
+                "course_id": ForeignKey("Courses"),
+                "semester": Choice(SEMESTERS),
+                "enrollment_date": DateRange("-6M", "today"),
+            },
+            keep=("student_id", "course_id"),
+        ),
+        # 재학생의 수강 과목마다 15주 출석 기록 (학생별 출석률에 따라 결석)
+        Table(
+            "Attendance",
+            per=Per(
+                "Enrollments",
+                15,
+                where=lambda e: e.lookup("Students", "status", e["student_id"]) == "재학",
+            ),
+            columns={
+                "student_id": Parent("student_id"),
+                "course_id": Parent("course_id"),
+                "attendance_date": DateRange("-4M", "today"),
+                "status": Case(
+                    lambda c: c.random() < c.lookup("Students", "attendance_rate", c["student_id"]),
+                    Choice(["출석", "지각", "조퇴"], weights=[0.85, 0.1, 0.05]),
+                    "결석",
+                ),
+                "semester": Const("2025-1"),
+            },
+        ),
+        # 중복 제거한 학생-강좌 쌍마다 1건, GPA 4.0 이상이면 상위 학점 비중을 높인다
+        Table(
+            "Grades",
+            per=Per("Enrollments", distinct=("student_id", "course_id")),
+            columns={
+                "student_id": Parent("student_id"),
+                "course_id": Parent("course_id"),
+                "semester": Const("2025-1"),
+                "_grade": Case(
+                    lambda c: c.lookup("Students", "gpa", c["student_id"]) >= 4.0,
+                    Choice(range(9), weights=[0.4, 0.3, 0.15, 0.1, 0.03, 0.02, 0, 0, 0]),
+                    Choice(range(9), weights=[0.1, 0.15, 0.2, 0.25, 0.15, 0.1, 0.03, 0.02, 0]),
+                ),
+                "_failed": Expr(lambda c: c["_grade"] == FAILED),
+                "midterm_score": _score((0, 59), (60, 100)),
+                "final_score": _score((0, 59), (60, 100)),
+                "assignment_score": _score((0, 69), (70, 100)),
+                "total_score": Expr(
+                    lambda c: c["midterm_score"] * 0.3 + c["final_score"] * 0.4 + c["assignment_score"] * 0.3
+                ),
+                "letter_grade": Expr(lambda c: LETTER_GRADES[c["_grade"]]),
+                "grade_point": Expr(lambda c: GRADE_POINTS[c["_grade"]]),
+            },
+        ),
+    ],
+)
+
+SCENARIO_SPECS = {spec.name: spec for spec in (MCP1, MCP2, MCP3, MCP4, MCP5)}
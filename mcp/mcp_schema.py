@@ -0,0 +1,187 @@
+"""시나리오 스키마 생성과 제약조건 지연(deferred) 적재
+
+LOAD_MODE=direct (기본값)
+    CREATE TABLE 에 선언한 기본키/외래키/UNIQUE 를 그대로 두고 적재한다.
+    PostgreSQL 이 행마다 외래키를 검사하고 인덱스를 갱신한다.
+
+LOAD_MODE=deferred
+    1. 제약조건을 뺀 맨 테이블을 만들고 (UNLOGGED_LOAD=1 이면 UNLOGGED + synchronous_commit=off)
+    2. 데이터를 일괄 적재한 뒤
+    3. 기본키 → UNIQUE → 외래키 → 외래키 열 보조 인덱스를 한 번에 만들고
+    4. 테이블을 LOGGED 로 되돌린 다음 ANALYZE 로 통계를 갱신한다.
+    제약조건 이름은 PostgreSQL 기본 이름(<table>_pkey, <table>_<col>_fkey 등)을 그대로 사용하므로
+    direct 모드로 만든 기존 테이블에도 그대로 적용된다.
+
+파티션 테이블(PARTITION BY ...)은 UNLOGGED 로 만들 수 없으므로 UNLOGGED_LOAD 에서 제외한다.
+파티션 키를 포함해야 하는 복합 기본키는 표 수준 `PRIMARY KEY (a, b)` 줄로 선언한다.
+"""
+
+import os
+import re
+
+# 스키마 모드 설정 (환경변수에서 로드)
+LOAD_MODE = os.getenv("LOAD_MODE", "direct").lower()
+LOAD_MODES = ("direct", "deferred")
+UNLOGGED_LOAD = os.getenv("UNLOGGED_LOAD", "0") == "1"  # deferred 모드에서만 사용
+
+_TABLE_RE = re.compile(
+    r"CREATE TABLE IF NOT EXISTS (\w+) \((.*?)\n\s*\)( PARTITION BY [^;]+)?;", re.S
+)
+_TABLE_PRIMARY_KEY_RE = re.compile(r"^\s*PRIMARY KEY \(([^)]*)\),?\s*$")
+_TRAILING_COMMA_RE = re.compile(r",(\s*(--.*)?)$")
+_COLUMN_RE = re.compile(r"^\s*(\w+)\s")
+_PRIMARY_KEY_RE = re.compile(r"\s+PRIMARY KEY\b")
+_UNIQUE_RE = re.compile(r"\s+UNIQUE\b")
+_REFERENCES_RE = re.compile(r"\s+REFERENCES\s+(\w+)\((\w+)\)")
+
+
+class TableSpec:
+    """CREATE TABLE 문 하나에서 뽑아낸 테이블 이름과 제약조건"""
+
+    def __init__(self, name):
+        self.name = name.lower()
+        self.partitioned = False
+        self.primary_key = None  # 열 이름 (복합 기본키면 "a, b")
+        self.unique = []
+        self.foreign_keys = []  # (열, 참조 테이블, 참조 열)
+
+    def constraint_names(self):
+        """PostgreSQL 기본 제약조건 이름 (외래키 먼저)"""
+        names = [f"{self.name}_{col}_fkey" for col, _, _ in self.foreign_keys]
+        names += [f"{self.name}_{col}_key" for col in self.unique]
+        if self.primary_key:
+            names.append(f"{self.name}_pkey")
+        return names
+
+
+def parse_schema(ddl):
+    """DDL 을 (제약조건을 뺀 DDL, TableSpec 목록) 으로 분리
+
+    TableSpec 목록은 CREATE TABLE 순서(부모 → 자식)를 그대로 따른다.
+    """
+    tables = []
+
+    def strip_table(match):
+        spec = TableSpec(match.group(1))
+        spec.partitioned = match.group(3) is not None
+        lines = []
+        table_key = False
+        for line in match.group(2).split("\n"):
+            key = _TABLE_PRIMARY_KEY_RE.match(line)
+            if key:
+                spec.primary_key = key.group(1).lower()
+                table_key = True
+                continue
+            column = _COLUMN_RE.match(line)
+            if column:
+                col = column.group(1).lower()
+                if _PRIMARY_KEY_RE.search(line):
+                    spec.primary_key = col
+                if _UNIQUE_RE.search(line):
+                    spec.unique.append(col)
+                for ref_table, ref_col in _REFERENCES_RE.findall(line):
+                    spec.foreign_keys.append((col, ref_table.lower(), ref_col.lower()))
+                line = _REFERENCES_RE.sub("", _UNIQUE_RE.sub("", _PRIMARY_KEY_RE.sub("", line)))
+            lines.append(line)
+        tables.append(spec)
+        if table_key:
+            # 표 수준 기본키 줄을 뺐으므로 마지막 열 정의 끝의 쉼표도 뺀다
+            lines[-1] = _TRAILING_COMMA_RE.sub(r"\1", lines[-1])
+        body = "\n".join(lines)
+        return match.group(0).replace(match.group(2), body, 1)
+
+    bare = _TABLE_RE.sub(strip_table, ddl)
+    return bare, tables
+
+
+def _check_mode():
+    if LOAD_MODE not in LOAD_MODES:
+        raise ValueError(f"지원하지 않는 LOAD_MODE: {LOAD_MODE} (사용 가능: {LOAD_MODES})")
+
+
+def create_tables(cur, ddl):
+    """스키마 모드에 맞춰 테이블 생성 (deferred 모드는 제약조건 없는 맨 테이블)"""
+    _check_mode()
+    if LOAD_MODE == "direct":
+        cur.execute(ddl)
+        return
+    bare, _ = parse_schema(ddl)
+    if UNLOGGED_LOAD:
+        bare = _TABLE_RE.sub(
+            lambda m: m.group(0)
+            if m.group(3)
+            else m.group(0).replace("CREATE TABLE", "CREATE UNLOGGED TABLE", 1),
+            bare,
+        )
+    cur.execute(bare)
+
+
+def prepare_load(cur, ddl):
+    """적재 직전 준비: 기존 제약조건/보조 인덱스 제거, UNLOGGED 전환 (deferred 모드)"""
+    if LOAD_MODE != "deferred":
+        return
+    _, tables = parse_schema(ddl)
+    # 외래키가 기본키를 참조하므로 모든 테이블의 외래키를 먼저 제거
+    for spec in tables:
+        for col, _, _ in spec.foreign_keys:
+            cur.execute(f"ALTER TABLE {spec.name} DROP CONSTRAINT IF EXISTS {spec.name}_{col}_fkey")
+            cur.execute(f"DROP INDEX IF EXISTS {spec.name}_{col}_idx")
+    for spec in tables:
+        for name in spec.constraint_names():
+            if not name.endswith("_fkey"):
+                cur.execute(f"ALTER TABLE {spec.name} DROP CONSTRAINT IF EXISTS {name}")
+    if UNLOGGED_LOAD:
+        cur.execute("SET LOCAL synchronous_commit = off")
+        # 외래키를 모두 제거했으므로 순서와 관계없이 전환할 수 있다
+        for spec in tables:
+            if not spec.partitioned:
+                cur.execute(f"ALTER TABLE {spec.name} SET UNLOGGED")
+
+
+def _add_foreign_keys(cur, tables):
+    for spec in tables:
+        for col, ref_table, ref_col in spec.foreign_keys:
+            cur.execute(
+                f"ALTER TABLE {spec.name} ADD CONSTRAINT {spec.name}_{col}_fkey "
+                f"FOREIGN KEY ({col}) REFERENCES {ref_table}({ref_col})"
+            )
+
+
+def finish_load(cur, ddl, timer):
+    """적재 후 기본키·UNIQUE·외래키·보조 인덱스 생성, LOGGED 복귀, ANALYZE (deferred 모드)"""
+    if LOAD_MODE != "deferred":
+        return
+    _, tables = parse_schema(ddl)
+    with timer.phase("primary_key"):
+        for spec in tables:
+            if spec.primary_key:
+                cur.execute(
+                    f"ALTER TABLE {spec.name} ADD CONSTRAINT {spec.name}_pkey PRIMARY KEY ({spec.primary_key})"
+                )
+            for col in spec.unique:
+                cur.execute(
+                    f"ALTER TABLE {spec.name} ADD CONSTRAINT {spec.name}_{col}_key UNIQUE ({col})"
+                )
+    # 파티션(LOGGED)은 UNLOGGED 테이블을 참조할 수 없으므로 LOGGED 전환 뒤에 외래키를 추가
+    late = [spec for spec in tables if UNLOGGED_LOAD and spec.partitioned]
+    with timer.phase("foreign_key"):
+        _add_foreign_keys(cur, [spec for spec in tables if spec not in late])
+    with timer.phase("index"):
+        # 조인/필터에 쓰이는 외래키 열마다 보조 인덱스
+        for spec in tables:
+            for col, _, _ in spec.foreign_keys:
+                cur.execute(
+                    f"CREATE INDEX IF NOT EXISTS {spec.name}_{col}_idx ON {spec.name} ({col})"
+                )
+    if UNLOGGED_LOAD:
+        with timer.phase("logged"):
+            # 참조하는 부모가 먼저 LOGGED 여야 하므로 생성 순서(부모 → 자식)대로 전환
+            for spec in tables:
+                if not spec.partitioned:
+                    cur.execute(f"ALTER TABLE {spec.name} SET LOGGED")
+        if late:
+            with timer.phase("foreign_key_partitioned"):
+                _add_foreign_keys(cur, late)
+    with timer.phase("analyze"):
+        for spec in tables:
+            cur.execute(f"ANALYZE {spec.name}")
@@ -0,0 +1,100 @@
+import os
+
+from dotenv import load_dotenv
+
+# .env 파일 로드
+load_dotenv()
+
+# DB 접속 정보 (환경변수에서 로드)
+DB_HOST = os.getenv("DB_HOST")
+DB_USER = os.getenv("DB_USER")
+DB_PASSWORD = os.getenv("DB_PASSWORD")
+DB_PORT = os.getenv("DB_PORT", "5432")
+DB_SSLMODE = os.getenv("DB_SSLMODE")  # 예: require, verify-full (비워 두면 libpq 기본값)
+
+# 규모 배율 (TPC 스타일 scale factor): 아래 모든 행 수에 곱해진다 (SF=10 → 전 테이블 10배)
+SCALE_FACTOR = float(os.getenv("SCALE_FACTOR", 1))
+
+
+def scaled(name, default):
+    """환경변수(없으면 기본값)로 정한 기준 행 수에 SCALE_FACTOR 를 곱한 값"""
+    return max(1, round(int(os.getenv(name, default)) * SCALE_FACTOR))
+
+
+# 공무원 더미 데이터 설정 (환경변수에서 로드, SF=1 기준 행 수)
+NUM_CUSTOMERS = scaled("NUM_CUSTOMERS", 1000)
+NUM_ORDERS = scaled("NUM_ORDERS", 5000)
+NUM_CAMPAIGNS = scaled("NUM_CAMPAIGNS", 10)
+NUM_FEEDBACKS = scaled("NUM_FEEDBACKS", 500)
+NUM_TRANSACTIONS = scaled("NUM_TRANSACTIONS", 4000)
+NUM_USERS = scaled("NUM_USERS", 800)
+NUM_ACTIVITIES = scaled("NUM_ACTIVITIES", 3000)
+
+# 공공 행정 데이터 설정 (mcp4)
+NUM_EMPLOYEES = scaled("NUM_EMPLOYEES", 120)
+NUM_PROJECTS = scaled("NUM_PROJECTS", 30)
+NUM_EVENTS = scaled("NUM_EVENTS", 80)
+NUM_SUPPLY_REQUESTS = scaled("NUM_SUPPLY_REQUESTS", 300)
+
+# 학사 데이터 설정 (환경변수에서 로드)
+NUM_STUDENTS = scaled("NUM_STUDENTS", 3000)  # 학생 수 (270명 장기결석자 = 9%)
+NUM_PROFESSORS = scaled("NUM_PROFESSORS", 150)  # 교수 수
+NUM_COURSES = scaled("NUM_COURSES", 200)  # 강좌 수
+NUM_ENROLLMENTS = scaled("NUM_ENROLLMENTS", 15000)  # 수강신청 건수
+NUM_ATTENDANCE_RECORDS = scaled("NUM_ATTENDANCE_RECORDS", 100000)  # 출석 기록
+TARGET_LONG_ABSENT = round(NUM_STUDENTS * 0.09)  # 장기결석자 목표 (학생 수의 9%, SF=1 에서 270명)
+
+# 대용량 테이블을 나눠 생성·적재할 청크 크기 (이 행 수만큼만 메모리에 올린다)
+GEN_CHUNK_ROWS = int(os.getenv("GEN_CHUNK_ROWS", 100000))
+
+# 병렬 실행 설정 (1이면 순차 실행, 2 이상이면 프로세스 풀로 시나리오 병렬 적재)
+MCP_WORKERS = int(os.getenv("MCP_WORKERS", 1))
+
+# 재현 실행용 시드 (비워 두면 실행마다 다른 데이터, --seed 로도 지정 가능)
+MCP_SEED = int(os.getenv("MCP_SEED")) if os.getenv("MCP_SEED") else None
+
+# 적재 후 mcpN_template 스냅샷 생성 여부 (1 이면 생성, mcp_snapshot.py 참고)
+MCP_SNAPSHOT = os.getenv("MCP_SNAPSHOT", "0") == "1"
+
+# 증분(top-up) 모드: 데이터가 이미 있으면 건너뛰는 대신 목표 행 수까지 부족한 행만 추가 (--top-up 으로도 지정)
+MCP_TOPUP = os.getenv("MCP_TOPUP", "0") == "1"
+TOPUP_COUNT = os.getenv("TOPUP_COUNT", "exact").lower()  # exact: COUNT(*), estimate: pg_class.reltuples
+
+# 데이터 생성 백엔드 (python: 행 단위 생성, numpy: 열 배열 단위 벡터화 생성)
+GEN_BACKEND = os.getenv("GEN_BACKEND", "python").lower()
+# 서버 입출력 백엔드 (sync: psycopg2, async: psycopg 3 asyncio 파이프라인 + 테이블 동시 COPY)
+IO_BACKEND = os.getenv("IO_BACKEND", "sync").lower()
+
+# Faker 설정 (환경변수에서 로케일 로드)
+faker_locale = os.getenv("FAKER_LOCALE", "ko_KR")
+
+# Faker 인스턴스는 로케일 프로바이더를 모두 불러와 느리므로 처음 쓸 때 만든다
+_faker = None
+_faker_seed = None
+
+
+def get_faker():
+    """공용 Faker 인스턴스 (처음 호출할 때 만들고, 그 전에 받은 시드를 적용)"""
+    global _faker
+    if _faker is None:
+        from faker import Faker
+
+        _faker = Faker(faker_locale)
+        if _faker_seed is not None:
+            _faker.seed_instance(_faker_seed)
+    return _faker
+
+
+def seed_faker(value=None):
+    """Faker 시드 지정 (아직 만들지 않았으면 만들 때 적용)"""
+    global _faker_seed
+    _faker_seed = value
+    if _faker is not None:
+        _faker.seed_instance(value)
+
+
+def __getattr__(name):
+    # 기존 코드의 mcp_settings.faker 접근 호환 (접근할 때 Faker 생성)
+    if name == "faker":
+        return get_faker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,156 @@
+"""템플릿 데이터베이스 스냅샷 기반 MCP 환경 초기화
+
+한 번 전체 생성을 마친 mcpN 데이터베이스를 mcpN_template 으로 고정(snapshot)해 두면,
+이후 초기화는 TRUNCATE + 재생성 대신
+    DROP DATABASE mcpN WITH (FORCE);
+    CREATE DATABASE mcpN TEMPLATE mcpN_template;
+만으로 끝난다. 서버 측 파일 복사이므로 데이터 크기와 관계없이 수 초 안에 끝난다.
+
+사용법:
+    python3 mcp_snapshot.py snapshot [mcp1 mcp2 ...]   # 현재 데이터로 템플릿 생성/갱신
+    python3 mcp_snapshot.py reset [mcp1 mcp2 ...]      # 템플릿으로 즉시 초기화
+    python3 mcp_snapshot.py status [mcp1 mcp2 ...]     # 템플릿 존재 여부 확인
+"""
+
+import os
+import sys
+import time
+
+from psycopg2 import sql
+
+from mcp_connections import admin_connection, close_database
+
+# 대상 데이터베이스 목록 (환경변수에서 로드)
+database_list = os.getenv("DATABASE_LIST", "mcp1,mcp2,mcp3,mcp4,mcp5")
+databases = [db.strip() for db in database_list.split(",")]
+TEMPLATE_SUFFIX = os.getenv("TEMPLATE_SUFFIX", "_template")
+
+
+def template_name(dbname):
+    return f"{dbname}{TEMPLATE_SUFFIX}"
+
+
+def _exists(cur, dbname):
+    cur.execute("SELECT 1 FROM pg_database WHERE datname = %s", (dbname,))
+    return cur.fetchone() is not None
+
+
+def _drop_template(cur, template):
+    # 템플릿으로 표시된 데이터베이스는 먼저 표시를 해제해야 삭제할 수 있다
+    cur.execute(
+        sql.SQL("ALTER DATABASE {} WITH IS_TEMPLATE false").format(
+            sql.Identifier(template)
+        )
+    )
+    cur.execute(
+        sql.SQL("DROP DATABASE {} WITH (FORCE)").format(sql.Identifier(template))
+    )
+
+
+def create_snapshot(dbname, cur=None):
+    """dbname 의 현재 상태를 dbname_template 으로 고정"""
+    own = cur is None
+    if own:
+        cur = admin_connection().cursor()
+    template = template_name(dbname)
+    started = time.perf_counter()
+    try:
+        if not _exists(cur, dbname):
+            raise RuntimeError(f"원본 데이터베이스가 없습니다: {dbname}")
+        if _exists(cur, template):
+            _drop_template(cur, template)
+        # 복제 원본에는 다른 세션이 붙어 있으면 안 되므로 풀에 남은 연결과 다른 세션을 정리
+        close_database(dbname)
+        cur.execute(
+            "SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE datname = %s AND pid <> pg_backend_pid()",
+            (dbname,),
+        )
+        cur.execute(
+            sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(
+                sql.Identifier(template), sql.Identifier(dbname)
+            )
+        )
+        # 템플릿에 접속이 생기면 복제가 막히므로 접속 자체를 막아 둔다
+        cur.execute(
+            sql.SQL("ALTER DATABASE {} WITH IS_TEMPLATE true ALLOW_CONNECTIONS false").format(
+                sql.Identifier(template)
+            )
+        )
+    finally:
+        if own:
+            cur.close()
+    print(f"📸 {dbname} → {template} 스냅샷 생성 ({time.perf_counter() - started:.1f}s)")
+
+
+def restore_snapshot(dbname, cur=None):
+    """dbname 을 삭제하고 dbname_template 에서 다시 복제"""
+    own = cur is None
+    if own:
+        cur = admin_connection().cursor()
+    template = template_name(dbname)
+    started = time.perf_counter()
+    try:
+        if not _exists(cur, template):
+            raise RuntimeError(
+                f"템플릿이 없습니다: {template} (먼저 'snapshot' 을 실행하세요)"
+            )
+        close_database(dbname)
+        cur.execute(
+            sql.SQL("DROP DATABASE IF EXISTS {} WITH (FORCE)").format(
+                sql.Identifier(dbname)
+            )
+        )
+        cur.execute(
+            sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(
+                sql.Identifier(dbname), sql.Identifier(template)
+            )
+        )
+    finally:
+        if own:
+            cur.close()
+    print(f"♻️ {template} → {dbname} 초기화 완료 ({time.perf_counter() - started:.1f}s)")
+
+
+def snapshot_status(names):
+    cur = admin_connection().cursor()
+    cur.execute(
+        """
+        SELECT datname, pg_size_pretty(pg_database_size(datname))
+        FROM pg_database WHERE datname = ANY(%s)
+        """,
+        ([template_name(db) for db in names],),
+    )
+    sizes = dict(cur.fetchall())
+    cur.close()
+    for db in names:
+        template = template_name(db)
+        if template in sizes:
+            print(f"✅ {db}: {template} ({sizes[template]})")
+        else:
+            print(f"⚠️ {db}: 템플릿 없음")
+    return sizes
+
+
+if __name__ == "__main__":
+    commands = {"snapshot": create_snapshot, "reset": restore_snapshot}
+    if len(sys.argv) < 2 or sys.argv[1] not in (*commands, "status"):
+        print(__doc__)
+        raise SystemExit(2)
+    names = sys.argv[2:] or databases
+    if sys.argv[1] == "status":
+        snapshot_status(names)
+        raise SystemExit(0)
+
+    cur = admin_connection().cursor()
+    failed = []
+    started = time.perf_counter()
+    for db in names:
+        try:
+            commands[sys.argv[1]](db, cur)
+        except Exception as e:
+            print(f"❌ {db}: {e}")
+            failed.append(db)
+    cur.close()
+    print(f"⏱️ 전체 소요 시간: {time.perf_counter() - started:.1f}s")
+    if failed:
+        raise SystemExit(1)
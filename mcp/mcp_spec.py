@@ -0,0 +1,513 @@
+"""선언형 시나리오 명세와 벡터화 생성기 컴파일러
+
+시나리오를 테이블·열·값 분포·외래키 관계·쏠림(skew) 규칙으로 선언하면 compile_scenario 가
+NumPy 열 배열 생성기 + 청크 단위 적재(load_column_chunks, COPY)로 바꿔 준다.
+새 시나리오는 생성 함수를 손으로 작성하지 않고 명세(mcp_scenario_specs.py)만 추가하면 된다.
+
+    Table("Orders", rows=NUM_ORDERS, columns={
+        "customer_id": ForeignKey("Customers"),        # 부모 키에서 균등 복원추출
+        "order_date": DateRange("-1y", "today"),       # 기준일 기준 상대 날짜
+        "amount": IntRange(10000, 300000),
+    })
+    Table("Campaign_Performance", per=Per("Campaigns", 30), columns={
+        "campaign_id": Parent("campaign_id"),          # 부모 행마다 30행
+        "date": Expr(lambda c: vec.today() - 30 + c.slot),
+        "impressions": IntRange(1000, 10000),
+        "clicks": IntRange(100, Ref("impressions")),   # 같은 행의 앞 열 참조
+    })
+
+- 열 값은 Value 객체(분포)이며 청크마다 ctx.n 개를 한 번에 만든다. Expr 로 임의의 배열 계산을 넣을 수 있다.
+- 이름이 "_" 로 시작하는 열은 계산에만 쓰고 적재하지 않는다.
+- keep 에 적은 열은 테이블 전체 배열로 보관해 뒤 테이블의 Per(where/distinct)·Lookup·쏠림 규칙에서 쓴다.
+- derive 는 테이블 적재 후 행마다 붙이는 파생 속성(적재하지 않음)이다. 예: Skew 로 만든 학생별 출석률
+- 난수는 mcp_vectorized.rng 하나만 쓰므로 mcp_vectorized.seed() 로 재현된다.
+"""
+
+import math
+
+import numpy as np
+
+import mcp_vectorized as vec
+from mcp_faker_pool import fake_column
+from mcp_loader import chunk_ranges, load_column_chunks, reserve_ids
+from mcp_settings import GEN_CHUNK_ROWS
+
+
+# ---------------------------------------------------------------------------
+# 값 분포
+# ---------------------------------------------------------------------------
+
+
+class Value:
+    """열 값 생성기: generate(ctx) 가 ctx.n 개 값을 담은 배열을 반환"""
+
+    def generate(self, ctx):
+        raise NotImplementedError
+
+
+class Const(Value):
+    def __init__(self, value):
+        self.value = value
+
+    def generate(self, ctx):
+        return np.full(ctx.n, self.value)
+
+
+class Choice(Value):
+    """values 중 하나 (weights 가 있으면 가중치 샘플링)"""
+
+    def __init__(self, values, weights=None):
+        self.values = np.asarray(values)
+        self.weights = weights
+
+    def generate(self, ctx):
+        return vec.choice(self.values, ctx.n, self.weights)
+
+
+class IntRange(Value):
+    """low ~ high 정수 (양 끝 포함, 경계에 Ref/Expr 등 배열도 가능)"""
+
+    def __init__(self, low, high):
+        self.low = low
+        self.high = high
+
+    def generate(self, ctx):
+        return vec.randint(ctx.resolve(self.low), ctx.resolve(self.high), ctx.n)
+
+
+class Uniform(Value):
+    """low ~ high 실수 (decimals 가 있으면 반올림)"""
+
+    def __init__(self, low, high, decimals=None):
+        self.low = low
+        self.high = high
+        self.decimals = decimals
+
+    def generate(self, ctx):
+        values = vec.uniform(self.low, self.high, ctx.n)
+        return values if self.decimals is None else np.round(values, self.decimals)
+
+
+class DateRange(Value):
+    """기준일 기준 상대 날짜 구간 (예: DateRange("-6M", "today"))"""
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+    def generate(self, ctx):
+        return vec.dates_between(self.start, self.end, ctx.n)
+
+
+class Fake(Value):
+    """Faker 값 풀(mcp_faker_pool)의 값"""
+
+    def __init__(self, kind):
+        self.kind = kind
+
+    def generate(self, ctx):
+        return fake_column(self.kind, ctx.n, vec.rng)
+
+
+class ForeignKey(Value):
+    """이미 생성한 부모 테이블의 키에서 균등 복원추출"""
+
+    def __init__(self, table):
+        self.table = table
+
+    def generate(self, ctx):
+        return vec.sample_ids(ctx.run.pool(self.table), ctx.n)
+
+
+class RowNumber(Value):
+    """테이블 안의 행 번호 (start 부터, width 가 있으면 0 으로 채운 문자열)"""
+
+    def __init__(self, start=1, width=None):
+        self.start = start
+        self.width = width
+
+    def generate(self, ctx):
+        numbers = ctx.index + self.start
+        if self.width is None:
+            return numbers
+        return np.char.zfill(numbers.astype(str), self.width)
+
+
+class Slot(Value):
+    """Per 테이블에서 부모 행 안의 순번 (values 가 있으면 순번 위치의 값)"""
+
+    def __init__(self, values=None):
+        self.values = None if values is None else np.asarray(values)
+
+    def generate(self, ctx):
+        return ctx.slot if self.values is None else self.values[ctx.slot]
+
+
+class Parent(Value):
+    """Per 테이블에서 부모 행의 열 값"""
+
+    def __init__(self, column):
+        self.column = column
+
+    def generate(self, ctx):
+        return ctx.parent(self.column)
+
+
+class Ref(Value):
+    """같은 행에서 먼저 선언한 열의 값"""
+
+    def __init__(self, column):
+        self.column = column
+
+    def generate(self, ctx):
+        return ctx[self.column]
+
+
+class Lookup(Value):
+    """by 열의 키로 다른 테이블의 보관 열(keep/derive) 값을 찾는다"""
+
+    def __init__(self, table, column, by):
+        self.table = table
+        self.column = column
+        self.by = by
+
+    def generate(self, ctx):
+        return ctx.lookup(self.table, self.column, ctx[self.by])
+
+
+class Concat(Value):
+    """값들을 문자열로 이어 붙인다 (문자열 상수는 그대로 붙인다)"""
+
+    def __init__(self, *parts, sep=""):
+        self.parts = parts
+        self.sep = sep
+
+    def generate(self, ctx):
+        result = None
+        for part in self.parts:
+            text = np.asarray(ctx.resolve(part)).astype(str)
+            if result is None:
+                result = text
+            else:
+                result = np.char.add(np.char.add(result, self.sep), text)
+        return np.broadcast_to(result, (ctx.n,))
+
+
+class Case(Value):
+    """when(ctx) 가 참인 행은 then, 나머지는 otherwise"""
+
+    def __init__(self, when, then, otherwise):
+        self.when = when
+        self.then = then
+        self.otherwise = otherwise
+
+    def generate(self, ctx):
+        return np.where(ctx.resolve(self.when), ctx.resolve(self.then), ctx.resolve(self.otherwise))
+
+
+class Blocks(Value):
+    """테이블 앞쪽부터 비율 구간마다 다른 분포 (예: 앞 20% 고학점자)
+
+    blocks: [(비율, 값), ..., (None, 값)] — 마지막 None 구간은 나머지 전부
+    """
+
+    def __init__(self, *blocks):
+        self.blocks = blocks
+
+    def generate(self, ctx):
+        result = None
+        lower = 0
+        for share, value in self.blocks:
+            upper = ctx.total if share is None else lower + int(ctx.total * share)
+            mask = (ctx.index >= lower) & (ctx.index < upper)
+            if mask.any():
+                values = np.asarray(ctx.resolve(value))
+                if result is None:
+                    result = np.empty(ctx.n, dtype=values.dtype)
+                result[mask] = values[mask]
+            lower = upper
+        return result
+
+
+class Expr(Value):
+    """fn(ctx) 가 계산한 배열 (앞 열은 ctx["열"], 난수는 ctx.random() 등)"""
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def generate(self, ctx):
+        return self.fn(ctx)
+
+
+# ---------------------------------------------------------------------------
+# 쏠림 규칙
+# ---------------------------------------------------------------------------
+
+
+class Pick:
+    """쏠림 규칙의 한 단계: where 를 만족하는 행 중 앞에서부터 골라 value 를 준다
+
+    share: 전체 예산(budget) 중 이 단계가 쓸 수 있는 비율
+    probability: 조건을 만족하는 행 중 이 확률로 뽑힌 행만 후보
+    """
+
+    def __init__(self, value, where, share=1.0, probability=None):
+        self.value = value
+        self.where = where
+        self.share = share
+        self.probability = probability
+
+
+class Skew:
+    """행 속성에 쏠림을 넣는 규칙 (예: 장기결석자 budget 명 중 15% 는 고학점자)
+
+    Pick 단계를 차례로 적용하고, 예산을 모두 쓰면 멈춘다. 고르지 않은 행은 default 분포.
+    """
+
+    def __init__(self, default, picks, budget):
+        self.default = default
+        self.picks = picks
+        self.budget = budget
+
+    def apply(self, frame):
+        ctx = frame.context()
+        values = np.asarray(ctx.resolve(self.default), dtype=float)
+        taken = np.zeros(len(frame), dtype=bool)
+        used = 0
+        for pick in self.picks:
+            candidates = np.asarray(pick.where(frame), dtype=bool) & ~taken
+            if pick.probability is not None:
+                candidates &= vec.rng.random(len(frame)) < pick.probability
+            limit = min(math.ceil(self.budget * pick.share), math.ceil(self.budget) - used)
+            chosen = np.flatnonzero(candidates)[: max(limit, 0)]
+            values[chosen] = pick.value
+            taken[chosen] = True
+            used += len(chosen)
+        return values
+
+
+# ---------------------------------------------------------------------------
+# 테이블·시나리오
+# ---------------------------------------------------------------------------
+
+
+class Per:
+    """부모 테이블 행마다 count 행 (where 로 부모 행을 거르고, distinct 로 열 조합이 같은 부모 행을 합친다)"""
+
+    def __init__(self, table, count=1, where=None, distinct=None):
+        self.table = table
+        self.count = count
+        self.where = where
+        self.distinct = distinct
+
+
+class Table:
+    """테이블 명세
+
+    rows: 만들 행 수 (Per 가 없을 때)
+    key: 시퀀스에서 한 번에 예약해 채울 기본키 열 (외래키·Parent·Lookup 의 기준)
+    per: 부모 행마다 행을 만드는 관계 (Per)
+    keep: 뒤 테이블에서 쓸 수 있도록 전체 배열로 보관할 열
+    derive: {속성 이름: Skew 등 apply(frame) 가 있는 규칙} — 적재 후 보관 열로 계산
+    """
+
+    def __init__(self, name, columns, rows=None, key=None, per=None, keep=(), derive=None, chunk_rows=None):
+        if (rows is None) == (per is None):
+            raise ValueError(f"{name}: rows 와 per 중 하나만 지정하세요")
+        self.name = name
+        self.columns = columns
+        self.rows = rows
+        self.key = key
+        self.per = per
+        self.keep = tuple(keep)
+        self.derive = derive or {}
+        self.chunk_rows = chunk_rows or GEN_CHUNK_ROWS
+
+    @property
+    def loaded_columns(self):
+        names = [name for name in self.columns if not name.startswith("_")]
+        return [self.key, *names] if self.key else names
+
+
+class Scenario:
+    def __init__(self, name, tables):
+        self.name = name
+        self.tables = tables
+
+
+# ---------------------------------------------------------------------------
+# 실행
+# ---------------------------------------------------------------------------
+
+
+class Context:
+    """청크 하나를 만드는 동안의 상태 — 값 분포와 Expr 가 받는 ctx"""
+
+    def __init__(self, run, n, index, total, parent_frame=None, parent_rows=None, slot=None):
+        self.run = run
+        self.n = n
+        self.index = index  # 테이블 안의 행 위치 (0부터)
+        self.total = total  # 테이블 전체 행 수
+        self.slot = slot  # Per 테이블에서 부모 행 안의 순번
+        self.columns = {}
+        self._parent_frame = parent_frame
+        self._parent_rows = parent_rows
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def resolve(self, value):
+        if isinstance(value, Value):
+            return value.generate(self)
+        if callable(value):
+            return value(self)
+        return value
+
+    def random(self):
+        return vec.rng.random(self.n)
+
+    def parent(self, column):
+        return self._parent_frame.column(column, self._parent_rows)
+
+    def lookup(self, table, column, keys):
+        return self.run.lookup(table, column, keys)
+
+
+class Frame:
+    """생성을 마친 테이블: 키 풀, 보관 열(keep), 파생 속성(derive)"""
+
+    def __init__(self, run, table, pool, length):
+        self.run = run
+        self.table = table
+        self.pool = pool
+        self.length = length
+        self.columns = {}
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, column):
+        return self.column(column)
+
+    def column(self, column, rows=None):
+        if column == self.table.key and column not in self.columns:
+            ids = self.pool.ids
+            if rows is None:
+                rows = np.arange(self.length)
+            return ids.start + rows * ids.step
+        values = self.columns[column]
+        return values if rows is None else values[rows]
+
+    def positions(self, keys):
+        """키 → 행 위치 (예약한 키는 연속 구간이다)"""
+        return (np.asarray(keys) - self.pool.ids.start) // self.pool.ids.step
+
+    def lookup(self, table, column, keys):
+        return self.run.lookup(table, column, keys)
+
+    def context(self):
+        return Context(self.run, self.length, np.arange(self.length), self.length)
+
+
+class ScenarioRun:
+    """명세 하나를 커서에 생성·적재 (테이블 선언 순서대로)"""
+
+    def __init__(self, scenario, cur):
+        self.scenario = scenario
+        self.cur = cur
+        self.frames = {}
+
+    def frame(self, table):
+        try:
+            return self.frames[table.lower()]
+        except KeyError:
+            raise ValueError(f"{self.scenario.name}: {table} 는 아직 생성하지 않은 테이블입니다") from None
+
+    def pool(self, table):
+        return self.frame(table).pool
+
+    def lookup(self, table, column, keys):
+        frame = self.frame(table)
+        return frame.column(column, frame.positions(keys))
+
+    def _parent_rows(self, per):
+        parent = self.frame(per.table)
+        rows = np.arange(len(parent))
+        if per.where is not None:
+            rows = rows[np.asarray(per.where(parent), dtype=bool)]
+        if per.distinct:
+            # 열 조합으로 정렬한 뒤 바로 앞 행과 조합이 같은 행을 버린다
+            keys = [parent.column(column, rows) for column in per.distinct]
+            order = np.lexsort(keys[::-1])
+            same = np.ones(len(order), dtype=bool)
+            same[0] = False
+            for values in keys:
+                ordered = values[order]
+                same[1:] &= ordered[1:] == ordered[:-1]
+            rows = rows[order[~same]]
+        return parent, rows
+
+    def _chunks(self, table, plan, total, keys, parent, rows, kept):
+        """청크마다 열 배열 묶음을 만들고 보관 열(keep)을 모은다"""
+        count = table.per.count if table.per else 1
+        for start, stop in plan:
+            index = np.arange(start * count, stop * count)
+            if table.per is None:
+                ctx = Context(self, len(index), index, total)
+            else:
+                ctx = Context(
+                    self,
+                    len(index),
+                    index,
+                    total,
+                    parent,
+                    np.repeat(rows[start:stop], count),
+                    np.tile(np.arange(count), stop - start),
+                )
+            if table.key:
+                ctx.columns[table.key] = keys.ids.start + index * keys.ids.step
+            for name, value in table.columns.items():
+                ctx.columns[name] = ctx.resolve(value)
+            for name in table.keep:
+                kept[name].append(ctx.columns[name])
+            yield [ctx.columns[name] for name in table.loaded_columns]
+
+    def generate(self, table):
+        parent = rows = None
+        if table.per is None:
+            total = table.rows
+            plan = chunk_ranges(total, max(1, table.chunk_rows))
+        else:
+            parent, rows = self._parent_rows(table.per)
+            total = len(rows) * table.per.count
+            plan = chunk_ranges(len(rows), max(1, table.chunk_rows // table.per.count))
+        keys = reserve_ids(self.cur, table.name, table.key, total) if table.key else None
+        kept = {name: [] for name in table.keep}
+        load_column_chunks(
+            self.cur,
+            table.name,
+            table.loaded_columns,
+            self._chunks(table, plan, total, keys, parent, rows, kept),
+        )
+
+        frame = Frame(self, table, keys, total)
+        for name, parts in kept.items():
+            frame.columns[name] = np.concatenate(parts) if parts else np.empty(0)
+        for name, rule in table.derive.items():
+            frame.columns[name] = rule.apply(frame)
+        self.frames[table.name.lower()] = frame
+
+    def run(self):
+        for table in self.scenario.tables:
+            self.generate(table)
+
+
+def compile_scenario(scenario):
+    """명세를 generate(cur) 함수로 바꾼다 (generate_mcpN 과 같은 호출 방식)"""
+
+    def generate(cur):
+        ScenarioRun(scenario, cur).run()
+
+    generate.__name__ = f"generate_{scenario.name}"
+    generate.__doc__ = f"{scenario.name} 명세로 만든 벡터화 생성기"
+    return generate
@@ -0,0 +1,61 @@
+"""NumPy 기반 벡터화 데이터 생성 백엔드 (GEN_BACKEND=numpy)
+
+행마다 random.choice / random.randint / faker.date_between 을 호출하는 대신
+테이블을 GEN_CHUNK_ROWS 행 단위 열 배열(column array) 묶음으로 만들어 load_column_chunks 로
+바로 흘려보낸다. 청크는 만들자마자 적재하고 버리므로 SCALE_FACTOR 를 키워도 팩트 테이블
+(주문, 거래, 출석 등) 크기만큼 메모리를 쓰지 않는다.
+- 날짜: 오늘 기준 일(day) 오프셋 정수 배열 → datetime64[D]
+- 범주형 값: 가중치 샘플링 (rng.choice)
+- 점수/금액: 정수·실수 배열
+이 모듈은 난수 생성기와 배열 샘플링 함수를 제공하고, 시나리오 생성기는 선언형 명세
+(mcp_scenario_specs.py)를 mcp_spec.compile_scenario 로 컴파일해 만든다.
+"""
+
+import numpy as np
+
+from mcp_dates import REFERENCE_DATE, day_offset
+
+rng = np.random.default_rng()
+
+
+def seed(value=None):
+    """난수 생성기를 다시 초기화 (프로세스 풀 워커, 재현 실행용)"""
+    global rng
+    rng = np.random.default_rng(value)
+
+
+def today():
+    return np.datetime64(REFERENCE_DATE, "D")
+
+
+def dates_between(start, end, n):
+    """faker.date_between(start, end) 의 벡터화 버전 — datetime64[D] 배열"""
+    offsets = rng.integers(day_offset(start), day_offset(end), n, endpoint=True)
+    return today() + offsets
+
+
+def choice(values, n, weights=None):
+    """범주형 값 n개를 (가중치) 샘플링"""
+    p = None
+    if weights is not None:
+        p = np.asarray(weights, dtype=float)
+        p = p / p.sum()
+    return np.asarray(values)[rng.choice(len(values), n, p=p)]
+
+
+def randint(low, high, n):
+    """random.randint(low, high) 의 벡터화 버전 (양 끝 포함, high 는 배열 가능)"""
+    return rng.integers(low, high, n, endpoint=True)
+
+
+def uniform(low, high, n):
+    return rng.uniform(low, high, n)
+
+
+def sample_ids(pool, n):
+    """IdPool 에서 외래키 n개를 복원추출 (연속 구간이면 키 배열을 만들지 않는다)"""
+    ids = pool.ids
+    if isinstance(ids, range):
+        return ids.start + rng.integers(0, len(ids), n) * ids.step
+    ids = np.asarray(ids)
+    return ids[rng.integers(0, len(ids), n)]
@@ -0,0 +1,529 @@
+"""시나리오별 분석 쿼리 워크로드와 인덱스·집계 뷰 (MCP_WORKLOAD=1)
+
+각 시나리오는 정해진 분석 질문(mcp1 캠페인 전환율, mcp4 분기별 예산 승인, mcp5 장기결석자 등)을
+위해 만들어졌지만 스키마에는 기본키만 있어 조회마다 테이블 전체를 읽는다. 시나리오마다
+대표 쿼리 목록(워크로드)을 두고, 그 쿼리들이 쓰는
+- 보조 인덱스 (이미 같은 열로 시작하는 인덱스가 있으면 만들지 않는다)
+- 집계 구체화 뷰 (materialized view, 적재 후 REFRESH)
+를 만든 뒤 EXPLAIN ANALYZE 실행 시간을 전/후로 비교해 출력한다.
+
+"전" 시간은 워크로드 인덱스가 없을 때만 재고 .mcp_workload/<db>.json 에 기록한다. 이미 설치된
+데이터베이스에서 다시 실행하면 인덱스를 지우지 않고 기록된 "전" 시간과 비교한다.
+(DROP INDEX 는 커밋할 때까지 테이블에 AccessExclusive 잠금을 잡아 학생들의 조회를 모두 막는다)
+
+사용법:
+    python3 mcp_workload.py apply [mcp1 mcp2 ...]    # 인덱스·뷰 생성/갱신 + 전/후 실행 시간 보고
+    python3 mcp_workload.py refresh [mcp1 mcp2 ...]  # 구체화 뷰만 다시 계산
+    python3 mcp_workload.py drop [mcp1 mcp2 ...]     # 워크로드가 만든 인덱스·뷰 삭제
+"""
+
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+from psycopg2 import sql
+
+from mcp_connections import close_all, get_connection, release_connection
+from mcp_dates import REFERENCE_DATE
+
+# 워크로드 설정 (환경변수에서 로드)
+MCP_WORKLOAD = os.getenv("MCP_WORKLOAD", "0") == "1"  # 초기화 후 인덱스·뷰 생성과 전/후 보고
+WORKLOAD_RUNS = int(os.getenv("WORKLOAD_RUNS", 3))  # 쿼리마다 EXPLAIN ANALYZE 반복 횟수 (최솟값 사용)
+WORKLOAD_DIR = os.getenv(
+    "WORKLOAD_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".mcp_workload")
+)  # 인덱스 없이 잰 "전" 실행 시간 기록
+
+# 대상 데이터베이스 목록 (환경변수에서 로드)
+database_list = os.getenv("DATABASE_LIST", "mcp1,mcp2,mcp3,mcp4,mcp5")
+databases = [db.strip() for db in database_list.split(",")]
+
+# 쿼리의 날짜 조건은 데이터와 같은 기준일을 쓴다
+TODAY = f"DATE '{REFERENCE_DATE.isoformat()}'"
+
+
+class Query:
+    """워크로드 쿼리 하나: 원본 쿼리와 (있으면) 같은 결과를 구체화 뷰에서 읽는 쿼리"""
+
+    def __init__(self, name, question, text, rollup=None):
+        self.name = name
+        self.question = question
+        self.text = text
+        self.rollup = rollup  # 인덱스·뷰 생성 후 실행할 쿼리 (없으면 text 그대로)
+
+
+# 시나리오별 워크로드
+#   indexes: (테이블, (열, ...)) — 구체화 뷰의 인덱스도 여기에 둔다 (뷰를 먼저 만든다)
+#   views: {뷰 이름: 정의 쿼리}
+WORKLOADS = {
+    "mcp1": {
+        "indexes": [
+            ("Orders", ("customer_id", "order_date")),
+            ("Orders", ("order_date",)),
+            ("Campaign_Performance", ("campaign_id", "date")),
+            ("mv_campaign_conversion", ("conversion_rate",)),
+        ],
+        "views": {
+            "mv_campaign_conversion": """
+                SELECT c.campaign_id, c.campaign_name, c.budget,
+                       SUM(p.impressions) AS impressions, SUM(p.clicks) AS clicks,
+                       SUM(p.conversions) AS conversions,
+                       ROUND(SUM(p.conversions)::numeric / NULLIF(SUM(p.clicks), 0), 4) AS conversion_rate
+                FROM Campaigns c JOIN Campaign_Performance p ON p.campaign_id = c.campaign_id
+                GROUP BY c.campaign_id
+            """,
+        },
+        "queries": [
+            Query(
+                "campaign_conversion",
+                "전환율 상위 캠페인",
+                """
+                SELECT c.campaign_id, c.campaign_name,
+                       ROUND(SUM(p.conversions)::numeric / NULLIF(SUM(p.clicks), 0), 4) AS conversion_rate
+                FROM Campaigns c JOIN Campaign_Performance p ON p.campaign_id = c.campaign_id
+                GROUP BY c.campaign_id ORDER BY conversion_rate DESC NULLS LAST LIMIT 10
+                """,
+                """
+                SELECT campaign_id, campaign_name, conversion_rate FROM mv_campaign_conversion
+                ORDER BY conversion_rate DESC NULLS LAST LIMIT 10
+                """,
+            ),
+            Query(
+                "campaign_daily",
+                "캠페인 일별 성과 추이",
+                "SELECT date, impressions, clicks, conversions FROM Campaign_Performance "
+                "WHERE campaign_id = 7 ORDER BY date",
+            ),
+            Query(
+                "customer_orders",
+                "고객 최근 주문",
+                "SELECT order_id, order_date, amount FROM Orders "
+                "WHERE customer_id = 42 ORDER BY order_date DESC LIMIT 20",
+            ),
+            Query(
+                "channel_revenue",
+                "최근 30일 유입 채널별 매출",
+                f"""
+                SELECT c.acquisition_channel, COUNT(*), SUM(o.amount)
+                FROM Orders o JOIN Customers c ON c.customer_id = o.customer_id
+                WHERE o.order_date >= {TODAY} - 30 GROUP BY c.acquisition_channel
+                """,
+            ),
+        ],
+    },
+    "mcp2": {
+        "indexes": [
+            ("Transactions", ("user_id", "date")),
+            ("Transactions", ("date",)),
+            ("PaymentMethods", ("transaction_id",)),
+            ("mv_daily_payments", ("date",)),
+        ],
+        "views": {
+            "mv_daily_payments": """
+                SELECT t.date, t.type, p.method, COUNT(*) AS transactions,
+                       COUNT(*) FILTER (WHERE p.status = '실패') AS failures, SUM(t.amount) AS amount
+                FROM Transactions t JOIN PaymentMethods p ON p.transaction_id = t.transaction_id
+                GROUP BY t.date, t.type, p.method
+            """,
+        },
+        "queries": [
+            Query(
+                "user_transactions",
+                "사용자 최근 거래",
+                "SELECT transaction_id, date, type, amount FROM Transactions "
+                "WHERE user_id = 42 ORDER BY date DESC LIMIT 20",
+            ),
+            Query(
+                "user_payments",
+                "사용자 거래별 결제수단",
+                """
+                SELECT t.transaction_id, t.amount, p.method, p.status
+                FROM Transactions t JOIN PaymentMethods p ON p.transaction_id = t.transaction_id
+                WHERE t.user_id = 42
+                """,
+            ),
+            Query(
+                "payment_failures",
+                "최근 30일 결제수단별 실패율",
+                f"""
+                SELECT p.method, ROUND(AVG((p.status = '실패')::int), 4) AS failure_rate
+                FROM Transactions t JOIN PaymentMethods p ON p.transaction_id = t.transaction_id
+                WHERE t.date >= {TODAY} - 30 GROUP BY p.method
+                """,
+                f"""
+                SELECT method, ROUND(SUM(failures)::numeric / SUM(transactions), 4) AS failure_rate
+                FROM mv_daily_payments WHERE date >= {TODAY} - 30 GROUP BY method
+                """,
+            ),
+        ],
+    },
+    "mcp3": {
+        "indexes": [
+            ("UserActivity", ("user_id", "activity_date")),
+            ("Feedback", ("date",)),
+            ("Feedback", ("user_id",)),
+        ],
+        "views": {
+            "mv_feedback_summary": """
+                SELECT category, sentiment, COUNT(*) AS feedbacks,
+                       ROUND(AVG(rating), 2) AS avg_rating,
+                       COUNT(*) FILTER (WHERE rating <= 2) AS low_ratings
+                FROM Feedback GROUP BY category, sentiment
+            """,
+        },
+        "queries": [
+            Query(
+                "user_activity",
+                "사용자 최근 활동",
+                "SELECT activity_date, activity_type FROM UserActivity "
+                "WHERE user_id = 42 ORDER BY activity_date DESC LIMIT 20",
+            ),
+            Query(
+                "feedback_summary",
+                "카테고리·감성별 평점",
+                """
+                SELECT category, sentiment, COUNT(*), ROUND(AVG(rating), 2),
+                       COUNT(*) FILTER (WHERE rating <= 2)
+                FROM Feedback GROUP BY category, sentiment
+                """,
+                "SELECT * FROM mv_feedback_summary",
+            ),
+            Query(
+                "recent_complaints",
+                "최근 7일 저평점 피드백",
+                f"SELECT feedback_id, user_id, date, category, comments FROM Feedback "
+                f"WHERE date >= {TODAY} - 7 AND rating <= 2 ORDER BY date DESC",
+            ),
+            Query(
+                "user_feedback",
+                "사용자 피드백 이력",
+                "SELECT date, rating, sentiment, category FROM Feedback WHERE user_id = 42",
+            ),
+        ],
+    },
+    "mcp4": {
+        "indexes": [
+            ("BudgetRequests", ("proj_id",)),
+            ("Events", ("proj_id", "event_date")),
+            ("SuppliesRequests", ("approval_status", "request_date")),
+            ("SuppliesRequests", ("emp_id",)),
+        ],
+        "views": {
+            "mv_budget_by_quarter": """
+                SELECT b.quarter, p.category, COUNT(*) AS requests,
+                       COUNT(*) FILTER (WHERE b.status = '승인') AS approved,
+                       SUM(b.amount) AS amount,
+                       COALESCE(SUM(b.amount) FILTER (WHERE b.status = '승인'), 0) AS approved_amount
+                FROM BudgetRequests b JOIN Projects p ON p.proj_id = b.proj_id
+                GROUP BY b.quarter, p.category
+            """,
+        },
+        "queries": [
+            Query(
+                "budget_approval",
+                "분기별 예산 승인율·승인 금액",
+                """
+                SELECT quarter, COUNT(*), ROUND(AVG((status = '승인')::int), 4) AS approval_rate,
+                       SUM(amount) FILTER (WHERE status = '승인') AS approved_amount
+                FROM BudgetRequests GROUP BY quarter ORDER BY quarter
+                """,
+                """
+                SELECT quarter, SUM(requests), ROUND(SUM(approved)::numeric / SUM(requests), 4) AS approval_rate,
+                       SUM(approved_amount) AS approved_amount
+                FROM mv_budget_by_quarter GROUP BY quarter ORDER BY quarter
+                """,
+            ),
+            Query(
+                "project_budget",
+                "프로젝트 예산 요청·행사 내역",
+                """
+                SELECT b.quarter, b.amount, b.status, e.event_name, e.event_date
+                FROM BudgetRequests b LEFT JOIN Events e ON e.proj_id = b.proj_id
+                WHERE b.proj_id = 7 ORDER BY e.event_date
+                """,
+            ),
+            Query(
+                "pending_supplies",
+                "최근 14일 승인 대기 물품 요청",
+                f"SELECT supply_id, emp_id, item, quantity FROM SuppliesRequests "
+                f"WHERE approval_status = '대기' AND request_date >= {TODAY} - 14",
+            ),
+        ],
+    },
+    "mcp5": {
+        "indexes": [
+            ("Attendance", ("course_id", "attendance_date")),
+            ("Grades", ("student_id",)),
+            ("Enrollments", ("student_id",)),
+            ("Enrollments", ("course_id",)),
+            ("mv_student_attendance", ("semester", "attendance_rate")),
+        ],
+        "views": {
+            "mv_student_attendance": """
+                SELECT student_id, semester, COUNT(*) AS sessions,
+                       COUNT(*) FILTER (WHERE status = '결석') AS absences,
+                       ROUND(AVG((status <> '결석')::int), 3) AS attendance_rate
+                FROM Attendance GROUP BY student_id, semester
+            """,
+        },
+        "queries": [
+            Query(
+                "long_absence",
+                "2025-1 장기결석자 (출석률 50% 미만)",
+                """
+                SELECT s.student_id, s.name, s.gpa, a.attendance_rate
+                FROM Students s JOIN (
+                    SELECT student_id, ROUND(AVG((status <> '결석')::int), 3) AS attendance_rate
+                    FROM Attendance WHERE semester = '2025-1' GROUP BY student_id
+                ) a ON a.student_id = s.student_id
+                WHERE a.attendance_rate < 0.5 ORDER BY s.gpa DESC
+                """,
+                """
+                SELECT s.student_id, s.name, s.gpa, a.attendance_rate
+                FROM Students s JOIN mv_student_attendance a ON a.student_id = s.student_id
+                WHERE a.semester = '2025-1' AND a.attendance_rate < 0.5 ORDER BY s.gpa DESC
+                """,
+            ),
+            Query(
+                "course_attendance",
+                "강좌 최근 30일 출결 현황",
+                f"SELECT status, COUNT(*) FROM Attendance "
+                f"WHERE course_id = 7 AND attendance_date >= {TODAY} - 30 GROUP BY status",
+            ),
+            Query(
+                "student_grades",
+                "학생 성적표",
+                """
+                SELECT c.course_name, g.semester, g.total_score, g.letter_grade
+                FROM Grades g JOIN Courses c ON c.course_id = g.course_id
+                WHERE g.student_id = 42
+                """,
+            ),
+            Query(
+                "student_enrollments",
+                "학생 수강 목록",
+                "SELECT course_id, semester, enrollment_date FROM Enrollments WHERE student_id = 42",
+            ),
+        ],
+    },
+}
+
+
+def index_name(table, columns):
+    return f"idx_{table.lower()}_{'_'.join(columns)}"
+
+
+def _existing_indexes(cur, table):
+    """테이블의 기존 인덱스 {이름: (열, ...)} (아직 없는 구체화 뷰면 빈 dict)"""
+    cur.execute(
+        """
+        SELECT c.relname, array_agg(a.attname ORDER BY k.ord)
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        CROSS JOIN unnest(i.indkey) WITH ORDINALITY AS k(attnum, ord)
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+        WHERE i.indrelid = to_regclass(%s) AND NOT i.indisprimary
+        GROUP BY c.relname
+        """,
+        (table,),
+    )
+    return {name: tuple(columns) for name, columns in cur.fetchall()}
+
+
+def _view_exists(cur, view):
+    cur.execute("SELECT to_regclass(%s) IS NOT NULL", (view,))
+    return cur.fetchone()[0]
+
+
+def _execution_ms(cur, text):
+    """EXPLAIN ANALYZE 실행 시간(ms)의 최솟값과 최상위 계획 노드"""
+    best = None
+    for _ in range(max(1, WORKLOAD_RUNS)):
+        cur.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {text}")
+        plan = cur.fetchone()[0][0]
+        if best is None or plan["Execution Time"] < best[0]:
+            best = (plan["Execution Time"], _scan_nodes(plan["Plan"]))
+    return best
+
+
+def _scan_nodes(node):
+    """계획에서 테이블을 읽는 노드 종류 (예: 'Seq Scan', 'Index Scan')"""
+    found = []
+    if node.get("Relation Name"):
+        found.append(node["Node Type"])
+    for child in node.get("Plans", ()):
+        found.extend(_scan_nodes(child))
+    return found
+
+
+def _scans(nodes):
+    """['Seq Scan', 'Seq Scan', 'Index Scan'] → 'Seq Scan×2, Index Scan' (파티션마다 노드가 생긴다)"""
+    counts = Counter(nodes)
+    return ", ".join(node if n == 1 else f"{node}×{n}" for node, n in counts.items())
+
+
+def _advise(cur, workload):
+    """만들 인덱스 목록 — 같은 열로 시작하는 다른 인덱스가 이미 있으면 건너뛴다"""
+    advised = []
+    for table, columns in workload["indexes"]:
+        name = index_name(table, columns)
+        existing = _existing_indexes(cur, table)
+        covered = any(
+            cols[: len(columns)] == columns
+            for other, cols in existing.items()
+            if other != name
+        )
+        if not covered:
+            advised.append((table, columns, name))
+    return advised
+
+
+def _measure(cur, queries, rollup):
+    return {
+        query.name: _execution_ms(cur, query.rollup if rollup and query.rollup else query.text)
+        for query in queries
+    }
+
+
+def _before_path(cur):
+    return os.path.join(WORKLOAD_DIR, f"{cur.connection.info.dbname}.json")
+
+
+def _load_before(cur):
+    """기록된 "전" 실행 시간 {쿼리: (ms, 계획 노드)} (기록이 없으면 빈 dict)"""
+    path = _before_path(cur)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return {name: tuple(value) for name, value in json.load(f).items()}
+
+
+def _save_before(cur, before):
+    os.makedirs(WORKLOAD_DIR, exist_ok=True)
+    path = _before_path(cur)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "w") as f:
+        json.dump(before, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def refresh_views(cur, workload):
+    """구체화 뷰를 만들거나 다시 계산하고 (뷰 이름, 새로 만들었는지) 목록을 반환"""
+    refreshed = []
+    for view, definition in workload["views"].items():
+        if _view_exists(cur, view):
+            cur.execute(sql.SQL("REFRESH MATERIALIZED VIEW {}").format(sql.Identifier(view)))
+            refreshed.append((view, False))
+        else:
+            cur.execute(
+                sql.SQL("CREATE MATERIALIZED VIEW {} AS {}").format(
+                    sql.Identifier(view), sql.SQL(definition)
+                )
+            )
+            refreshed.append((view, True))
+    return refreshed
+
+
+def apply_workload(name, cur):
+    """인덱스·구체화 뷰를 만들고(이미 있으면 뷰만 갱신) 전/후 실행 시간을 출력
+
+    한 트랜잭션에서 실행하며 커밋은 호출한 쪽이 한다. 워크로드 인덱스가 하나라도 이미 있으면
+    "전" 시간은 다시 재지 않고 처음 적용할 때 기록한 값을 쓴다 (기록이 없으면 비워 둔다).
+    """
+    workload = WORKLOADS[name]
+    queries = workload["queries"]
+    started = time.perf_counter()
+    advised = _advise(cur, workload)
+
+    # 워크로드 인덱스가 없는 상태의 실행 시간 (수업 중 조회를 막지 않도록 설치된 인덱스는 지우지 않는다)
+    installed = any(
+        index in _existing_indexes(cur, table.lower()) for table, _, index in advised
+    )
+    if installed:
+        before = _load_before(cur)
+    else:
+        before = _measure(cur, queries, rollup=False)
+        _save_before(cur, before)
+
+    views = refresh_views(cur, workload)
+    for table, columns, index in advised:
+        cur.execute(
+            sql.SQL("CREATE INDEX IF NOT EXISTS {} ON {} ({})").format(
+                sql.Identifier(index),
+                sql.Identifier(table.lower()),
+                sql.SQL(", ").join(map(sql.Identifier, columns)),
+            )
+        )
+    tables = {table.lower() for table, _ in workload["indexes"]} | set(workload["views"])
+    for table in sorted(tables):
+        cur.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(table)))
+    after = _measure(cur, queries, rollup=True)
+
+    created = sum(1 for _, new in views if new)
+    recorded = " — 전 시간은 처음 적용할 때 기록한 값" if installed else ""
+    print(
+        f"🧭 {name} 워크로드: 인덱스 {len(advised)}개, 구체화 뷰 {len(views)}개"
+        f" (새로 생성 {created}개) ({time.perf_counter() - started:.1f}s){recorded}"
+    )
+    for query in queries:
+        after_ms, after_scans = after[query.name]
+        if query.name not in before:
+            print(f"   {query.name:<20} {'기록 없음':>11} → {after_ms:9.2f}ms  {query.question}")
+            continue
+        before_ms, before_scans = before[query.name]
+        speedup = before_ms / after_ms if after_ms else float("inf")
+        source = " [뷰]" if query.rollup else ""
+        print(
+            f"   {query.name:<20} {before_ms:9.2f}ms → {after_ms:9.2f}ms"
+            f" (x{speedup:.1f}){source}  {query.question}"
+        )
+        if list(before_scans) != list(after_scans):
+            print(f"   {'':<20} {_scans(before_scans)} → {_scans(after_scans)}")
+    return before, after
+
+
+def drop_workload(name, cur):
+    workload = WORKLOADS[name]
+    for table, columns in workload["indexes"]:
+        cur.execute(
+            sql.SQL("DROP INDEX IF EXISTS {}").format(
+                sql.Identifier(index_name(table, columns))
+            )
+        )
+    for view in workload["views"]:
+        cur.execute(sql.SQL("DROP MATERIALIZED VIEW IF EXISTS {}").format(sql.Identifier(view)))
+    print(f"🗑️ {name} 워크로드 인덱스·구체화 뷰 삭제")
+
+
+def _refresh(name, cur):
+    started = time.perf_counter()
+    views = refresh_views(cur, WORKLOADS[name])
+    print(f"🔄 {name} 구체화 뷰 {len(views)}개 갱신 ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    commands = {"apply": apply_workload, "refresh": _refresh, "drop": drop_workload}
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print(__doc__)
+        raise SystemExit(2)
+    names = [db for db in (sys.argv[2:] or databases) if db in WORKLOADS]
+
+    failed = []
+    started = time.perf_counter()
+    for db in names:
+        conn = get_connection(db)
+        try:
+            with conn.cursor() as cur:
+                commands[sys.argv[1]](db, cur)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"❌ {db}: {e}")
+            failed.append(db)
+        finally:
+            release_connection(conn)
+    close_all()
+    print(f"⏱️ 전체 소요 시간: {time.perf_counter() - started:.1f}s")
+    if failed:
+        raise SystemExit(1)